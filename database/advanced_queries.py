@@ -1,4 +1,5 @@
 from database.crud_operations import fetch_data, execute_query
+from utils.helpers import years_before
 from database.db_connection import close_connection, get_cursor
 
 
@@ -20,12 +21,9 @@ def get_patients_by_insurance(conn, insurance_id):
     """Retrieve all patients covered by a specific insurance provider."""
     query = """
     SELECT p.PatientID, p.FirstName, p.LastName
-    FROM Patients p
-    WHERE p.PatientID IN (
-        SELECT pi.PatientID
-        FROM PatientInsurance pi
-        WHERE pi.InsuranceID = ?
-    )
+    FROM PatientInsurance pi
+    JOIN Patients p ON p.PatientID = pi.PatientID
+    WHERE pi.InsuranceID = ?
     """
     return fetch_data(conn, query, (insurance_id,))
 
@@ -44,17 +42,11 @@ def get_patients_with_multiple_medications(conn):
 def get_patients_by_medication(conn, medication_name):
     """Retrieve patients taking a specific medication."""
     query = """
-    SELECT p.PatientID, p.FirstName, p.LastName
-    FROM Patients p
-    WHERE p.PatientID IN (
-        SELECT pm.PatientID
-        FROM PatientMedications pm
-        WHERE pm.MedicationID = (
-            SELECT m.MedicationID
-            FROM Medications m
-            WHERE m.Name = ?
-        )
-    )
+    SELECT DISTINCT p.PatientID, p.FirstName, p.LastName
+    FROM Medications m
+    JOIN PatientMedications pm ON pm.MedicationID = m.MedicationID
+    JOIN Patients p ON p.PatientID = pm.PatientID
+    WHERE m.MedicationName = ?
     """
     return fetch_data(conn, query, (medication_name,))
 
@@ -62,11 +54,13 @@ def get_patients_by_medication(conn, medication_name):
 def get_visit_count_per_patient(conn):
     """Retrieve the number of visits each patient has made."""
     query = """
-    SELECT p.PatientID, p.FirstName, p.LastName,
-           (SELECT COUNT(*)
-            FROM Visits v
-            WHERE v.PatientID = p.PatientID) AS VisitCount
+    SELECT p.PatientID, p.FirstName, p.LastName, COALESCE(v.VisitCount, 0) AS VisitCount
     FROM Patients p
+    LEFT JOIN (
+        SELECT PatientID, COUNT(*) AS VisitCount
+        FROM Visits
+        GROUP BY PatientID
+    ) v ON v.PatientID = p.PatientID
     """
     return fetch_data(conn, query)
 
@@ -76,16 +70,9 @@ def get_departments_without_patients(conn):
     query = """
     SELECT d.DepartmentName
     FROM HCPDepartments d
-    WHERE NOT EXISTS (
-        SELECT 1
-        FROM HealthCareProfessionals h
-        WHERE h.DepartmentID = d.DepartmentID
-        AND EXISTS (
-            SELECT 1
-            FROM Patients p
-            WHERE p.PrimaryHCPID = h.HCPID
-        )
-    )
+    LEFT JOIN Patients p ON p.PrimaryHCPID = d.HCPID
+    GROUP BY d.DepartmentName
+    HAVING COUNT(p.PatientID) = 0
     """
     return fetch_data(conn, query)
 
@@ -95,21 +82,20 @@ def get_patients_over_age(conn, age):
     query = """
     SELECT p.PatientID, p.FirstName, p.LastName, p.DOB
     FROM Patients p
-    WHERE TIMESTAMPDIFF(YEAR, p.DOB, CURDATE()) > ?
+    WHERE p.DOB <= ?
     """
-    return fetch_data(conn, query, (age,))
+    # Older than `age` means born on or before the day they turned age + 1,
+    # so compare DOB to a cutoff date and let idx_patients_dob do a range scan
+    return fetch_data(conn, query, (years_before(age + 1),))
 
 
 def get_healthcare_professionals_by_department(conn, department):
     """Retrieve all healthcare professionals in a specific department."""
     query = """
     SELECT h.HCPID, h.FirstName, h.LastName, h.ContactNumber
-    FROM HealthCareProfessionals h
-    WHERE h.DepartmentID = (
-        SELECT d.DepartmentID
-        FROM HCPDepartments d
-        WHERE d.DepartmentName = ?
-    )
+    FROM HCPDepartments d
+    JOIN HealthCareProfessionals h ON h.HCPID = d.HCPID
+    WHERE d.DepartmentName = ?
     """
     return fetch_data(conn, query, (department,))
 
@@ -117,11 +103,11 @@ def get_healthcare_professionals_by_department(conn, department):
 def get_medications_and_side_effects(conn):
     """Retrieve all medications and their associated side effects."""
     query = """
-    SELECT m.Name AS MedicationName, m.Dosage,
-           (SELECT GROUP_CONCAT(s.Description SEPARATOR '; ')
-            FROM SideEffects s
-            WHERE s.MedicationID = m.MedicationID) AS SideEffects
+    SELECT m.MedicationName, m.Dosage,
+           GROUP_CONCAT(s.SideEffectDescription ORDER BY s.SideEffectDescription SEPARATOR '; ') AS SideEffects
     FROM Medications m
+    LEFT JOIN SideEffects s ON s.MedicationID = m.MedicationID
+    GROUP BY m.MedicationID, m.MedicationName, m.Dosage
     """
     return fetch_data(conn, query)
 
@@ -129,44 +115,25 @@ def get_medications_and_side_effects(conn):
 def get_average_visits_per_patient_by_department(conn, department):
     """Calculate the average number of visits per patient for a specific department."""
     query = """
-    SELECT (SELECT COUNT(*)
-            FROM Visits v
-            WHERE v.PatientID IN (
-                SELECT p.PatientID
-                FROM Patients p
-                WHERE p.PrimaryHCPID IN (
-                    SELECT h.HCPID
-                    FROM HealthCareProfessionals h
-                    WHERE h.DepartmentID = (
-                        SELECT d.DepartmentID
-                        FROM HCPDepartments d
-                        WHERE d.DepartmentName = ?
-                    )
-                )
-            )) /
-           (SELECT COUNT(*)
-            FROM Patients p
-            WHERE p.PrimaryHCPID IN (
-                SELECT h.HCPID
-                FROM HealthCareProfessionals h
-                WHERE h.DepartmentID = (
-                    SELECT d.DepartmentID
-                    FROM HCPDepartments d
-                    WHERE d.DepartmentName = ?
-                )
-            )) AS AvgVisitsPerPatient
+    SELECT COUNT(v.PatientID) * 1.0 / COUNT(DISTINCT p.PatientID) AS AvgVisitsPerPatient
+    FROM HCPDepartments d
+    JOIN Patients p ON p.PrimaryHCPID = d.HCPID
+    LEFT JOIN Visits v ON v.PatientID = p.PatientID
+    WHERE d.DepartmentName = ?
     """
-    return fetch_data(conn, query, (department, department))
+    # MariaDB divides integers to a DECIMAL but SQLite truncates; * 1.0 gives both a fractional average
+    return fetch_data(conn, query, (department,))
 
 
 def get_patients_grouped_by_hcp(conn):
     """List patients grouped by their primary healthcare provider."""
     query = """
     SELECT h.HCPID, h.FirstName AS HCP_FirstName, h.LastName AS HCP_LastName,
-           (SELECT GROUP_CONCAT(CONCAT(p.FirstName, ' ', p.LastName) SEPARATOR '; ')
-            FROM Patients p
-            WHERE p.PrimaryHCPID = h.HCPID) AS Patients
+           GROUP_CONCAT(CONCAT(p.FirstName, ' ', p.LastName)
+                        ORDER BY p.PatientID SEPARATOR '; ') AS Patients
     FROM HealthCareProfessionals h
+    LEFT JOIN Patients p ON p.PrimaryHCPID = h.HCPID
+    GROUP BY h.HCPID, h.FirstName, h.LastName
     """
     return fetch_data(conn, query)
 
@@ -0,0 +1,260 @@
+import asyncio
+import functools
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from database import basic_queries, advanced_queries
+from database.crud_operations import fetch_data, execute_query, stream_data
+from database.db_connection import get_pool, close_pool
+from database.instrumentation import caller, credit_to
+
+
+# Seconds an awaited call may run before it is cancelled; None waits as long as it takes
+DEFAULT_TIMEOUT = None
+
+# Rows handed to the event loop at a time by stream()
+STREAM_CHUNK_SIZE = 500
+
+# Modules whose query functions AsyncPool exposes as coroutines of the same name
+QUERY_MODULES = (basic_queries, advanced_queries)
+
+
+def query_functions():
+    """Public functions defined in QUERY_MODULES, by name."""
+    functions = {}
+    for module in QUERY_MODULES:
+        for name, func in vars(module).items():
+            if name.startswith(("_", "test_")) or not callable(func):
+                continue
+            if getattr(func, "__module__", None) == module.__name__:
+                functions[name] = func
+    return functions
+
+
+def _take(rows, count):
+    return list(itertools.islice(rows, count))
+
+
+def _release_opened(future):
+    """Release a stream opened after its consumer had already given up."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    conn, rows = future.result()
+    rows.close()
+    conn.close()
+
+
+class AsyncPool:
+    """
+    Asyncio access to the database, built on the blocking ConnectionPool.
+
+    The mariadb driver has no asyncio API, so each call checks a pooled
+    connection out on a worker thread while the event loop awaits the
+    result. One thread can then keep many queries in flight, up to the
+    pool's max_size. A call that is cancelled or times out is killed on the
+    server, and its connection goes back to the pool; one still waiting for
+    a connection gives up without running.
+
+    Each stream() gets a thread of its own, so a stream holding a connection
+    can always read on and release it, even while every worker thread is
+    waiting for a connection.
+
+    Every public function of basic_queries and advanced_queries is also a
+    coroutine method of the same name, minus the conn argument:
+
+        async with AsyncPool() as db:
+            over_65, without_visits = await asyncio.gather(
+                db.get_patients_over_age(65), db.get_patients_without_visits()
+            )
+
+    :param pool: ConnectionPool to draw from (defaults to the process-wide pool)
+    :param max_workers: Threads running blocking calls (defaults to the pool's max_size)
+    :param timeout: Seconds each call may take unless it passes its own timeout
+    """
+
+    _queries = query_functions()
+
+    def __init__(self, pool=None, max_workers=None, timeout=DEFAULT_TIMEOUT):
+        self.pool = pool if pool is not None else get_pool()
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or self.pool.max_size, thread_name_prefix="db-async"
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def __getattr__(self, name):
+        func = self._queries.get(name)
+        if func is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        @functools.wraps(func)
+        async def query(*args, timeout=None, **kwargs):
+            return await self.run(func, *args, timeout=timeout, **kwargs)
+
+        return query
+
+    async def run(self, func, *args, timeout=None, **kwargs):
+        """
+        Await func(conn, *args, **kwargs) on a pooled connection.
+        :param timeout: Seconds to wait (defaults to self.timeout); asyncio.TimeoutError when exceeded
+        """
+        job = {"conn": None, "cancelled": False, "lock": threading.Lock()}
+        issued_by = caller()  # The awaiting coroutine, for statements no query function issues
+
+        def call():
+            with self.pool.connection() as conn, credit_to(issued_by):
+                with job["lock"]:
+                    if job["cancelled"]:
+                        return None  # The caller gave up while we waited for a connection
+                    job["conn"] = conn
+                try:
+                    return func(conn, *args, **kwargs)
+                finally:
+                    with job["lock"]:
+                        job["conn"] = None
+
+        return await self._wait(self._executor.submit(call), self._deadline(timeout), job)
+
+    async def fetch(self, query, values=None, timeout=None):
+        """Await fetch_data() for a SELECT statement."""
+        return await self.run(fetch_data, query, values, timeout=timeout)
+
+    async def execute(self, query, values=None, timeout=None):
+        """Await execute_query() for an INSERT, UPDATE or DELETE statement."""
+        return await self.run(execute_query, query, values, timeout=timeout)
+
+    async def stream(self, func, *args, chunk_size=STREAM_CHUNK_SIZE, timeout=None, **kwargs):
+        """
+        Iterate with `async for` over the rows of func(conn, *args, **kwargs), which must return
+        an iterator, e.g. a query called with stream=True.
+        Rows are read chunk_size at a time on a connection held until the loop ends, and
+        timeout bounds the whole iteration. Leaving the loop early kills the query on the server.
+        """
+        deadline = self._deadline(timeout)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-stream")
+        opened = executor.submit(self._open, func, args, kwargs, caller())
+        try:
+            conn, rows = await self._wait(opened, deadline)
+        except BaseException:
+            opened.add_done_callback(_release_opened)
+            executor.shutdown(wait=False)
+            raise
+
+        fetching = None
+        exhausted = False
+        try:
+            while True:
+                fetching = executor.submit(_take, rows, chunk_size)
+                chunk = await self._wait(fetching, deadline)
+                if not chunk:
+                    exhausted = True
+                    return
+                for row in chunk:
+                    yield row
+        finally:
+            # Not on the stream's own thread, which may still be blocked in the fetch being killed
+            threading.Thread(
+                target=self._finish, args=(conn, rows, fetching, exhausted), name="db-stream-finish", daemon=True
+            ).start()
+            executor.shutdown(wait=False)
+
+    async def iterate(self, query, values=None, chunk_size=STREAM_CHUNK_SIZE, timeout=None):
+        """Iterate with `async for` over the rows of a SELECT statement, via stream_data()."""
+        async for row in self.stream(stream_data, query, values, chunk_size=chunk_size, timeout=timeout):
+            yield row
+
+    async def close(self):
+        """Wait for running calls to finish and stop the worker threads; the pool stays open."""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    def _deadline(self, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        return None if timeout is None else time.monotonic() + timeout
+
+    async def _wait(self, future, deadline, job=None):
+        """Await a worker thread's future, killing its statement if the caller gives up first."""
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), remaining)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            conn = None
+            if job is not None:
+                with job["lock"]:
+                    job["cancelled"] = True
+                    conn = job["conn"]
+            if conn is not None:
+                threading.Thread(target=self.pool.interrupt, args=(conn,), name="db-interrupt", daemon=True).start()
+            raise
+
+    def _open(self, func, args, kwargs, issued_by):
+        conn = self.pool.acquire()
+        try:
+            with credit_to(issued_by):
+                return conn, iter(func(conn, *args, **kwargs))
+        except Exception:
+            conn.close()
+            raise
+
+    def _finish(self, conn, rows, fetching, exhausted):
+        """Stop a stream's query, wait for its last fetch and release the connection."""
+        try:
+            if not exhausted:
+                self.pool.interrupt(conn)
+            if fetching is not None:
+                fetching.cancel()
+                wait([fetching])
+            rows.close()
+        except Exception as e:
+            print(f"Error closing stream: {e}")
+        finally:
+            conn.close()
+
+
+# -------------------------
+# Testing Async Operations
+# -------------------------
+
+async def _report(db):
+    """Run the advanced queries concurrently, as a nightly report job would."""
+    reports = {
+        "Patients Without Visits": db.get_patients_without_visits(),
+        "Patients with Multiple Medications": db.get_patients_with_multiple_medications(),
+        "Visit Count Per Patient": db.get_visit_count_per_patient(),
+        "Departments Without Patients": db.get_departments_without_patients(),
+        "Patients Over Age 65": db.get_patients_over_age(65),
+        "Medications and Their Side Effects": db.get_medications_and_side_effects(),
+        "Patients Grouped by Healthcare Professional": db.get_patients_grouped_by_hcp(),
+    }
+    start = time.perf_counter()
+    results = await asyncio.gather(*reports.values(), return_exceptions=True)
+    for title, rows in zip(reports, results):
+        print(f"{title}: {rows if isinstance(rows, Exception) else len(rows or [])} rows")
+    print(f"\nAll reports finished in {time.perf_counter() - start:.2f}s")
+
+    count = 0
+    async for _ in db.stream(basic_queries.get_all_patients, stream=True):
+        count += 1
+    print(f"Streamed {count} patients")
+
+
+def test_async_operations():
+    """Test the asyncio layer against the configured database."""
+    async def main():
+        async with AsyncPool() as db:
+            await _report(db)
+
+    try:
+        asyncio.run(main())
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    test_async_operations()
@@ -1,16 +1,114 @@
-from database.crud_operations import fetch_data, execute_query
+from database.crud_operations import (
+    fetch_data,
+    execute_query,
+    stream_data,
+    fetch_page,
+    fetch_row,
+    check_sort_column,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+)
 from database.db_connection import close_connection, get_cursor
+from database.cache import cached, invalidate
+from database.transactions import transaction, after_commit
+from utils.helpers import escape_like, looks_like_date, LIKE_ESCAPE
+
+
+# Maximum number of rows a search returns
+SEARCH_LIMIT = 200
+
+# Seconds the server lets a search run before aborting it (MariaDB max_statement_time)
+SEARCH_TIMEOUT = 5
+
+# Rows per page of full-text visit note results
+NOTES_PAGE_SIZE = 50
+
+
+def _search(conn, table, term, id_columns=(), text_columns=(), date_columns=(), limit=SEARCH_LIMIT,
+            stream=False, sort=None, descending=False):
+    """
+    Search a table in SQL instead of filtering get_all_* results in Python.
+    :param term: User input; matched exactly against ID and date columns and
+                 as a prefix against text columns, so indexes stay usable
+    :param stream: Return a generator that yields rows as the server sends them
+    :param sort: Column to order the matches by
+    :param descending: Reverse the order
+    :return: Up to limit matching rows
+    :raises ValueError: If sort is not a column of table
+
+    The statement is capped at SEARCH_TIMEOUT seconds so an abandoned
+    search-as-you-type query cannot keep the server busy.
+    """
+    check_sort_column(table, sort)
+    term = term.strip()
+    conditions = []
+    params = []
+    for column in id_columns:
+        conditions.append(f"{column} = %s")
+        params.append(term)
+    if looks_like_date(term):
+        for column in date_columns:
+            conditions.append(f"{column} = %s")
+            params.append(term)
+    for column in text_columns:
+        conditions.append(f"{column} LIKE %s ESCAPE '{LIKE_ESCAPE}'")
+        params.append(escape_like(term) + "%")
+    if not term or not conditions:
+        return iter(()) if stream else []
+
+    query = (
+        f"SET STATEMENT max_statement_time={SEARCH_TIMEOUT} FOR "
+        f"SELECT * FROM {table} WHERE {' OR '.join(conditions)}"
+    )
+    if sort is not None:
+        query += f" ORDER BY {sort}{' DESC' if descending else ''}"
+    query += " LIMIT %s"
+    params.append(limit)
+    if stream:
+        return stream_data(conn, query, tuple(params))
+    return fetch_data(conn, query, tuple(params))
+
+
+def _write(conn, table, query, params):
+    """
+    Run an INSERT, UPDATE or DELETE on table in its own transaction (a savepoint when
+    nested), so a failure raises instead of only being printed, and drop the
+    table's cached reads once it commits.
+    :return: Number of rows affected
+    """
+    with transaction(conn):
+        rowcount = execute_query(conn, query, params)
+        after_commit(conn, invalidate, table)
+    return rowcount
+
+def _delete(conn, table, query, key):
+    """Run a DELETE with _write(); raises LookupError if no row had the key."""
+    if not _write(conn, table, query, key):
+        raise LookupError(f"No row in {table} matches {', '.join(map(str, key))}")
 
 
 # -------------------------
 # Patients
 # -------------------------
 
-def get_all_patients(conn):
+def get_all_patients(conn, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
     """Retrieve all patients from the Patients table."""
     query = "SELECT * FROM Patients"
+    if stream:
+        return stream_data(conn, query, chunk_size=chunk_size)
     return fetch_data(conn, query)
 
+def get_patients_page(conn, after=None, before=None, page_size=DEFAULT_PAGE_SIZE, sort=None, descending=False):
+    """Retrieve one page of patients in PatientID order, or by sort; returns (rows, next_token)."""
+    return fetch_page(
+        conn, "Patients", ("PatientID",), after=after, before=before, page_size=page_size,
+        sort=sort, descending=descending
+    )
+
+def get_patient(conn, patient_id):
+    """Retrieve a single patient by PatientID."""
+    return fetch_row(conn, "Patients", ("PatientID",), (patient_id,))
+
 def add_patient_to_db(conn, data):
     """Insert a new patient into the Patients table."""
     query = """
@@ -26,7 +124,7 @@ def add_patient_to_db(conn, data):
         data["PhoneNumber"],
         data["PrimaryHCPID"]
     )
-    execute_query(conn, query, params)
+    _write(conn, "Patients", query, params)
 
 def update_patient(conn, patient_id, data):
     """Update an existing patient's information."""
@@ -44,13 +142,27 @@ def update_patient(conn, patient_id, data):
         data["PrimaryHCPID"],
         patient_id
     )
-    execute_query(conn, query, params)
+    _write(conn, "Patients", query, params)
+
+def find_patients(conn, term, limit=SEARCH_LIMIT, stream=False, sort=None, descending=False):
+    """Search patients by ID, primary HCP ID, or first/last name prefix."""
+    return _search(
+        conn,
+        "Patients",
+        term,
+        id_columns=("PatientID", "PrimaryHCPID"),
+        text_columns=("LastName", "FirstName"),
+        limit=limit,
+        stream=stream,
+        sort=sort,
+        descending=descending,
+    )
 
 def delete_patient(conn, patient_id):
     """Delete a patient by PatientID."""
     query = "DELETE FROM Patients WHERE PatientID = %s"
     try:
-        execute_query(conn, query, (patient_id,))
+        _delete(conn, "Patients", query, (patient_id,))
     except Exception as e:
         raise RuntimeError(f"Database error: {e}")
 
@@ -59,11 +171,27 @@ def delete_patient(conn, patient_id):
 # HealthCareProfessionals
 # -------------------------
 
-def get_all_hcps(conn):
+@cached("HealthCareProfessionals")
+def get_all_hcps(conn, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
     """Retrieve all healthcare professionals from the HealthCareProfessionals table."""
     query = "SELECT * FROM HealthCareProfessionals"
+    if stream:
+        return stream_data(conn, query, chunk_size=chunk_size)
     return fetch_data(conn, query)
 
+@cached("HealthCareProfessionals")
+def get_hcps_page(conn, after=None, before=None, page_size=DEFAULT_PAGE_SIZE, sort=None, descending=False):
+    """Retrieve one page of healthcare professionals in HCPID order, or by sort; returns (rows, next_token)."""
+    return fetch_page(
+        conn, "HealthCareProfessionals", ("HCPID",), after=after, before=before, page_size=page_size,
+        sort=sort, descending=descending
+    )
+
+@cached("HealthCareProfessionals")
+def get_hcp(conn, hcp_id):
+    """Retrieve a single healthcare professional by HCPID."""
+    return fetch_row(conn, "HealthCareProfessionals", ("HCPID",), (hcp_id,))
+
 def add_hcp_to_db(conn, data):
     """Insert a new health care professional into the HealthCareProfessionals table."""
     query = """
@@ -77,7 +205,7 @@ def add_hcp_to_db(conn, data):
         data["ContactNumber"],
         data["Department"]
     )
-    execute_query(conn, query, params)
+    _write(conn, "HealthCareProfessionals", query, params)
 
 def update_hcp(conn, hcp_id, data):
     """Update an existing healthcare professional's information."""
@@ -93,23 +221,54 @@ def update_hcp(conn, hcp_id, data):
         data["Department"],
         hcp_id
     )
-    execute_query(conn, query, params)
+    _write(conn, "HealthCareProfessionals", query, params)
+
+@cached("HealthCareProfessionals")
+def find_hcps(conn, term, limit=SEARCH_LIMIT, stream=False, sort=None, descending=False):
+    """Search healthcare professionals by ID, name prefix, or department prefix."""
+    return _search(
+        conn,
+        "HealthCareProfessionals",
+        term,
+        id_columns=("HCPID",),
+        text_columns=("LastName", "FirstName", "Department"),
+        limit=limit,
+        stream=stream,
+        sort=sort,
+        descending=descending,
+    )
 
 def delete_hcp(conn, hcp_id):
     """Delete a healthcare professional by HCPID."""
     query = "DELETE FROM HealthCareProfessionals WHERE HCPID = %s"
-    execute_query(conn, query, (hcp_id,))
+    _delete(conn, "HealthCareProfessionals", query, (hcp_id,))
 
 
 # -------------------------
 # Insurance
 # -------------------------
 
-def get_all_insurance(conn):
+@cached("Insurance")
+def get_all_insurance(conn, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
     """Retrieve all insurance info from the Insurance table."""
     query = "SELECT * FROM Insurance"
+    if stream:
+        return stream_data(conn, query, chunk_size=chunk_size)
     return fetch_data(conn, query)
 
+@cached("Insurance")
+def get_insurance_page(conn, after=None, before=None, page_size=DEFAULT_PAGE_SIZE, sort=None, descending=False):
+    """Retrieve one page of insurance providers in InsuranceID order, or by sort; returns (rows, next_token)."""
+    return fetch_page(
+        conn, "Insurance", ("InsuranceID",), after=after, before=before, page_size=page_size,
+        sort=sort, descending=descending
+    )
+
+@cached("Insurance")
+def get_insurance(conn, insurance_id):
+    """Retrieve a single insurance provider by InsuranceID."""
+    return fetch_row(conn, "Insurance", ("InsuranceID",), (insurance_id,))
+
 def add_insurance_to_db(conn, data):
     """Insert a new insurance entry into the Insurance table."""
     query = """
@@ -122,7 +281,7 @@ def add_insurance_to_db(conn, data):
         data["Email"],
         data["ContactNumber"]
     )
-    execute_query(conn, query, params)
+    _write(conn, "Insurance", query, params)
 
 def update_insurance(conn, insurance_id, data):
     """Update an existing insurance provider's information."""
@@ -137,23 +296,54 @@ def update_insurance(conn, insurance_id, data):
         data["ContactNumber"],
         insurance_id
     )
-    execute_query(conn, query, params)
+    _write(conn, "Insurance", query, params)
+
+@cached("Insurance")
+def find_insurance(conn, term, limit=SEARCH_LIMIT, stream=False, sort=None, descending=False):
+    """Search insurance providers by ID, name prefix, or email prefix."""
+    return _search(
+        conn,
+        "Insurance",
+        term,
+        id_columns=("InsuranceID",),
+        text_columns=("InsuranceName", "Email"),
+        limit=limit,
+        stream=stream,
+        sort=sort,
+        descending=descending,
+    )
 
 def delete_insurance(conn, insurance_id):
     """Delete an insurance provider by InsuranceID."""
     query = "DELETE FROM Insurance WHERE InsuranceID = %s"
-    execute_query(conn, query, (insurance_id,))
+    _delete(conn, "Insurance", query, (insurance_id,))
 
 
 # -------------------------
 # HCPDepartments
 # -------------------------
 
-def get_all_hcp_departments(conn):
+@cached("HCPDepartments")
+def get_all_hcp_departments(conn, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
     """Retrieve all entries from the HCPDepartments table."""
     query = "SELECT * FROM HCPDepartments"
+    if stream:
+        return stream_data(conn, query, chunk_size=chunk_size)
     return fetch_data(conn, query)
 
+@cached("HCPDepartments")
+def get_hcp_departments_page(conn, after=None, before=None, page_size=DEFAULT_PAGE_SIZE, sort=None, descending=False):
+    """Retrieve one page of HCP department entries in HCPID, DepartmentName order, or by sort; returns (rows, next_token)."""
+    return fetch_page(
+        conn, "HCPDepartments", ("HCPID", "DepartmentName"), after=after, before=before, page_size=page_size,
+        sort=sort, descending=descending
+    )
+
+@cached("HCPDepartments")
+def get_hcp_department(conn, hcp_id, department_name):
+    """Retrieve a single department entry."""
+    return fetch_row(conn, "HCPDepartments", ("HCPID", "DepartmentName"), (hcp_id, department_name))
+
 def add_hcp_department_to_db(conn, data):
     """Insert a new department into the HCPDepartments table."""
     query = """
@@ -164,7 +354,7 @@ def add_hcp_department_to_db(conn, data):
         data["HCPID"],
         data["DepartmentName"]
     )
-    execute_query(conn, query, params)
+    _write(conn, "HCPDepartments", query, params)
 
 def update_hcp_department(conn, hcp_id, department_name, data):
     """Update an existing department."""
@@ -178,22 +368,50 @@ def update_hcp_department(conn, hcp_id, department_name, data):
         hcp_id,
         department_name
     )
-    execute_query(conn, query, params)
+    _write(conn, "HCPDepartments", query, params)
+
+@cached("HCPDepartments")
+def find_hcp_departments(conn, term, limit=SEARCH_LIMIT, stream=False, sort=None, descending=False):
+    """Search HCP departments by HCP ID or department name prefix."""
+    return _search(
+        conn,
+        "HCPDepartments",
+        term,
+        id_columns=("HCPID",),
+        text_columns=("DepartmentName",),
+        limit=limit,
+        stream=stream,
+        sort=sort,
+        descending=descending,
+    )
 
 def delete_hcp_department(conn, hcp_id, department_name):
     """Delete a department entry."""
     query = "DELETE FROM HCPDepartments WHERE HCPID = %s AND DepartmentName = %s"
-    execute_query(conn, query, (hcp_id, department_name))
+    _delete(conn, "HCPDepartments", query, (hcp_id, department_name))
 
 # -------------------------
 # Visits
 # -------------------------
 
-def get_all_visits(conn):
+def get_all_visits(conn, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
     """Retrieve all entries from the Visits table."""
     query = "SELECT * FROM Visits"
+    if stream:
+        return stream_data(conn, query, chunk_size=chunk_size)
     return fetch_data(conn, query)
 
+def get_visits_page(conn, after=None, before=None, page_size=DEFAULT_PAGE_SIZE, sort=None, descending=False):
+    """Retrieve one page of visits in PatientID, VisitDate order, or by sort; returns (rows, next_token)."""
+    return fetch_page(
+        conn, "Visits", ("PatientID", "VisitDate"), after=after, before=before, page_size=page_size,
+        sort=sort, descending=descending
+    )
+
+def get_visit(conn, patient_id, visit_date):
+    """Retrieve a single visit by PatientID and VisitDate."""
+    return fetch_row(conn, "Visits", ("PatientID", "VisitDate"), (patient_id, visit_date))
+
 def add_visit_to_db(conn, data):
     """Insert a new visit into the Visits table."""
     query = """
@@ -207,7 +425,7 @@ def add_visit_to_db(conn, data):
         data["Reason"],
         data["Notes"]
     )
-    execute_query(conn, query, params)
+    _write(conn, "Visits", query, params)
 
 
 def update_visit(conn, patient_id, visit_date, data):
@@ -225,24 +443,76 @@ def update_visit(conn, patient_id, visit_date, data):
         patient_id,
         visit_date
     )
-    execute_query(conn, query, params)
+    _write(conn, "Visits", query, params)
+
+
+def find_visits(conn, term, limit=SEARCH_LIMIT, stream=False, sort=None, descending=False):
+    """Search visits by patient or HCP ID, visit date, or reason prefix."""
+    return _search(
+        conn,
+        "Visits",
+        term,
+        id_columns=("PatientID", "HCPID"),
+        date_columns=("VisitDate",),
+        text_columns=("Reason",),
+        limit=limit,
+        stream=stream,
+        sort=sort,
+        descending=descending,
+    )
 
+def search_visit_notes(conn, text, page=0, page_size=NOTES_PAGE_SIZE, phrase=False):
+    """
+    Full-text search over Visits.Reason and Visits.Notes, best matches first.
+    :param text: Boolean-mode search string, e.g. 'cough +fever -chronic "blood work" cardio*'
+    :param page: Zero-based page number
+    :param page_size: Rows per page
+    :param phrase: Match text as one exact phrase instead of boolean syntax
+    :return: Visits rows with a trailing Relevance column
+    """
+    if phrase:
+        text = '"' + text.replace('"', " ") + '"'
+    query = """
+    SELECT PatientID, VisitDate, HCPID, Reason, Notes,
+           MATCH(Reason, Notes) AGAINST (%s IN BOOLEAN MODE) AS Relevance
+    FROM Visits
+    WHERE MATCH(Reason, Notes) AGAINST (%s IN BOOLEAN MODE)
+    ORDER BY Relevance DESC, PatientID, VisitDate
+    LIMIT %s OFFSET %s
+    """
+    return fetch_data(conn, query, (text, text, page_size, page * page_size))
 
 def delete_visit(conn, patient_id, visit_date):
     """Delete a visit by PatientID and VisitDate."""
     query = "DELETE FROM Visits WHERE PatientID = %s AND VisitDate = %s"
-    execute_query(conn, query, (patient_id, visit_date))
+    _delete(conn, "Visits", query, (patient_id, visit_date))
 
 
 # -------------------------
 # Medications
 # -------------------------
 
-def get_all_medications(conn):
+@cached("Medications")
+def get_all_medications(conn, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
     """Retrieve all medications from the Medications table."""
     query = "SELECT * FROM Medications"
+    if stream:
+        return stream_data(conn, query, chunk_size=chunk_size)
     return fetch_data(conn, query)
 
+@cached("Medications")
+def get_medications_page(conn, after=None, before=None, page_size=DEFAULT_PAGE_SIZE, sort=None, descending=False):
+    """Retrieve one page of medications in MedicationID order, or by sort; returns (rows, next_token)."""
+    return fetch_page(
+        conn, "Medications", ("MedicationID",), after=after, before=before, page_size=page_size,
+        sort=sort, descending=descending
+    )
+
+@cached("Medications")
+def get_medication(conn, medication_id):
+    """Retrieve a single medication by MedicationID."""
+    return fetch_row(conn, "Medications", ("MedicationID",), (medication_id,))
+
 def add_medication_to_db(conn, data):
     """Insert a new medication into the Medications table."""
     query = """
@@ -255,7 +525,7 @@ def add_medication_to_db(conn, data):
         data["Dosage"],
         data["Manufacturer"]
     )
-    execute_query(conn, query, params)
+    _write(conn, "Medications", query, params)
 
 def update_medication(conn, medication_id, data):
     """Update an existing medication's information."""
@@ -270,23 +540,51 @@ def update_medication(conn, medication_id, data):
         data["Manufacturer"],
         medication_id
     )
-    execute_query(conn, query, params)
+    _write(conn, "Medications", query, params)
+
+@cached("Medications")
+def find_medications(conn, term, limit=SEARCH_LIMIT, stream=False, sort=None, descending=False):
+    """Search medications by ID, name prefix, or manufacturer prefix."""
+    return _search(
+        conn,
+        "Medications",
+        term,
+        id_columns=("MedicationID",),
+        text_columns=("MedicationName", "Manufacturer"),
+        limit=limit,
+        stream=stream,
+        sort=sort,
+        descending=descending,
+    )
 
 def delete_medication(conn, medication_id):
     """Delete a medication by MedicationID."""
     query = "DELETE FROM Medications WHERE MedicationID = %s"
-    execute_query(conn, query, (medication_id,))
+    _delete(conn, "Medications", query, (medication_id,))
 
 
 # -------------------------
 # PatientInsurance
 # -------------------------
 
-def get_all_patient_insurance(conn):
+def get_all_patient_insurance(conn, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
     """Retrieve all entries from the PatientInsurance table."""
     query = "SELECT * FROM PatientInsurance"
+    if stream:
+        return stream_data(conn, query, chunk_size=chunk_size)
     return fetch_data(conn, query)
 
+def get_patient_insurance_page(conn, after=None, before=None, page_size=DEFAULT_PAGE_SIZE, sort=None, descending=False):
+    """Retrieve one page of patient-insurance entries in PatientID, InsuranceID order, or by sort; returns (rows, next_token)."""
+    return fetch_page(
+        conn, "PatientInsurance", ("PatientID", "InsuranceID"), after=after, before=before, page_size=page_size,
+        sort=sort, descending=descending
+    )
+
+def get_patient_insurance(conn, patient_id, insurance_id):
+    """Retrieve a single patient-insurance entry."""
+    return fetch_row(conn, "PatientInsurance", ("PatientID", "InsuranceID"), (patient_id, insurance_id))
+
 def add_patient_insurance_to_db(conn, data):
     """Insert a new entry into the PatientInsurance table."""
     query = """
@@ -297,7 +595,7 @@ def add_patient_insurance_to_db(conn, data):
         data["PatientID"],
         data["InsuranceID"]
     )
-    execute_query(conn, query, params)
+    _write(conn, "PatientInsurance", query, params)
 
 def update_patient_insurance(conn, patient_id, insurance_id, data):
     """Update a patient-insurance entry."""
@@ -311,70 +609,122 @@ def update_patient_insurance(conn, patient_id, insurance_id, data):
         patient_id,
         insurance_id
     )
-    execute_query(conn, query, params)
+    _write(conn, "PatientInsurance", query, params)
+
+def find_patient_insurance(conn, term, limit=SEARCH_LIMIT, stream=False, sort=None, descending=False):
+    """Search patient-insurance entries by patient or insurance ID."""
+    return _search(
+        conn,
+        "PatientInsurance",
+        term,
+        id_columns=("PatientID", "InsuranceID"),
+        date_columns=("CoverageStartDate", "CoverageEndDate"),
+        limit=limit,
+        stream=stream,
+        sort=sort,
+        descending=descending,
+    )
 
 def delete_patient_insurance(conn, patient_id, insurance_id):
     """Delete a patient-insurance entry."""
     query = "DELETE FROM PatientInsurance WHERE PatientID = %s AND InsuranceID = %s"
-    execute_query(conn, query, (patient_id, insurance_id))
+    _delete(conn, "PatientInsurance", query, (patient_id, insurance_id))
 
 # -------------------------
 # PatientMedications
 # -------------------------
 
-def get_all_patient_medications(conn):
+def get_all_patient_medications(conn, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
     """Retrieve all entries from the PatientMedications table."""
     query = "SELECT * FROM PatientMedications"
+    if stream:
+        return stream_data(conn, query, chunk_size=chunk_size)
     return fetch_data(conn, query)
 
+def get_patient_medications_page(conn, after=None, before=None, page_size=DEFAULT_PAGE_SIZE, sort=None, descending=False):
+    """Retrieve one page of patient-medication entries in PatientID, MedicationID order, or by sort; returns (rows, next_token)."""
+    return fetch_page(
+        conn, "PatientMedications", ("PatientID", "MedicationID"), after=after, before=before, page_size=page_size,
+        sort=sort, descending=descending
+    )
+
+def get_patient_medication(conn, patient_id, medication_id):
+    """Retrieve a single patient-medication entry."""
+    return fetch_row(conn, "PatientMedications", ("PatientID", "MedicationID"), (patient_id, medication_id))
+
 def add_patient_medication_to_db(conn, data):
     """Insert a new entry into the PatientMedications table."""
     query = """
-    INSERT INTO PatientMedications (PatientID, MedicationID, MedicationName, StartDate, EndDate, Dosage)
-    VALUES (%s, %s, %s, %s, %s, %s)
+    INSERT INTO PatientMedications (PatientID, MedicationID, StartDate, EndDate, Dosage)
+    VALUES (%s, %s, %s, %s, %s)
     """
     params = (
         data["PatientID"],
         data["MedicationID"],
-        data["MedicationName"],
         data["StartDate"],
         data["EndDate"],
         data["Dosage"],
     )
-    execute_query(conn, query, params)
+    _write(conn, "PatientMedications", query, params)
 
 def update_patient_medication(conn, patient_id, medication_id, data):
     """Update a patient-medication entry."""
     query = """
     UPDATE PatientMedications
-    SET MedicationName = %s, StartDate = %s, EndDate = %s, Dosage = %s
+    SET StartDate = %s, EndDate = %s, Dosage = %s
     WHERE PatientID = %s AND MedicationID = %s
     """
     params = (
-        data["MedicationName"],
         data["StartDate"],
         data["EndDate"],
         data["Dosage"],
         patient_id,
         medication_id,
     )
-    execute_query(conn, query, params)
+    _write(conn, "PatientMedications", query, params)
+
+def find_patient_medications(conn, term, limit=SEARCH_LIMIT, stream=False, sort=None, descending=False):
+    """Search patient-medication entries by patient or medication ID."""
+    return _search(
+        conn,
+        "PatientMedications",
+        term,
+        id_columns=("PatientID", "MedicationID"),
+        date_columns=("StartDate", "EndDate"),
+        limit=limit,
+        stream=stream,
+        sort=sort,
+        descending=descending,
+    )
 
 def delete_patient_medication(conn, patient_id, medication_id):
     """Delete a patient-medication entry."""
     query = "DELETE FROM PatientMedications WHERE PatientID = %s AND MedicationID = %s"
-    execute_query(conn, query, (patient_id, medication_id))
+    _delete(conn, "PatientMedications", query, (patient_id, medication_id))
 
 
 # -------------------------
 # SideEffects
 # -------------------------
 
-def get_all_side_effects(conn):
+def get_all_side_effects(conn, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
     """Retrieve all entries from the SideEffects table."""
     query = "SELECT * FROM SideEffects"
+    if stream:
+        return stream_data(conn, query, chunk_size=chunk_size)
     return fetch_data(conn, query)
 
+def get_side_effects_page(conn, after=None, before=None, page_size=DEFAULT_PAGE_SIZE, sort=None, descending=False):
+    """Retrieve one page of side effect entries in MedicationID, SideEffectDescription order, or by sort; returns (rows, next_token)."""
+    return fetch_page(
+        conn, "SideEffects", ("MedicationID", "SideEffectDescription"), after=after, before=before, page_size=page_size,
+        sort=sort, descending=descending
+    )
+
+def get_side_effect(conn, medication_id, side_effect_description):
+    """Retrieve a single side effect entry."""
+    return fetch_row(conn, "SideEffects", ("MedicationID", "SideEffectDescription"), (medication_id, side_effect_description))
+
 def add_side_effect_to_db(conn, data):
     """Insert a new side effect into the SideEffects table."""
     query = """
@@ -386,7 +736,7 @@ def add_side_effect_to_db(conn, data):
         data["SideEffectDescription"],
         data["Severity"]
     )
-    execute_query(conn, query, params)
+    _write(conn, "SideEffects", query, params)
 
 def update_side_effect(conn, medication_id, side_effect_description, data):
     """Update a side effect entry."""
@@ -401,12 +751,26 @@ def update_side_effect(conn, medication_id, side_effect_description, data):
         medication_id,
         side_effect_description
     )
-    execute_query(conn, query, params)
+    _write(conn, "SideEffects", query, params)
+
+def find_side_effects(conn, term, limit=SEARCH_LIMIT, stream=False, sort=None, descending=False):
+    """Search side effects by medication ID, description prefix, or severity."""
+    return _search(
+        conn,
+        "SideEffects",
+        term,
+        id_columns=("MedicationID",),
+        text_columns=("SideEffectDescription", "Severity"),
+        limit=limit,
+        stream=stream,
+        sort=sort,
+        descending=descending,
+    )
 
 def delete_side_effect(conn, medication_id, side_effect_description):
     """Delete a side effect entry."""
     query = "DELETE FROM SideEffects WHERE MedicationID = %s AND SideEffectDescription = %s"
-    execute_query(conn, query, (medication_id, side_effect_description))
+    _delete(conn, "SideEffects", query, (medication_id, side_effect_description))
 
 
 def test_basic_queries():
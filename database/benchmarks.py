@@ -0,0 +1,292 @@
+"""
+Equivalence checks and timings for the join-based report queries in
+database/queries.py and database/advanced_queries.py against the
+correlated-subquery SQL they replaced.
+
+Run against a scratch database only: run_benchmark() deletes every row
+before loading generated data at each scale factor.
+"""
+import argparse
+import time
+from decimal import Decimal
+
+from database import queries, advanced_queries
+from database.crud_operations import fetch_data, execute_query
+from database.data_generator import load_generated_data, TABLES, DEFAULT_SEED
+from database.db_connection import get_cursor, close_connection, use_backend, SQLiteBackend
+from database.create_tables import create_tables
+
+
+# The original subquery-based SQL, kept verbatim for comparison except for the
+# * 1.0 that makes SQLite divide as MariaDB does, as in the rewrites
+LEGACY_QUERIES = {
+    "get_patients_by_insurance": """
+    SELECT p.PatientID, p.FirstName, p.LastName
+    FROM Patients p
+    WHERE p.PatientID IN (
+        SELECT pi.PatientID
+        FROM PatientInsurance pi
+        WHERE pi.InsuranceID = ?
+    )
+    """,
+    "get_patients_by_medication": """
+    SELECT p.PatientID, p.FirstName, p.LastName
+    FROM Patients p
+    WHERE p.PatientID IN (
+        SELECT pm.PatientID
+        FROM PatientMedications pm
+        WHERE pm.MedicationID = (
+            SELECT m.MedicationID
+            FROM Medications m
+            WHERE m.MedicationName = ?
+        )
+    )
+    """,
+    "get_visit_count_per_patient": """
+    SELECT p.PatientID, p.FirstName, p.LastName,
+           (SELECT COUNT(*)
+            FROM Visits v
+            WHERE v.PatientID = p.PatientID) VisitCount
+    FROM Patients p
+    """,
+    "get_medications_and_side_effects": """
+    SELECT m.MedicationName, m.Dosage,
+           (SELECT GROUP_CONCAT(CONCAT(Severity, ': ', SideEffectDescription) SEPARATOR '; ')
+            FROM SideEffects s
+            WHERE s.MedicationID = m.MedicationID) SideEffects
+    FROM Medications m
+    """,
+    "get_average_visits_per_patient_by_department": """
+    SELECT (SELECT COUNT(*)
+            FROM Visits v
+            WHERE v.PatientID IN (
+                SELECT p.PatientID
+                FROM Patients p
+                WHERE p.PrimaryHCPID IN (
+                    SELECT h.HCPID
+                    FROM HealthCareProfessionals h
+                    WHERE h.Department = ?
+                )
+            )) * 1.0 /
+           (SELECT COUNT(*)
+            FROM Patients p
+            WHERE p.PrimaryHCPID IN (
+                SELECT h.HCPID
+                FROM HealthCareProfessionals h
+                WHERE h.Department = ?
+            )) AS AvgVisitsPerPatient
+    """,
+    "get_patients_grouped_by_hcp": """
+    SELECT h.HCPID, h.FirstName AS HCP_FirstName, h.LastName AS HCP_LastName,
+           (SELECT GROUP_CONCAT(CONCAT(p.FirstName, ' ', p.LastName) SEPARATOR '; ')
+            FROM Patients p
+            WHERE p.PrimaryHCPID = h.HCPID) AS Patients
+    FROM HealthCareProfessionals h
+    """,
+}
+
+
+# The original advanced_queries.py SQL referenced columns the schema does not have
+# (Medications.Name, SideEffects.Description, HealthCareProfessionals.DepartmentID).
+# These are the same subqueries on the real columns, reaching departments through
+# HCPDepartments as the rewrites do.
+ADVANCED_LEGACY_QUERIES = {
+    "get_patients_by_insurance": LEGACY_QUERIES["get_patients_by_insurance"],
+    "get_patients_by_medication": LEGACY_QUERIES["get_patients_by_medication"],
+    "get_visit_count_per_patient": LEGACY_QUERIES["get_visit_count_per_patient"],
+    "get_departments_without_patients": """
+    SELECT DISTINCT d.DepartmentName
+    FROM HCPDepartments d
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM HCPDepartments hd
+        WHERE hd.DepartmentName = d.DepartmentName
+        AND EXISTS (
+            SELECT 1
+            FROM Patients p
+            WHERE p.PrimaryHCPID = hd.HCPID
+        )
+    )
+    """,
+    "get_healthcare_professionals_by_department": """
+    SELECT h.HCPID, h.FirstName, h.LastName, h.ContactNumber
+    FROM HealthCareProfessionals h
+    WHERE h.HCPID IN (
+        SELECT d.HCPID
+        FROM HCPDepartments d
+        WHERE d.DepartmentName = ?
+    )
+    """,
+    "get_medications_and_side_effects": """
+    SELECT m.MedicationName, m.Dosage,
+           (SELECT GROUP_CONCAT(s.SideEffectDescription SEPARATOR '; ')
+            FROM SideEffects s
+            WHERE s.MedicationID = m.MedicationID) AS SideEffects
+    FROM Medications m
+    """,
+    "get_average_visits_per_patient_by_department": """
+    SELECT (SELECT COUNT(*)
+            FROM Visits v
+            WHERE v.PatientID IN (
+                SELECT p.PatientID
+                FROM Patients p
+                WHERE p.PrimaryHCPID IN (
+                    SELECT d.HCPID
+                    FROM HCPDepartments d
+                    WHERE d.DepartmentName = ?
+                )
+            )) * 1.0 /
+           (SELECT COUNT(*)
+            FROM Patients p
+            WHERE p.PrimaryHCPID IN (
+                SELECT d.HCPID
+                FROM HCPDepartments d
+                WHERE d.DepartmentName = ?
+            )) AS AvgVisitsPerPatient
+    """,
+    "get_patients_grouped_by_hcp": LEGACY_QUERIES["get_patients_grouped_by_hcp"],
+}
+
+# Modules whose rewritten queries are checked, with the SQL each rewrite replaced
+CHECKED_MODULES = ((queries, LEGACY_QUERIES), (advanced_queries, ADVANCED_LEGACY_QUERIES))
+
+
+# The department each module's reports are checked for when none is given: the one with
+# the most healthcare professionals, read from where that module looks departments up
+BUSIEST_DEPARTMENT = {
+    queries: "SELECT Department FROM HealthCareProfessionals GROUP BY Department ORDER BY COUNT(*) DESC LIMIT 1",
+    advanced_queries: "SELECT DepartmentName FROM HCPDepartments GROUP BY DepartmentName ORDER BY COUNT(*) DESC LIMIT 1",
+}
+
+
+def _first(conn, query):
+    rows = fetch_data(conn, query)
+    return rows[0][0] if rows else None
+
+
+def _cases(conn, department=None):
+    """
+    Return {label: (legacy SQL, legacy params, rewritten function, rewritten args)}
+    for every query in CHECKED_MODULES, using keys present in the data.
+    """
+    insurance = _first(conn, "SELECT MIN(InsuranceID) FROM Insurance")
+    medication = _first(conn, "SELECT MIN(MedicationName) FROM Medications")
+    cases = {}
+    for module, legacy_queries in CHECKED_MODULES:
+        chosen = department or _first(conn, BUSIEST_DEPARTMENT[module])
+        arguments = {
+            "get_patients_by_insurance": ((insurance,), (insurance,)),
+            "get_patients_by_medication": ((medication,), (medication,)),
+            "get_visit_count_per_patient": (None, ()),
+            "get_departments_without_patients": (None, ()),
+            "get_healthcare_professionals_by_department": ((chosen,), (chosen,)),
+            "get_medications_and_side_effects": (None, ()),
+            "get_average_visits_per_patient_by_department": ((chosen, chosen), (chosen,)),
+            "get_patients_grouped_by_hcp": (None, ()),
+        }
+        for name, legacy in legacy_queries.items():
+            legacy_params, args = arguments[name]
+            label = f"{module.__name__.rpartition('.')[2]}.{name}"
+            cases[label] = (legacy, legacy_params, getattr(module, name), args)
+    return cases
+
+
+def _normalize(rows):
+    """Make result sets comparable regardless of row and GROUP_CONCAT order."""
+    normalized = []
+    for row in rows or []:
+        values = []
+        for value in row:
+            if isinstance(value, str) and "; " in value:
+                value = "; ".join(sorted(value.split("; ")))
+            elif isinstance(value, (float, Decimal)):
+                value = round(float(value), 4)
+            values.append(value)
+        normalized.append(tuple(values))
+    return sorted(normalized, key=repr)
+
+
+def check_equivalence(conn, department=None):
+    """
+    Compare every rewritten query with its legacy SQL.
+    :param department: Department for the per-department reports; defaults to the busiest one
+    :return: List of query labels (module.function) whose results differ
+    """
+    mismatches = []
+    for label, (legacy_sql, legacy_params, rewrite, args) in _cases(conn, department).items():
+        legacy = fetch_data(conn, legacy_sql, legacy_params)
+        rewritten = rewrite(conn, *args)
+        same = legacy is not None and _normalize(legacy) == _normalize(rewritten)
+        print(f"{label:<64} {'OK' if same else 'MISMATCH'}")
+        if not same:
+            mismatches.append(label)
+    return mismatches
+
+
+def _best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def time_queries(conn, repeat=3, department=None):
+    """
+    Time legacy and rewritten versions of each query (best of repeat runs).
+    :return: {name: (legacy seconds, rewritten seconds)}
+    """
+    timings = {}
+    for label, (legacy_sql, legacy_params, rewrite, args) in _cases(conn, department).items():
+        legacy = _best_time(lambda: fetch_data(conn, legacy_sql, legacy_params), repeat)
+        rewritten = _best_time(lambda: rewrite(conn, *args), repeat)
+        timings[label] = (legacy, rewritten)
+    return timings
+
+
+def clear_tables(conn):
+    """Delete every row, children before parents."""
+    for table, _, _ in reversed(TABLES):
+        execute_query(conn, f"DELETE FROM {table}", ())
+
+
+def run_benchmark(conn, scale_factors=(0.1, 1, 10), seed=DEFAULT_SEED, repeat=3):
+    """Load generated data at each scale factor, then check and time every query."""
+    results = {}
+    for scale_factor in scale_factors:
+        print(f"\n=== Scale factor {scale_factor} ===")
+        clear_tables(conn)
+        load_generated_data(conn, scale_factor, seed)
+
+        mismatches = check_equivalence(conn)
+        timings = time_queries(conn, repeat)
+        print(f"\n{'Query':<64} {'Legacy (s)':>12} {'Join (s)':>12} {'Speedup':>9}")
+        print("-" * 100)
+        for label, (legacy, rewritten) in timings.items():
+            speedup = legacy / rewritten if rewritten else float("inf")
+            print(f"{label:<64} {legacy:>12.4f} {rewritten:>12.4f} {speedup:>8.1f}x")
+        results[scale_factor] = {"mismatches": mismatches, "timings": timings}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark rewritten report queries. Wipes all table data.")
+    parser.add_argument("--scale-factors", type=float, nargs="+", default=[0.1, 1, 10])
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--yes", action="store_true", help="Confirm the target database may be wiped")
+    parser.add_argument("--sqlite", metavar="PATH", help="Run on an SQLite database file (or :memory:) instead")
+    args = parser.parse_args()
+    if not args.yes:
+        parser.error("this benchmark deletes every row in the database; pass --yes to continue")
+    if args.sqlite:
+        use_backend(SQLiteBackend(args.sqlite))
+        create_tables()
+
+    conn = get_cursor()[1]
+    try:
+        run_benchmark(conn, args.scale_factors, args.seed, args.repeat)
+    finally:
+        close_connection(conn, None)
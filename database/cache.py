@@ -0,0 +1,99 @@
+import functools
+import threading
+import time
+
+from database.transactions import in_transaction
+
+
+# Seconds a cached result is served before it is fetched again
+DEFAULT_TTL = 300
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache whose entries expire after a time-to-live.
+    Keys are tuples starting with a table name, so every entry read from a
+    table can be dropped at once when that table is written.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # key -> (expiry time, value)
+        self._generations = {}  # table -> times invalidated
+        self._cleared = 0  # times every entry was invalidated
+        self._lock = threading.Lock()
+
+    def _generation(self, table):
+        return self._cleared, self._generations.get(table, 0)
+
+    def get_or_load(self, key, load, ttl=None):
+        """
+        Return the cached value for key, calling load() to fill it when missing or expired.
+        None results (failed queries) are not cached, and neither are results whose
+        table was invalidated while load() ran, since they may predate the write.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation(key[0])
+
+        value = load()
+        if value is not None:
+            expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+            with self._lock:
+                if self._generation(key[0]) == generation:
+                    self._entries[key] = (expires, value)
+        return value
+
+    def invalidate(self, *tables):
+        """Drop the entries for the given tables, or every entry if none are given."""
+        with self._lock:
+            if not tables:
+                self._cleared += 1
+                self._entries.clear()
+                return
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            for key in [k for k in self._entries if k[0] in tables]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Process-wide cache shared by basic_queries, the GUI and reports
+reference_cache = TTLCache()
+
+
+def cached(table, ttl=None):
+    """
+    Cache a query function's results under table, keyed by its arguments except conn.
+    Calls with stream=True bypass the cache, since generators cannot be replayed,
+    and so do calls inside a transaction() block, which must see their own
+    uncommitted writes and must not publish rows that may yet be rolled back.
+    Results are shared between callers and must not be modified.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(conn, *args, **kwargs):
+            if kwargs.get("stream") or in_transaction(conn):
+                return func(conn, *args, **kwargs)
+            key = (table, func.__name__, args, tuple(sorted(kwargs.items())))
+            return reference_cache.get_or_load(key, lambda: func(conn, *args, **kwargs), ttl)
+        return wrapper
+    return decorator
+
+
+def invalidate(*tables):
+    """
+    Drop cached results for tables after they are written; no tables clears everything.
+    Writers inside a transaction should call after_commit(conn, invalidate, table) instead,
+    so readers cannot cache the old rows again before the write is committed.
+    """
+    reference_cache.invalidate(*tables)
@@ -0,0 +1,272 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolExhaustedError(RuntimeError):
+    """Raised when no connection becomes available before the checkout timeout."""
+
+
+class PooledConnection:
+    """
+    Thin proxy around a raw DB-API connection checked out of a ConnectionPool.
+    Every attribute is forwarded to the raw connection, except close(), which
+    hands the connection back to the pool instead of closing the socket.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._lock = threading.Lock()  # Held by ConnectionPool.interrupt(), so the checkout cannot end mid-KILL
+
+    @property
+    def raw(self):
+        """The underlying driver connection."""
+        return self._raw
+
+    @property
+    def closed(self):
+        return self._raw is None
+
+    def close(self):
+        """Return the connection to its pool. Safe to call more than once."""
+        with self._lock:
+            raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw)
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise RuntimeError("Connection has already been returned to the pool.")
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections.
+
+    :param connect: Zero-argument callable returning a new raw connection
+    :param min_size: Connections kept open even when idle
+    :param max_size: Upper bound on open connections (checked out + idle)
+    :param idle_timeout: Seconds an idle connection above min_size may live
+    :param checkout_timeout: Seconds acquire() waits for a free connection
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, idle_timeout=300, checkout_timeout=30):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1.")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+
+        self._idle = deque()  # (raw connection, time it was returned)
+        self._size = 0  # Open connections, idle or checked out
+        self._closed = False
+        self._cond = threading.Condition()
+        self._control = None  # Connection outside the pool that sends KILL QUERY, opened on first use
+        self._control_lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def idle_count(self):
+        return len(self._idle)
+
+    def fill(self):
+        """Open connections until min_size is reached."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                raw = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append((raw, time.monotonic()))
+                self._cond.notify()
+
+    def acquire(self, timeout=None):
+        """Check out a live connection, opening a new one if the pool has room."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            raw = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed.")
+                    expired = self._prune_idle()
+                    if self._idle:
+                        raw, _ = self._idle.pop()  # Most recently used is the warmest
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolExhaustedError(
+                            f"No database connection available after {timeout}s "
+                            f"(max_size={self.max_size})."
+                        )
+                    self._cond.wait(remaining)
+
+            for stale in expired:
+                self._close_raw(stale)
+
+            if raw is None:
+                try:
+                    raw = self._connect()
+                except Exception:
+                    self._discard()
+                    raise
+                return PooledConnection(self, raw)
+
+            if self._is_alive(raw):
+                return PooledConnection(self, raw)
+
+            # Dead connection (server restart, wait_timeout...): drop it and retry
+            self._close_raw(raw)
+            self._discard()
+
+    def release(self, raw):
+        """Return a raw connection to the pool."""
+        try:
+            # Never hand uncommitted work from one caller to the next
+            raw.rollback()
+        except Exception:
+            self._close_raw(raw)
+            self._discard()
+            return
+
+        with self._cond:
+            if not self._closed:
+                self._idle.append((raw, time.monotonic()))
+                self._cond.notify()
+                return
+            self._size -= 1
+        self._close_raw(raw)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager that checks a connection out and back in."""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def interrupt(self, conn):
+        """
+        Kill the statement running on a checked-out PooledConnection.
+        Does nothing once conn has been returned, since its raw connection may
+        already be running someone else's statement. The KILL is sent on a
+        control connection kept outside the pool, so it never waits for a free
+        pooled connection. Blocks while the KILL is sent, so call it from a
+        thread other than conn's.
+        """
+        try:
+            with conn._lock:
+                raw = conn._raw
+                if raw is None:
+                    return  # Checkout already ended
+                if hasattr(raw, "interrupt"):
+                    raw.interrupt()  # Driver can cancel the statement itself (sqlite3)
+                    return
+                thread_id = getattr(raw, "connection_id", None)
+                if thread_id is None:
+                    return  # Driver cannot identify the server thread
+                self._kill(int(thread_id))
+        except Exception as e:
+            print(f"Error interrupting query: {e}")
+
+    def _kill(self, thread_id):
+        """Send KILL QUERY on the control connection, reconnecting once if it has dropped."""
+        with self._control_lock:
+            for retry in (False, True):
+                if self._control is None:
+                    if self._closed:
+                        return
+                    self._control = self._connect()
+                try:
+                    cur = self._control.cursor()
+                    try:
+                        cur.execute(f"KILL QUERY {thread_id}")
+                    finally:
+                        cur.close()
+                    return
+                except Exception:
+                    if retry or self._is_alive(self._control):
+                        raise  # The KILL itself failed, not the connection
+                    self._close_raw(self._control)
+                    self._control = None
+
+    def close(self):
+        """Close idle connections and the control connection; checked-out ones are closed when released."""
+        with self._cond:
+            self._closed = True
+            idle = [raw for raw, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for raw in idle:
+            self._close_raw(raw)
+        with self._control_lock:
+            control, self._control = self._control, None
+        if control is not None:
+            self._close_raw(control)
+
+    def _prune_idle(self):
+        """Detach connections idle past idle_timeout. Caller holds the lock."""
+        expired = []
+        if self.idle_timeout is None:
+            return expired
+        cutoff = time.monotonic() - self.idle_timeout
+        # Oldest connections sit at the left end of the deque
+        while self._idle and self._size > self.min_size and self._idle[0][1] < cutoff:
+            raw, _ = self._idle.popleft()
+            self._size -= 1
+            expired.append(raw)
+        return expired
+
+    def _discard(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _is_alive(raw):
+        try:
+            if hasattr(raw, "ping"):
+                raw.ping()
+            else:
+                cur = raw.cursor()
+                cur.execute("SELECT 1")
+                cur.fetchall()
+                cur.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
@@ -1,4 +1,98 @@
-from database.db_connection import get_cursor, close_connection
+from database.db_connection import get_cursor, close_connection, get_backend
+
+
+# Columns of every table, in schema order; the only names accepted where a column is chosen at run time
+TABLE_COLUMNS = {
+    "HealthCareProfessionals": ("HCPID", "FirstName", "LastName", "ContactNumber", "Department"),
+    "Patients": ("PatientID", "FirstName", "LastName", "DOB", "Address", "PhoneNumber", "PrimaryHCPID"),
+    "Medications": ("MedicationID", "MedicationName", "Dosage", "Manufacturer"),
+    "Insurance": ("InsuranceID", "InsuranceName", "Email", "ContactNumber"),
+    "Visits": ("PatientID", "VisitDate", "HCPID", "Reason", "Notes"),
+    "PatientInsurance": ("PatientID", "InsuranceID", "CoverageStartDate", "CoverageEndDate"),
+    "SideEffects": ("MedicationID", "SideEffectDescription", "Severity"),
+    "HCPDepartments": ("HCPID", "DepartmentName"),
+    "PatientMedications": ("PatientID", "MedicationID", "StartDate", "EndDate", "Dosage"),
+}
+
+# Secondary indexes: (index name, table, indexed columns)
+INDEXES = [
+    ("idx_patients_name", "Patients", ("LastName", "FirstName")),
+    ("idx_patients_first_name", "Patients", ("FirstName",)),
+    ("idx_patients_primary_hcp", "Patients", ("PrimaryHCPID",)),
+    ("idx_patients_dob", "Patients", ("DOB",)),
+    ("idx_hcps_name", "HealthCareProfessionals", ("LastName", "FirstName")),
+    ("idx_hcps_department", "HealthCareProfessionals", ("Department",)),
+    ("idx_medications_name", "Medications", ("MedicationName",)),
+    ("idx_visits_hcp_date", "Visits", ("HCPID", "VisitDate")),
+    ("idx_visits_date", "Visits", ("VisitDate",)),
+    ("idx_patient_insurance_insurance", "PatientInsurance", ("InsuranceID",)),
+    ("idx_patient_medications_medication", "PatientMedications", ("MedicationID",)),
+    # Every column a find_* search ORs together needs an index, or the whole OR becomes a table scan
+    ("idx_hcps_first_name", "HealthCareProfessionals", ("FirstName",)),
+    ("idx_medications_manufacturer", "Medications", ("Manufacturer",)),
+    ("idx_insurance_name", "Insurance", ("InsuranceName",)),
+    ("idx_insurance_email", "Insurance", ("Email",)),
+    ("idx_visits_reason", "Visits", ("Reason",)),
+    ("idx_hcp_departments_name", "HCPDepartments", ("DepartmentName",)),
+    ("idx_side_effects_description", "SideEffects", ("SideEffectDescription",)),
+    ("idx_side_effects_severity", "SideEffects", ("Severity",)),
+    ("idx_patient_insurance_start", "PatientInsurance", ("CoverageStartDate",)),
+    ("idx_patient_insurance_end", "PatientInsurance", ("CoverageEndDate",)),
+    ("idx_patient_medications_start", "PatientMedications", ("StartDate",)),
+    ("idx_patient_medications_end", "PatientMedications", ("EndDate",)),
+]
+
+# Full-text indexes: (index name, table, indexed columns)
+FULLTEXT_INDEXES = [
+    ("ft_visits_reason_notes", "Visits", ("Reason", "Notes")),
+]
+
+
+def index_definition(name):
+    """
+    Return (table, columns, fulltext) for the index called name.
+    Migrations build their statements from this, so each index is defined only above.
+    :raises KeyError: If name is in neither INDEXES nor FULLTEXT_INDEXES
+    """
+    for indexes, fulltext in ((INDEXES, False), (FULLTEXT_INDEXES, True)):
+        for index_name, table, columns in indexes:
+            if index_name == name:
+                return table, columns, fulltext
+    raise KeyError(f"No index named {name!r}")
+
+
+def indexed_columns(table):
+    """
+    Return the columns of table that are cheap to sort by: those with a single-column secondary index.
+    InnoDB appends the primary key to such an index, so ORDER BY column, key is a range scan.
+    A composite index (a, b) is ordered by a, b, key and cannot serve ORDER BY a, key.
+    """
+    return {columns[0] for _, indexed_table, columns in INDEXES if indexed_table == table and len(columns) == 1}
+
+
+def index_statements():
+    """Return the idempotent CREATE INDEX statements for INDEXES and FULLTEXT_INDEXES."""
+    statements = [
+        f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        for name, table, columns in INDEXES
+    ]
+    if not get_backend().fulltext:
+        return statements
+    statements += [
+        f"CREATE FULLTEXT INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        for name, table, columns in FULLTEXT_INDEXES
+    ]
+    return statements
+
+
+def create_indexes(cur):
+    """Create any missing secondary indexes."""
+    for query in index_statements():
+        try:
+            cur.execute(query)
+            print(f"Executed query: {query}")  # Debugging info
+        except Exception as e:
+            print(f"Error executing query: {e}")
 
 
 def create_tables():
@@ -106,6 +200,8 @@ def create_tables():
         except Exception as e:
             print(f"Error executing query: {e}")
 
+    create_indexes(cur)
+
     close_connection(conn, cur)
 
 
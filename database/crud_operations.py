@@ -1,4 +1,21 @@
+import base64
+import json
+import time
+from itertools import islice
 from database.db_connection import get_cursor, close_connection
+from database.transactions import transaction, in_transaction
+from database.instrumentation import record, caller
+from database.create_tables import TABLE_COLUMNS
+
+
+# Rows pulled from the server per round trip when streaming
+DEFAULT_CHUNK_SIZE = 1000
+
+# Rows sent to the server per executemany() call when bulk inserting
+DEFAULT_BATCH_SIZE = 500
+
+# Rows per page for keyset pagination
+DEFAULT_PAGE_SIZE = 100
 
 
 # Execute a query (INSERT, UPDATE, DELETE)
@@ -8,36 +25,103 @@ def execute_query(conn, query, values):
     :param conn: Database connection
     :param query: SQL query string
     :param values: Parameters for the query
-    :return: None
+    :return: Number of rows affected, or None if the statement failed
+
+    Inside a transaction() block the commit is deferred to the end of the block.
     """
+    cur = None
+    start = time.perf_counter()
+    rowcount = None
+    failed = True
     try:
         cur = conn.cursor()
         cur.execute(query, values)
-        conn.commit()  # Save the changes to the database
+        rowcount = cur.rowcount
+        if not in_transaction(conn):
+            conn.commit()  # Save the changes to the database
+        failed = False
         print("Query executed successfully.")
+        return rowcount
     except Exception as e:
         print(f"Error executing query: {e}")
+        if in_transaction(conn):
+            raise  # Let the enclosing transaction roll back
     finally:
-        cur.close()
+        record(query, start, rowcount, failed)  # Includes the commit, where InnoDB flushes its log
+        if cur:
+            cur.close()
 
 
 # Create - Insert data into a table
 def insert_data(conn, query, values):
     """Insert data into the specified table."""
+    cur = None
+    start = time.perf_counter()
+    rowcount = None
+    failed = True
     try:
         cur = conn.cursor()
         cur.execute(query, values)
-        conn.commit()  # Save the changes to the database
+        rowcount = cur.rowcount
+        if not in_transaction(conn):
+            conn.commit()  # Save the changes to the database
+        failed = False
         print("Data inserted successfully.")
     except Exception as e:
         print(f"Error inserting data: {e}")
+        if in_transaction(conn):
+            raise  # Let the enclosing transaction roll back
     finally:
-        cur.close()
+        record(query, start, rowcount, failed)
+        if cur:
+            cur.close()
+
+
+# Create - Insert many rows at once
+def bulk_insert(conn, query, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Insert rows in batches through executemany(), all in one transaction.
+    :param conn: Database connection
+    :param query: Parameterized INSERT statement for a single row
+    :param rows: Iterable of parameter tuples; generators are consumed lazily
+    :param batch_size: Number of rows sent per executemany() call
+    :return: Number of rows inserted
+    :raises Exception: If any batch fails, after rolling back every row this call inserted
+
+    MariaDB Connector/Python sends each executemany() batch using the bulk
+    protocol, so a batch costs one round trip rather than one per row.
+    """
+    total = 0
+    try:
+        with transaction(conn):
+            cur = conn.cursor()
+            start = time.perf_counter()
+            failed = True
+            try:
+                rows = iter(rows)
+                while True:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    cur.executemany(query, batch)
+                    total += len(batch)
+                failed = False
+            finally:
+                cur.close()
+                record(query, start, total, failed)
+        print(f"Inserted {total} rows.")
+        return total
+    except Exception as e:
+        print(f"Error bulk inserting data: {e}")
+        raise  # A partial load must not pass for a complete one
 
 
 # Read - Fetch data from the database
 def fetch_data(conn, query, values=None):
     """Fetch data from the specified table."""
+    cur = None
+    start = time.perf_counter()
+    rows = None
     try:
         cur = conn.cursor()
         if values:
@@ -50,21 +134,223 @@ def fetch_data(conn, query, values=None):
         print(f"Error fetching data: {e}")
         return None
     finally:
-        cur.close()
+        record(query, start, len(rows) if rows is not None else None, rows is None)
+        if cur:
+            cur.close()
+
+
+# Read - Stream data from the database without materializing the whole result
+def stream_data(conn, query, values=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield rows one by one, fetching them from the server in chunks.
+    :param conn: Database connection
+    :param query: SQL query string
+    :param values: Parameters for the query
+    :param chunk_size: Number of rows fetched per round trip
+    :return: Generator of row tuples
+
+    The cursor is unbuffered, so the connection cannot run another statement
+    until the generator is exhausted or closed.
+    """
+    # Rows are pulled by whoever iterates, e.g. a worker thread; credit the function asking for them
+    return _stream(conn, query, values, chunk_size, caller())
+
+
+def _stream(conn, query, values, chunk_size, issued_by):
+    cur = None
+    start = time.perf_counter()
+    count = 0
+    failed = True
+    try:
+        cur = conn.cursor(buffered=False)
+        if values:
+            cur.execute(query, values)
+        else:
+            cur.execute(query)
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            count += len(rows)
+            yield from rows
+        failed = False
+    except GeneratorExit:
+        failed = False  # Closed early by the consumer
+        raise
+    except Exception as e:
+        print(f"Error streaming data: {e}")
+    finally:
+        if cur:
+            cur.close()
+        record(query, start, count, failed, issued_by)  # Time until the stream was exhausted or closed
+
+
+def encode_page_token(key):
+    """Turn a row's key values into an opaque continuation token."""
+    raw = json.dumps(list(key), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_page_token(token):
+    """Recover the key values stored in a continuation token."""
+    return json.loads(base64.urlsafe_b64decode(token.encode()))
+
+
+def _seek_condition(key_columns, operator):
+    """Build (a > ?) OR (a = ? AND b > ?) ... for a composite key."""
+    terms = []
+    for i, column in enumerate(key_columns):
+        equal = [f"{c} = ?" for c in key_columns[:i]]
+        terms.append("(" + " AND ".join(equal + [f"{column} {operator} ?"]) + ")")
+    return "(" + " OR ".join(terms) + ")"
+
+
+def _seek_params(key):
+    params = []
+    for i in range(len(key)):
+        params.extend(key[: i + 1])
+    return params
+
+
+def _sort_seek(sort, key_columns, operator, key):
+    """
+    Build the seek condition for ORDER BY sort, key_columns, where sort may be NULL.
+    NULLs come first in an ascending scan and last in a descending one, as in MariaDB.
+    :return: (condition, params)
+    """
+    value = key[0]
+    key_seek = _seek_condition(key_columns, operator)
+    key_params = _seek_params(key[1:])
+    if value is None:
+        condition = f"({sort} IS NULL AND {key_seek})"
+        if operator == ">":
+            condition = f"({condition} OR {sort} IS NOT NULL)"
+        return condition, key_params
+
+    condition = f"{sort} {operator} ? OR ({sort} = ? AND {key_seek})"
+    if operator == "<":
+        condition += f" OR {sort} IS NULL"
+    return f"({condition})", [value, value] + key_params
+
+
+def check_sort_column(table, sort):
+    """
+    Raise ValueError unless sort is None or a column of table.
+    Column names cannot be bound as parameters, so sort is pasted into the SQL.
+    """
+    if sort is not None and sort not in TABLE_COLUMNS.get(table, ()):
+        raise ValueError(f"Cannot sort {table} by {sort!r}")
+
+
+def page_columns(key_columns, sort=None):
+    """Return the columns a page is ordered by, and its tokens hold: sort first, then the key."""
+    if sort is None or sort == key_columns[0]:
+        return tuple(key_columns)
+    return (sort,) + tuple(column for column in key_columns if column != sort)
+
+
+# Read - Fetch one page of a table using keyset (seek) pagination
+def fetch_page(conn, table, key_columns, after=None, before=None, page_size=DEFAULT_PAGE_SIZE,
+               sort=None, descending=False):
+    """
+    Fetch a page of rows ordered by key_columns without OFFSET.
+    :param conn: Database connection
+    :param table: Table name
+    :param key_columns: Primary key columns, in index order
+    :param after: Token from a previous page; return the rows that follow it
+    :param before: Token from a previous page; return the rows that precede it
+    :param page_size: Maximum rows to return
+    :param sort: Column to order by ahead of the key; the key breaks ties so
+                 every row has a unique position
+    :param descending: Reverse the order
+    :return: (rows in page order, token continuing in the same direction or None)
+    :raises ValueError: If sort is not a column of table
+    :raises Exception: If the query fails; an empty page would be mistaken for
+                       the end of the table, and cached as one
+
+    Each page is an index range scan starting at the token's key, so page
+    10,000 costs the same as page 1. Sorting stays a range scan only when sort
+    leads an index (InnoDB secondary indexes end with the primary key).
+    """
+    check_sort_column(table, sort)
+    backwards = before is not None
+    token = before if backwards else after
+    reverse = descending != backwards
+    order = " DESC" if reverse else ""
+    operator = "<" if reverse else ">"
+    columns = page_columns(key_columns, sort)
+    query = f"SELECT * FROM {table}"
+    params = []
+    if token is not None:
+        key = decode_page_token(token)
+        if len(columns) > len(key_columns):
+            condition, params = _sort_seek(columns[0], columns[1:], operator, key)
+        else:
+            condition, params = _seek_condition(columns, operator), _seek_params(key)
+        query += " WHERE " + condition
+    query += " ORDER BY " + ", ".join(column + order for column in columns)
+    query += " LIMIT ?"
+    params.append(page_size + 1)  # One extra row tells us whether another page exists
+
+    cur = None
+    start = time.perf_counter()
+    rows = None
+    try:
+        cur = conn.cursor()
+        cur.execute(query, tuple(params))
+        rows = cur.fetchall()
+        names = [d[0] for d in cur.description]
+        key_indexes = [names.index(column) for column in columns]
+    except Exception as e:
+        print(f"Error fetching page: {e}")
+        raise
+    finally:
+        record(query, start, len(rows) if rows is not None else None, rows is None)
+        if cur:
+            cur.close()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_token = encode_page_token([rows[-1][i] for i in key_indexes]) if has_more else None
+    if backwards:
+        rows.reverse()
+    return rows, next_token
+
+
+# Read - Fetch a single row by primary key
+def fetch_row(conn, table, key_columns, key):
+    """
+    Fetch the row whose key_columns equal key.
+    :return: Row tuple, or None if no row matches
+    """
+    conditions = " AND ".join(f"{column} = ?" for column in key_columns)
+    rows = fetch_data(conn, f"SELECT * FROM {table} WHERE {conditions}", tuple(key))
+    return rows[0] if rows else None
 
 
 # Update - Update data in the database
 def update_data(conn, query, values):
     """Update data in the specified table."""
+    cur = None
+    start = time.perf_counter()
+    rowcount = None
+    failed = True
     try:
         cur = conn.cursor()
         cur.execute(query, values)
-        conn.commit()  # Save the changes to the database
+        rowcount = cur.rowcount
+        if not in_transaction(conn):
+            conn.commit()  # Save the changes to the database
+        failed = False
         print("Data updated successfully.")
     except Exception as e:
         print(f"Error updating data: {e}")
+        if in_transaction(conn):
+            raise  # Let the enclosing transaction roll back
     finally:
-        cur.close()
+        record(query, start, rowcount, failed)
+        if cur:
+            cur.close()
 
 
 # Example: Insert a new healthcare professional into the database
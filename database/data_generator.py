@@ -0,0 +1,293 @@
+"""
+Deterministic synthetic data for load and performance testing.
+
+Volumes follow a TPC-style scale factor: SF1 is 10,000 patients, SF100 is
+1,000,000, and every other table grows in proportion. Each table draws from
+its own random stream seeded by (seed, table name), so any table can be
+regenerated on its own and produces the same rows for the same inputs.
+"""
+import argparse
+import csv
+import os
+import random
+from datetime import date, timedelta
+from itertools import islice
+
+from database.crud_operations import bulk_insert, DEFAULT_BATCH_SIZE
+from database.db_connection import get_cursor, close_connection
+
+
+DEFAULT_SEED = 42
+
+# Rows per table at scale factor 1
+PATIENTS_PER_SF = 10_000
+HCPS_PER_SF = 100
+MEDICATIONS_PER_SF = 50
+INSURANCE_PER_SF = 10
+
+# Rows committed per transaction when loading into the database
+DEFAULT_COMMIT_EVERY = 50_000
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Daniel", "Lisa", "Matthew", "Nancy",
+    "Anthony", "Betty", "Mark", "Sandra", "Steven", "Ashley", "Paul", "Emily",
+    "Andrew", "Laura", "Joshua", "Maria", "Kevin", "Olivia", "Brian", "Sofia",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+    "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson",
+    "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker",
+    "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+]
+STREETS = ["Main St", "Oak St", "Maple Ave", "Elm St", "Park Blvd", "Cedar Rd", "Pine St", "Lake Dr"]
+CITIES = ["Cityville", "Townsville", "New City", "Springfield", "Riverside", "Fairview"]
+AREA_CODES = ["212", "347", "646", "718", "917"]
+DEPARTMENTS = [
+    "Cardiology", "Neurology", "Orthopedics", "Pediatrics", "General Surgery",
+    "Emergency Medicine", "Oncology", "Dermatology", "Radiology", "Psychiatry",
+    "General Medicine", "Neonatology", "Sports Medicine", "Trauma Surgery",
+]
+DRUG_PREFIXES = [
+    "Amo", "Ator", "Cipro", "Dexa", "Flu", "Ibu", "Levo", "Meto", "Omep", "Para",
+    "Predni", "Simva", "Lisino", "Metfor", "Losar", "Gaba", "Sertra", "Clopi",
+]
+DRUG_SUFFIXES = ["xicillin", "vastatin", "floxacin", "methasone", "profen", "pril", "sartan", "min", "razole", "pentin"]
+MANUFACTURERS = ["PharmaCorp", "HealthMeds", "MediCare", "BioPharma", "NewPharmaCorp", "CureLabs", "GenRx"]
+DOSAGES = ["10mg", "25mg", "50mg", "100mg", "250mg", "500mg", "750mg"]
+SIDE_EFFECTS = [
+    "Nausea", "Headache", "Dizziness", "Diarrhea", "Rash", "Fatigue", "Insomnia",
+    "Dry mouth", "Constipation", "Blurred vision", "Muscle pain", "Drowsiness",
+]
+SEVERITIES = ["Mild", "Moderate", "Severe"]
+INSURER_WORDS = ["Health", "Care", "Med", "Life", "Well", "Secure", "Premium", "Plus", "First", "United"]
+VISIT_REASONS = [
+    "Routine Check-up", "Follow-up", "Consultation", "Emergency Visit",
+    "Surgery Follow-up", "Initial Visit", "Vaccination", "Lab Results Review",
+]
+NOTE_FINDINGS = [
+    "Patient in good health.", "Blood pressure slightly elevated.", "Reported persistent cough.",
+    "Complained of lower back pain.", "Presented with severe abdominal pain.",
+    "Mild fever and sore throat.", "Healing progressing well.", "Blood sugar within range.",
+]
+NOTE_PLANS = [
+    "Scheduled for next visit in 6 months.", "Adjusted medication dosage.",
+    "Referred to cardiologist for further evaluation.", "Ordered blood work and X-ray.",
+    "Advised rest and hydration.", "Treated and discharged.", "Prescribed physical therapy.",
+]
+
+VISIT_HISTORY_START = date(2015, 1, 1)
+VISIT_HISTORY_DAYS = 10 * 365
+
+
+def table_sizes(scale_factor):
+    """Return the number of rows generated for each base table."""
+    return {
+        "Patients": max(1, int(PATIENTS_PER_SF * scale_factor)),
+        "HealthCareProfessionals": max(1, int(HCPS_PER_SF * scale_factor)),
+        "Medications": max(1, int(MEDICATIONS_PER_SF * scale_factor)),
+        "Insurance": max(1, int(INSURANCE_PER_SF * scale_factor)),
+    }
+
+
+def _make_id(n):
+    return f"{n:08d}"
+
+
+def _rng(seed, table):
+    return random.Random(f"{seed}:{table}")
+
+
+def _phone(rng):
+    return f"{rng.choice(AREA_CODES)}-555-{rng.randint(0, 9999):04d}"
+
+
+def generate_healthcare_professionals(scale_factor=1, seed=DEFAULT_SEED):
+    """Yield HealthCareProfessionals rows."""
+    rng = _rng(seed, "HealthCareProfessionals")
+    for n in range(1, table_sizes(scale_factor)["HealthCareProfessionals"] + 1):
+        yield (
+            _make_id(n),
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            _phone(rng),
+            rng.choice(DEPARTMENTS),
+        )
+
+
+def generate_patients(scale_factor=1, seed=DEFAULT_SEED):
+    """Yield Patients rows; about 1 in 10 has no primary HCP."""
+    rng = _rng(seed, "Patients")
+    sizes = table_sizes(scale_factor)
+    for n in range(1, sizes["Patients"] + 1):
+        dob = date(1930, 1, 1) + timedelta(days=rng.randrange(90 * 365))
+        primary_hcp = None if rng.random() < 0.1 else _make_id(rng.randint(1, sizes["HealthCareProfessionals"]))
+        yield (
+            _make_id(n),
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            dob.isoformat(),
+            f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}",
+            _phone(rng),
+            primary_hcp,
+        )
+
+
+def generate_medications(scale_factor=1, seed=DEFAULT_SEED):
+    """Yield Medications rows with unique names."""
+    rng = _rng(seed, "Medications")
+    combinations = len(DRUG_PREFIXES) * len(DRUG_SUFFIXES)
+    for n in range(1, table_sizes(scale_factor)["Medications"] + 1):
+        i = n - 1
+        name = DRUG_PREFIXES[i % len(DRUG_PREFIXES)] + DRUG_SUFFIXES[(i // len(DRUG_PREFIXES)) % len(DRUG_SUFFIXES)]
+        if i >= combinations:
+            name = f"{name} {i // combinations + 1}"
+        yield (_make_id(n), name, rng.choice(DOSAGES), rng.choice(MANUFACTURERS))
+
+
+def generate_insurance(scale_factor=1, seed=DEFAULT_SEED):
+    """Yield Insurance rows."""
+    rng = _rng(seed, "Insurance")
+    for n in range(1, table_sizes(scale_factor)["Insurance"] + 1):
+        name = f"{rng.choice(INSURER_WORDS)}{rng.choice(INSURER_WORDS)} {n}"
+        domain = name.split()[0].lower()
+        yield (_make_id(n), name, f"contact{n}@{domain}.com", _phone(rng))
+
+
+def generate_visits(scale_factor=1, seed=DEFAULT_SEED):
+    """Yield Visits rows, 0-8 per patient on distinct dates."""
+    rng = _rng(seed, "Visits")
+    sizes = table_sizes(scale_factor)
+    for n in range(1, sizes["Patients"] + 1):
+        for offset in sorted(rng.sample(range(VISIT_HISTORY_DAYS), rng.randint(0, 8))):
+            yield (
+                _make_id(n),
+                (VISIT_HISTORY_START + timedelta(days=offset)).isoformat(),
+                _make_id(rng.randint(1, sizes["HealthCareProfessionals"])),
+                rng.choice(VISIT_REASONS),
+                f"{rng.choice(NOTE_FINDINGS)} {rng.choice(NOTE_PLANS)}",
+            )
+
+
+def generate_patient_insurance(scale_factor=1, seed=DEFAULT_SEED):
+    """Yield PatientInsurance rows, 0-2 distinct insurers per patient."""
+    rng = _rng(seed, "PatientInsurance")
+    sizes = table_sizes(scale_factor)
+    insurers = range(1, sizes["Insurance"] + 1)
+    for n in range(1, sizes["Patients"] + 1):
+        for insurance in rng.sample(insurers, min(len(insurers), rng.randint(0, 2))):
+            start = VISIT_HISTORY_START + timedelta(days=rng.randrange(VISIT_HISTORY_DAYS))
+            end = None if rng.random() < 0.3 else start + timedelta(days=365)
+            yield (_make_id(n), _make_id(insurance), start.isoformat(), end.isoformat() if end else None)
+
+
+def generate_side_effects(scale_factor=1, seed=DEFAULT_SEED):
+    """Yield SideEffects rows, 0-4 distinct side effects per medication."""
+    rng = _rng(seed, "SideEffects")
+    for n in range(1, table_sizes(scale_factor)["Medications"] + 1):
+        for description in rng.sample(SIDE_EFFECTS, rng.randint(0, 4)):
+            yield (_make_id(n), description, rng.choice(SEVERITIES))
+
+
+def generate_hcp_departments(scale_factor=1, seed=DEFAULT_SEED):
+    """Yield HCPDepartments rows, 1-2 distinct departments per HCP."""
+    rng = _rng(seed, "HCPDepartments")
+    for n in range(1, table_sizes(scale_factor)["HealthCareProfessionals"] + 1):
+        for department in rng.sample(DEPARTMENTS, rng.randint(1, 2)):
+            yield (_make_id(n), department)
+
+
+def generate_patient_medications(scale_factor=1, seed=DEFAULT_SEED):
+    """Yield PatientMedications rows, 0-4 distinct medications per patient."""
+    rng = _rng(seed, "PatientMedications")
+    sizes = table_sizes(scale_factor)
+    medications = range(1, sizes["Medications"] + 1)
+    for n in range(1, sizes["Patients"] + 1):
+        for medication in rng.sample(medications, min(len(medications), rng.randint(0, 4))):
+            start = VISIT_HISTORY_START + timedelta(days=rng.randrange(VISIT_HISTORY_DAYS))
+            end = start + timedelta(days=rng.choice([30, 90, 180, 365]))
+            yield (_make_id(n), _make_id(medication), start.isoformat(), end.isoformat(), rng.choice(DOSAGES))
+
+
+# Tables in foreign-key order: (table, columns, generator)
+TABLES = [
+    ("HealthCareProfessionals", ("HCPID", "FirstName", "LastName", "ContactNumber", "Department"),
+     generate_healthcare_professionals),
+    ("Patients", ("PatientID", "FirstName", "LastName", "DOB", "Address", "PhoneNumber", "PrimaryHCPID"),
+     generate_patients),
+    ("Medications", ("MedicationID", "MedicationName", "Dosage", "Manufacturer"), generate_medications),
+    ("Insurance", ("InsuranceID", "InsuranceName", "Email", "ContactNumber"), generate_insurance),
+    ("Visits", ("PatientID", "VisitDate", "HCPID", "Reason", "Notes"), generate_visits),
+    ("PatientInsurance", ("PatientID", "InsuranceID", "CoverageStartDate", "CoverageEndDate"),
+     generate_patient_insurance),
+    ("SideEffects", ("MedicationID", "SideEffectDescription", "Severity"), generate_side_effects),
+    ("HCPDepartments", ("HCPID", "DepartmentName"), generate_hcp_departments),
+    ("PatientMedications", ("PatientID", "MedicationID", "StartDate", "EndDate", "Dosage"),
+     generate_patient_medications),
+]
+
+
+def load_generated_data(conn, scale_factor=1, seed=DEFAULT_SEED, batch_size=DEFAULT_BATCH_SIZE,
+                        commit_every=DEFAULT_COMMIT_EVERY):
+    """
+    Stream generated rows for every table into the database.
+    :param conn: Database connection
+    :param scale_factor: 1 means 10,000 patients
+    :param seed: Seed for the random streams
+    :param batch_size: Rows per executemany() call
+    :param commit_every: Rows per transaction, to keep undo logs bounded
+    :return: Dict of rows inserted per table
+    :raises Exception: If a chunk fails to insert; chunks committed before it stay loaded
+    """
+    counts = {}
+    for table, columns, generate in TABLES:
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        rows = generate(scale_factor, seed)
+        counts[table] = 0
+        while True:
+            chunk = list(islice(rows, commit_every))
+            if not chunk:
+                break
+            counts[table] += bulk_insert(conn, query, chunk, batch_size)
+        print(f"Loaded {counts[table]} rows into {table}.")
+    return counts
+
+
+def write_csv(directory, scale_factor=1, seed=DEFAULT_SEED):
+    """
+    Write one <Table>.csv file per table into directory.
+    :return: Dict of rows written per table
+    """
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for table, columns, generate in TABLES:
+        path = os.path.join(directory, f"{table}.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            counts[table] = 0
+            for row in generate(scale_factor, seed):
+                writer.writerow(row)
+                counts[table] += 1
+        print(f"Wrote {counts[table]} rows to {path}.")
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic hospital data.")
+    parser.add_argument("--scale-factor", type=float, default=1, help="1 = 10,000 patients")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--csv", metavar="DIRECTORY", help="Write CSV files instead of loading the database")
+    args = parser.parse_args()
+
+    if args.csv:
+        write_csv(args.csv, args.scale_factor, args.seed)
+    else:
+        conn = get_cursor()[1]
+        try:
+            load_generated_data(conn, args.scale_factor, args.seed, args.batch_size)
+        finally:
+            close_connection(conn, None)
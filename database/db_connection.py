@@ -1,7 +1,12 @@
-import mariadb
 import sys
 import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
 from dotenv import load_dotenv
+from database.connection_pool import ConnectionPool, PoolExhaustedError
 
 # Load environment variables from a .env file
 load_dotenv()
@@ -13,22 +18,283 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = int(os.getenv("DB_PORT", 3306))  # Default to 3306 if not set
 DB_NAME = os.getenv("DB_NAME")
 
+# Database engine: "mariadb" (default) or "sqlite" for an in-process database
+DB_BACKEND = os.getenv("DB_BACKEND", "mariadb").lower()
+DB_SQLITE_PATH = os.getenv("DB_SQLITE_PATH", "hospital.db")  # ":memory:" for a throwaway database
 
-# Function to connect to the MariaDB database
-def connect_to_db():
-    print("Attempting to connect to the database...")  # Debug print
-    try:
-        conn = mariadb.connect(
+# Connection pool sizing
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", 300))  # Seconds
+DB_POOL_CHECKOUT_TIMEOUT = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", 30))  # Seconds
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# -------------------------
+# Backends
+# -------------------------
+
+class MariaDBBackend:
+    """MariaDB through MariaDB Connector/Python; SQL is sent as written."""
+
+    name = "mariadb"
+    fulltext = True
+
+    def connect(self):
+        import mariadb  # Imported on first use, so the SQLite backend works without the driver
+
+        return mariadb.connect(
             user=DB_USER,
             password=DB_PASSWORD,
             host=DB_HOST,
             port=DB_PORT,
             database=DB_NAME,
         )
+
+    @property
+    def errors(self):
+        import mariadb
+
+        return (mariadb.Error,)
+
+
+class SQLiteBackend:
+    """
+    In-process SQLite database. Statements written for MariaDB are rewritten
+    by translate_sql(), and CONCAT, CURDATE and TIMESTAMPDIFF are registered
+    as functions with MariaDB semantics.
+    Full-text search (MATCH ... AGAINST) has no SQLite equivalent.
+
+    :param path: Database file, or ":memory:" for a database shared by this
+                 backend's connections that lasts while one stays open
+    """
+
+    name = "sqlite"
+    fulltext = False
+    errors = (sqlite3.Error,)
+
+    def __init__(self, path=DB_SQLITE_PATH):
+        self.path = path
+        self.memory = path == ":memory:"
+
+    def connect(self):
+        if self.memory:
+            raw = sqlite3.connect(f"file:hospital_{id(self)}?mode=memory&cache=shared", uri=True,
+                                  check_same_thread=False)
+        else:
+            raw = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            raw.execute("PRAGMA journal_mode=WAL")  # Readers do not block the writer
+        raw.execute("PRAGMA foreign_keys=ON")
+        raw.create_function("CONCAT", -1, _concat, deterministic=True)
+        raw.create_function("CURDATE", 0, lambda: date.today().isoformat())
+        raw.create_function("TIMESTAMPDIFF", 3, _timestampdiff, deterministic=True)
+        return SQLiteConnection(raw)
+
+
+class SQLiteConnection:
+    """sqlite3 connection that accepts the MariaDB-flavoured SQL used throughout the code."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def cursor(self, buffered=True):
+        # sqlite3 cursors always step through results lazily, so buffered has no effect
+        return SQLiteCursor(self._raw.cursor())
+
+    def begin(self):
+        if not self._raw.in_transaction:
+            self._raw.execute("BEGIN")
+
+    def interrupt(self):
+        """Abort the statement running on this connection; safe to call from another thread."""
+        self._raw.interrupt()
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class SQLiteCursor:
+    """sqlite3 cursor that runs statements through translate_sql()."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def execute(self, query, values=None):
+        self._raw.execute(translate_sql(query), tuple(values) if values else ())
+        return self
+
+    def executemany(self, query, rows):
+        self._raw.executemany(translate_sql(query), rows)
+        return self
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+# SQLite 3.44 added ORDER BY inside aggregate calls
+_AGGREGATE_ORDER_BY = sqlite3.sqlite_version_info >= (3, 44, 0)
+
+_STRING = r"'(?:[^']|'')*'"
+_SET_STATEMENT = re.compile(r"^\s*SET\s+STATEMENT\s+.*?\s+FOR\s+", re.IGNORECASE | re.DOTALL)
+_GROUP_CONCAT_BODY = re.compile(
+    rf"^(?P<expr>.*?)(?:\s+ORDER\s+BY\s+(?P<order>.*?))?(?:\s+SEPARATOR\s+(?P<sep>{_STRING}))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@lru_cache(maxsize=512)
+def translate_sql(query):
+    """
+    Rewrite a MariaDB statement for SQLite: %s placeholders become ?,
+    <=> becomes IS, SET STATEMENT ... FOR prefixes are dropped, the unit of
+    TIMESTAMPDIFF is quoted and GROUP_CONCAT ... SEPARATOR takes SQLite's form.
+    String literals are left untouched.
+    """
+    query = _SET_STATEMENT.sub("", query)
+    parts = re.split(f"({_STRING})", query)
+    for i in range(0, len(parts), 2):  # Odd parts are string literals
+        part = parts[i].replace("%s", "?").replace("<=>", " IS ")
+        parts[i] = re.sub(r"\bTIMESTAMPDIFF\(\s*(\w+)\s*,", r"TIMESTAMPDIFF('\1',", part, flags=re.IGNORECASE)
+    return _rewrite_group_concat("".join(parts))
+
+
+def _closing_paren(query, start):
+    """Index of the parenthesis closing the one before start, skipping string literals."""
+    depth, i = 1, start
+    while i < len(query):
+        char = query[i]
+        if char == "'":
+            i = query.index("'", i + 1)
+            while query.startswith("'", i + 1):  # '' is an escaped quote
+                i = query.index("'", i + 2)
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError(f"Unbalanced parentheses in: {query}")
+
+
+def _rewrite_group_concat(query):
+    """GROUP_CONCAT(x ORDER BY y SEPARATOR 's') -> group_concat(x, 's' ORDER BY y)."""
+    pattern = re.compile(r"\bGROUP_CONCAT\(", re.IGNORECASE)
+    match = pattern.search(query)
+    while match:
+        start = match.end()
+        end = _closing_paren(query, start)
+        body = _GROUP_CONCAT_BODY.match(query[start:end])
+        args = body["expr"].strip()
+        if body["sep"]:
+            args += f", {body['sep']}"
+        if body["order"] and _AGGREGATE_ORDER_BY:
+            args += f" ORDER BY {body['order'].strip()}"
+        query = f"{query[:match.start()]}group_concat({args}){query[end + 1:]}"
+        match = pattern.search(query, match.start() + len("group_concat("))
+    return query
+
+
+def _concat(*values):
+    """MariaDB CONCAT(): NULL if any argument is NULL."""
+    if any(value is None for value in values):
+        return None
+    return "".join(str(value) for value in values)
+
+
+def _to_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
+
+
+def _timestampdiff(unit, start, end):
+    """MariaDB TIMESTAMPDIFF(): whole units from start to end, truncated toward zero."""
+    if start is None or end is None:
+        return None
+    start, end = _to_datetime(start), _to_datetime(end)
+    if end < start:
+        return -_timestampdiff(unit, end, start)
+    unit = unit.upper()
+    if unit in ("YEAR", "QUARTER", "MONTH"):
+        months = (end.year - start.year) * 12 + end.month - start.month
+        if (end.day, end.time()) < (start.day, start.time()):
+            months -= 1
+        return months // {"YEAR": 12, "QUARTER": 3, "MONTH": 1}[unit]
+    seconds = {"WEEK": 604800, "DAY": 86400, "HOUR": 3600, "MINUTE": 60, "SECOND": 1}[unit]
+    return int((end - start).total_seconds() // seconds)
+
+
+BACKENDS = {"mariadb": MariaDBBackend, "sqlite": SQLiteBackend}
+
+_backend = None
+
+
+def get_backend():
+    """Return the backend chosen by DB_BACKEND, or the one set with use_backend()."""
+    global _backend
+    if _backend is None:
+        if DB_BACKEND not in BACKENDS:
+            raise ValueError(f"Unknown DB_BACKEND {DB_BACKEND!r}; expected one of {', '.join(BACKENDS)}")
+        _backend = BACKENDS[DB_BACKEND]()
+    return _backend
+
+
+def use_backend(backend):
+    """Switch backends, e.g. use_backend(SQLiteBackend(":memory:")) in tests; closes the current pool."""
+    global _backend
+    close_pool()
+    _backend = backend
+
+
+def _open_connection():
+    """Open a new physical connection with the configured backend."""
+    return get_backend().connect()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it and opening DB_POOL_MIN_SIZE connections on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            pool = ConnectionPool(
+                _open_connection,
+                min_size=DB_POOL_MIN_SIZE,
+                max_size=DB_POOL_MAX_SIZE,
+                idle_timeout=DB_POOL_IDLE_TIMEOUT,
+                checkout_timeout=DB_POOL_CHECKOUT_TIMEOUT,
+            )
+            pool.fill()
+            _pool = pool
+        return _pool
+
+
+def close_pool():
+    """Close every idle pooled connection and forget the pool."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+# Function to connect to the MariaDB database
+def connect_to_db():
+    """Check a connection out of the pool. close_connection() hands it back."""
+    print("Attempting to connect to the database...")  # Debug print
+    try:
+        conn = get_pool().acquire()
         print("Successfully connected to the database!")  # Success message
         return conn
-    except mariadb.Error as e:
-        print(f"Error connecting to MariaDB: {e}")
+    except get_backend().errors + (PoolExhaustedError,) as e:
+        print(f"Error connecting to {get_backend().name}: {e}")
         sys.exit(1)
 
 
@@ -40,7 +306,7 @@ def get_cursor():
 
 
 def close_connection(conn, cur=None):
-    """Close the cursor and the connection."""
+    """Close the cursor and return the connection to the pool."""
     try:
         if cur:  # Only attempt to close the cursor if it exists
             cur.close()
@@ -1,4 +1,4 @@
-from database.crud_operations import insert_data
+from database.crud_operations import bulk_insert
 from database.db_connection import get_cursor, close_connection
 
 
@@ -17,8 +17,7 @@ def populate_healthcare_professionals(conn):
     INSERT INTO HealthCareProfessionals (HCPID, FirstName, LastName, ContactNumber, Department)
     VALUES (?, ?, ?, ?, ?)
     """
-    for record in data:
-        insert_data(conn, query, record)
+    bulk_insert(conn, query, data)
 
 
 def populate_patients(conn):
@@ -74,8 +73,7 @@ def populate_patients(conn):
     INSERT INTO Patients (PatientID, FirstName, LastName, DOB, Address, PhoneNumber, PrimaryHCPID)
     VALUES (?, ?, ?, ?, ?, ?, ?)
     """
-    for record in data:
-        insert_data(conn, query, record)
+    bulk_insert(conn, query, data)
 
 
 def populate_medications(conn):
@@ -91,8 +89,7 @@ def populate_medications(conn):
     INSERT INTO Medications (MedicationID, MedicationName, Dosage, Manufacturer)
     VALUES (?, ?, ?, ?)
     """
-    for record in data:
-        insert_data(conn, query, record)
+    bulk_insert(conn, query, data)
 
 
 def populate_insurance(conn):
@@ -108,8 +105,7 @@ def populate_insurance(conn):
     INSERT INTO Insurance (InsuranceID, InsuranceName, Email, ContactNumber)
     VALUES (?, ?, ?, ?)
     """
-    for record in data:
-        insert_data(conn, query, record)
+    bulk_insert(conn, query, data)
 
 
 def populate_visits(conn):
@@ -126,8 +122,7 @@ def populate_visits(conn):
     INSERT INTO Visits (PatientID, VisitDate, HCPID, Reason, Notes)
     VALUES (?, ?, ?, ?, ?)
     """
-    for record in data:
-        insert_data(conn, query, record)
+    bulk_insert(conn, query, data)
 
 
 def populate_patient_insurance(conn):
@@ -143,8 +138,7 @@ def populate_patient_insurance(conn):
     INSERT INTO PatientInsurance (PatientID, InsuranceID, CoverageStartDate, CoverageEndDate)
     VALUES (?, ?, ?, ?)
     """
-    for record in data:
-        insert_data(conn, query, record)
+    bulk_insert(conn, query, data)
 
 
 def populate_side_effects(conn):
@@ -162,8 +156,7 @@ def populate_side_effects(conn):
     INSERT INTO SideEffects (MedicationID, SideEffectDescription, Severity)
     VALUES (?, ?, ?)
     """
-    for record in data:
-        insert_data(conn, query, record)
+    bulk_insert(conn, query, data)
 
 
 def populate_hcp_departments(conn):
@@ -183,8 +176,7 @@ def populate_hcp_departments(conn):
     INSERT INTO HCPDepartments (HCPID, DepartmentName)
     VALUES (?, ?)
     """
-    for record in data:
-        insert_data(conn, query, record)
+    bulk_insert(conn, query, data)
 
 
 def populate_patient_medications(conn):
@@ -200,10 +192,9 @@ def populate_patient_medications(conn):
     ]
     query = """
     INSERT INTO PatientMedications (PatientID, MedicationID, StartDate, EndDate, Dosage)
-    VALUES (?, ?, ?, ?, ?, ?)
+    VALUES (?, ?, ?, ?, ?)
     """
-    for record in data:
-        insert_data(conn, query, record)
+    bulk_insert(conn, query, data)
 
 
 
@@ -0,0 +1,176 @@
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+
+# Record statement timings; set DB_INSTRUMENTATION=0 to turn recording off
+ENABLED = os.getenv("DB_INSTRUMENTATION", "1") != "0"
+
+# Statements slower than this many seconds are written to the slow-query log
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_SECONDS", 0.5))
+
+# Rotating slow-query log file, rolled over at SLOW_QUERY_LOG_BYTES with SLOW_QUERY_LOG_BACKUPS kept
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "slow_queries.log")
+SLOW_QUERY_LOG_BYTES = 5 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 5
+
+# Modules whose frames are skipped when working out which function issued a statement;
+# worker threads' own frames are plumbing too, so the search falls back to credit_to()
+_PLUMBING = {
+    "database.crud_operations", "database.cache", "database.async_operations",
+    "concurrent.futures.thread", "threading", __name__,
+}
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+_stats = {}  # (caller, fingerprint) -> QueryStats
+_stats_lock = threading.Lock()
+_listeners = []
+_slow_log = None
+_credit = threading.local()  # Function credited with a thread's statements when none is on its stack
+
+
+class QueryStats:
+    """Running totals for one statement fingerprint issued by one function."""
+
+    __slots__ = ("count", "total", "max", "rows", "errors")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.errors = 0
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query):
+    """
+    Normalize a statement so that runs differing only in literal values group together:
+    comments dropped, literals and placeholders replaced by ?, IN lists collapsed, whitespace squeezed.
+    """
+    query = _COMMENT.sub(" ", query)
+    query = _STRING.sub("?", query)
+    query = query.replace("%s", "?")
+    query = _NUMBER.sub("?", query)
+    query = _LIST.sub("(...)", query)
+    return " ".join(query.split())
+
+
+def caller():
+    """
+    Name the first function outside the database plumbing on the current stack,
+    or the one given to credit_to() when the stack holds none.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        name = frame.f_code.co_name
+        if module not in _PLUMBING and not name.startswith("_") and name != "<genexpr>":
+            return f"{module}.{name}"
+        frame = frame.f_back
+    return getattr(_credit, "name", None) or "?"
+
+
+@contextmanager
+def credit_to(name):
+    """
+    Credit statements issued in the block from plumbing alone to name.
+    For worker threads running calls on another thread's behalf, e.g. AsyncPool.fetch().
+    """
+    previous = getattr(_credit, "name", None)
+    _credit.name = name
+    try:
+        yield
+    finally:
+        _credit.name = previous
+
+
+def record(query, start, rows=None, failed=False, issued_by=None):
+    """
+    Record a statement that began at time.perf_counter() value start.
+    Call it from a finally block, so failed and killed statements are counted too.
+    :param rows: Rows returned or affected, if known
+    :param failed: The statement raised, timed out or was killed
+    :param issued_by: Function that issued the statement, if not the one on the current stack
+    """
+    if not ENABLED:
+        return
+    duration = time.perf_counter() - start
+    key = (issued_by or caller(), fingerprint(query))
+    with _stats_lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = QueryStats()
+        stats.count += 1
+        stats.total += duration
+        stats.max = max(stats.max, duration)
+        stats.rows += rows or 0
+        stats.errors += failed
+
+    if duration >= SLOW_QUERY_SECONDS:
+        _slow_query_log().warning(
+            "%.3fs rows=%s caller=%s%s %s", duration, rows, key[0], " FAILED" if failed else "", key[1]
+        )
+    for listener in _listeners:
+        listener(key[1], duration, rows, key[0], failed)
+
+
+def _slow_query_log():
+    """The slow-query logger, given its rotating file the first time a statement is slow."""
+    global _slow_log
+    if _slow_log is None:
+        logger = logging.getLogger("database.slow_queries")
+        with _stats_lock:
+            if not logger.handlers:
+                handler = RotatingFileHandler(
+                    SLOW_QUERY_LOG, maxBytes=SLOW_QUERY_LOG_BYTES, backupCount=SLOW_QUERY_LOG_BACKUPS
+                )
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                logger.addHandler(handler)
+                logger.setLevel(logging.WARNING)
+                logger.propagate = False
+        _slow_log = logger
+    return _slow_log
+
+
+def add_listener(callback):
+    """Call callback(fingerprint, seconds, rows, caller, failed) after every recorded statement."""
+    _listeners.append(callback)
+
+
+def remove_listener(callback):
+    _listeners.remove(callback)
+
+
+def get_stats():
+    """
+    Return recorded totals, most expensive first.
+    :return: List of (caller, fingerprint, count, total seconds, max seconds, rows, errors)
+    """
+    with _stats_lock:
+        stats = [(who, fp, s.count, s.total, s.max, s.rows, s.errors) for (who, fp), s in _stats.items()]
+    return sorted(stats, key=lambda row: row[3], reverse=True)
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def report(limit=20):
+    """Print the statements with the most total time."""
+    print(f"{'Caller':<56} {'Calls':>7} {'Total (s)':>10} {'Max (s)':>9} {'Rows':>9} {'Errors':>7}")
+    print("-" * 103)
+    for who, fp, count, total, longest, rows, errors in get_stats()[:limit]:
+        print(f"{who:<56} {count:>7} {total:>10.4f} {longest:>9.4f} {rows:>9} {errors:>7}")
+        print(f"    {fp[:120]}")
@@ -0,0 +1,154 @@
+import argparse
+import importlib
+import pkgutil
+import re
+
+import database.migrations
+from database.db_connection import get_cursor, close_connection
+
+
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS SchemaVersion (
+    Version INT PRIMARY KEY,
+    Name VARCHAR(255),
+    AppliedAt DATETIME DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+_MIGRATION_NAME = re.compile(r"^(\d{4})_(\w+)$")
+
+
+def discover_migrations():
+    """Return [(version, name, module)] for every migration, oldest first."""
+    migrations = []
+    for info in pkgutil.iter_modules(database.migrations.__path__):
+        match = _MIGRATION_NAME.match(info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"database.migrations.{info.name}")
+        migrations.append((int(match.group(1)), match.group(2), module))
+    migrations.sort(key=lambda m: m[0])
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError("Duplicate migration version numbers in database/migrations.")
+    return migrations
+
+
+def applied_versions(conn):
+    """Return the set of versions recorded in SchemaVersion."""
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT Version FROM SchemaVersion")
+        return {row[0] for row in cur.fetchall()}
+    except Exception:
+        return set()  # Table not created yet
+    finally:
+        cur.close()
+
+
+def _run(conn, statements, dry_run):
+    cur = conn.cursor()
+    try:
+        for statement in statements:
+            print(f"  {statement}")
+            if not dry_run:
+                cur.execute(statement)
+    finally:
+        cur.close()
+
+
+def migrate(conn, target=None, dry_run=False):
+    """
+    Apply pending migrations up to and including target (default: latest).
+    :param conn: Database connection
+    :param target: Highest version to apply
+    :param dry_run: Print the statements without executing them
+    :return: List of versions applied
+
+    MariaDB commits DDL implicitly, so each migration is recorded as soon as
+    its statements succeed. Migrations use IF [NOT] EXISTS so a migration that
+    failed half way can simply be run again.
+    """
+    if not dry_run:
+        _run(conn, [SCHEMA_VERSION_TABLE.strip()], dry_run=False)
+    done = applied_versions(conn)
+    applied = []
+
+    for version, name, module in discover_migrations():
+        if version in done or (target is not None and version > target):
+            continue
+        print(f"{'Would apply' if dry_run else 'Applying'} migration {version:04d}_{name}:")
+        _run(conn, module.UP, dry_run)
+        if not dry_run:
+            cur = conn.cursor()
+            try:
+                cur.execute("INSERT INTO SchemaVersion (Version, Name) VALUES (?, ?)", (version, name))
+            finally:
+                cur.close()
+            conn.commit()
+        applied.append(version)
+
+    if not applied:
+        print("Schema is up to date.")
+    return applied
+
+
+def rollback(conn, target, dry_run=False):
+    """
+    Undo applied migrations newer than target, newest first.
+    :param conn: Database connection
+    :param target: Version to roll back to (0 undoes everything)
+    :param dry_run: Print the statements without executing them
+    :return: List of versions rolled back
+    """
+    done = applied_versions(conn)
+    rolled_back = []
+
+    for version, name, module in reversed(discover_migrations()):
+        if version not in done or version <= target:
+            continue
+        down = getattr(module, "DOWN", None)
+        if down is None:
+            raise RuntimeError(f"Migration {version:04d}_{name} cannot be rolled back.")
+        print(f"{'Would roll back' if dry_run else 'Rolling back'} migration {version:04d}_{name}:")
+        _run(conn, down, dry_run)
+        if not dry_run:
+            cur = conn.cursor()
+            try:
+                cur.execute("DELETE FROM SchemaVersion WHERE Version = ?", (version,))
+            finally:
+                cur.close()
+            conn.commit()
+        rolled_back.append(version)
+
+    return rolled_back
+
+
+def status(conn):
+    """Print every migration and whether it has been applied."""
+    done = applied_versions(conn)
+    for version, name, _ in discover_migrations():
+        state = "applied" if version in done else "pending"
+        print(f"{version:04d}_{name}: {state}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply or roll back schema migrations.")
+    parser.add_argument("command", choices=["status", "up", "down"])
+    parser.add_argument("--target", type=int, help="Version to migrate up to or roll back to")
+    parser.add_argument("--dry-run", action="store_true", help="Print statements without executing them")
+    args = parser.parse_args()
+
+    conn = get_cursor()[1]
+    try:
+        if args.command == "status":
+            status(conn)
+        elif args.command == "up":
+            migrate(conn, args.target, args.dry_run)
+        else:
+            if args.target is None:
+                parser.error("down requires --target")
+            rollback(conn, args.target, args.dry_run)
+    finally:
+        close_connection(conn, None)
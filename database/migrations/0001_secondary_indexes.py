@@ -0,0 +1,27 @@
+from database.migrations import add_index, drop_index
+
+UP = [
+    add_index("idx_patients_name"),
+    add_index("idx_patients_first_name"),
+    add_index("idx_patients_primary_hcp"),
+    add_index("idx_hcps_name"),
+    add_index("idx_hcps_department"),
+    add_index("idx_medications_name"),
+    add_index("idx_visits_hcp_date"),
+    add_index("idx_patient_insurance_insurance"),
+    add_index("idx_patient_medications_medication"),
+]
+
+# InnoDB drops its implicit foreign-key index once one of ours can serve the
+# constraint, so put a plain FK index back before dropping ours.
+DOWN = [
+    drop_index("idx_patient_medications_medication", foreign_key="MedicationID"),
+    drop_index("idx_patient_insurance_insurance", foreign_key="InsuranceID"),
+    drop_index("idx_visits_hcp_date", foreign_key="HCPID"),
+    drop_index("idx_medications_name"),
+    drop_index("idx_hcps_department"),
+    drop_index("idx_hcps_name"),
+    drop_index("idx_patients_primary_hcp", foreign_key="PrimaryHCPID"),
+    drop_index("idx_patients_first_name"),
+    drop_index("idx_patients_name"),
+]
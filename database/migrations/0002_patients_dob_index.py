@@ -0,0 +1,9 @@
+from database.migrations import add_index, drop_index
+
+UP = [
+    add_index("idx_patients_dob"),
+]
+
+DOWN = [
+    drop_index("idx_patients_dob"),
+]
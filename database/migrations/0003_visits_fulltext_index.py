@@ -0,0 +1,11 @@
+from database.migrations import add_index, drop_index
+
+# The first FULLTEXT index on a table adds a hidden FTS_DOC_ID column, which
+# InnoDB can build in place but not without blocking writes
+UP = [
+    add_index("ft_visits_reason_notes", lock="SHARED"),
+]
+
+DOWN = [
+    drop_index("ft_visits_reason_notes"),
+]
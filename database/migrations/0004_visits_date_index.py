@@ -0,0 +1,9 @@
+from database.migrations import add_index, drop_index
+
+UP = [
+    add_index("idx_visits_date"),
+]
+
+DOWN = [
+    drop_index("idx_visits_date"),
+]
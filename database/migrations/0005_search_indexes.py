@@ -0,0 +1,32 @@
+from database.migrations import add_index, drop_index
+
+# Indexes for the remaining columns the find_* searches match, so each OR term can use an index
+UP = [
+    add_index("idx_hcps_first_name"),
+    add_index("idx_medications_manufacturer"),
+    add_index("idx_insurance_name"),
+    add_index("idx_insurance_email"),
+    add_index("idx_visits_reason"),
+    add_index("idx_hcp_departments_name"),
+    add_index("idx_side_effects_description"),
+    add_index("idx_side_effects_severity"),
+    add_index("idx_patient_insurance_start"),
+    add_index("idx_patient_insurance_end"),
+    add_index("idx_patient_medications_start"),
+    add_index("idx_patient_medications_end"),
+]
+
+DOWN = [
+    drop_index("idx_patient_medications_end"),
+    drop_index("idx_patient_medications_start"),
+    drop_index("idx_patient_insurance_end"),
+    drop_index("idx_patient_insurance_start"),
+    drop_index("idx_side_effects_severity"),
+    drop_index("idx_side_effects_description"),
+    drop_index("idx_hcp_departments_name"),
+    drop_index("idx_visits_reason"),
+    drop_index("idx_insurance_email"),
+    drop_index("idx_insurance_name"),
+    drop_index("idx_medications_manufacturer"),
+    drop_index("idx_hcps_first_name"),
+]
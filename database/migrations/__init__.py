@@ -0,0 +1,38 @@
+# Versioned schema migrations, applied by database.migrate.
+#
+# Each module is named NNNN_description.py and defines:
+#   UP   - list of SQL statements applied in order
+#   DOWN - list of SQL statements that undo UP (optional; omit if irreversible)
+#
+# Index migrations name indexes defined in database.create_tables and build
+# their statements with add_index()/drop_index(), so the columns live in one place.
+
+from database.create_tables import index_definition
+
+
+def online(statement, lock="NONE"):
+    """
+    Append MariaDB online-DDL clauses to an ALTER TABLE statement.
+    :param statement: ALTER TABLE statement without a trailing semicolon
+    :param lock: LOCK level; use "SHARED" where LOCK=NONE is not supported
+    :return: Statement that fails fast instead of silently copying the table
+    """
+    return f"{statement}, ALGORITHM=INPLACE, LOCK={lock}"
+
+
+def add_index(name, lock="NONE"):
+    """Online ALTER TABLE adding the index called name in create_tables.INDEXES or FULLTEXT_INDEXES."""
+    table, columns, fulltext = index_definition(name)
+    kind = "FULLTEXT INDEX" if fulltext else "INDEX"
+    return online(f"ALTER TABLE {table} ADD {kind} IF NOT EXISTS {name} ({', '.join(columns)})", lock)
+
+
+def drop_index(name, foreign_key=None):
+    """
+    Online ALTER TABLE dropping the index called name.
+    :param foreign_key: Column of a foreign key the index serves; InnoDB dropped its
+                        implicit index on that column, so a plain one is put back first
+    """
+    table, _, _ = index_definition(name)
+    restore = f"ADD INDEX IF NOT EXISTS {foreign_key} ({foreign_key}), " if foreign_key else ""
+    return online(f"ALTER TABLE {table} {restore}DROP INDEX IF EXISTS {name}")
@@ -1,4 +1,5 @@
 from database.crud_operations import fetch_data
+from utils.helpers import years_before
 from database.db_connection import get_cursor, close_connection
 
 
@@ -66,12 +67,9 @@ def get_patients_by_insurance(conn, insurance_id):
     """Retrieve all patients covered by a specific insurance provider."""
     query = """
     SELECT p.PatientID, p.FirstName, p.LastName
-    FROM Patients p
-    WHERE p.PatientID IN (
-        SELECT pi.PatientID
-        FROM PatientInsurance pi
-        WHERE pi.InsuranceID = ?
-    )
+    FROM PatientInsurance pi
+    JOIN Patients p ON p.PatientID = pi.PatientID
+    WHERE pi.InsuranceID = ?
     """
     return fetch_data(conn, query, (insurance_id,))
 
@@ -90,17 +88,11 @@ def get_patients_with_multiple_medications(conn):
 def get_patients_by_medication(conn, medication_name):
     """Retrieve patients taking a specific medication."""
     query = """
-    SELECT p.PatientID, p.FirstName, p.LastName
-    FROM Patients p
-    WHERE p.PatientID IN (
-        SELECT pm.PatientID
-        FROM PatientMedications pm
-        WHERE pm.MedicationID = (
-            SELECT m.MedicationID
-            FROM Medications m
-            WHERE m.MedicationName = ?
-        )
-    )
+    SELECT DISTINCT p.PatientID, p.FirstName, p.LastName
+    FROM Medications m
+    JOIN PatientMedications pm ON pm.MedicationID = m.MedicationID
+    JOIN Patients p ON p.PatientID = pm.PatientID
+    WHERE m.MedicationName = ?
     """
     return fetch_data(conn, query, (medication_name,))
 
@@ -108,11 +100,13 @@ def get_patients_by_medication(conn, medication_name):
 def get_visit_count_per_patient(conn):
     """Retrieve the number of visits each patient has made."""
     query = """
-    SELECT p.PatientID, p.FirstName, p.LastName,
-           (SELECT COUNT(*)
-            FROM Visits v
-            WHERE v.PatientID = p.PatientID) VisitCount
+    SELECT p.PatientID, p.FirstName, p.LastName, COALESCE(v.VisitCount, 0) VisitCount
     FROM Patients p
+    LEFT JOIN (
+        SELECT PatientID, COUNT(*) VisitCount
+        FROM Visits
+        GROUP BY PatientID
+    ) v ON v.PatientID = p.PatientID
     """
     return fetch_data(conn, query)
 
@@ -136,9 +130,48 @@ def get_patients_over_age(conn, age):
     query = """
     SELECT p.PatientID, p.FirstName, p.LastName, p.DOB
     FROM Patients p
-    WHERE TIMESTAMPDIFF(YEAR, p.DOB, CURDATE()) > ?
+    WHERE p.DOB <= ?
+    """
+    # Older than `age` means born on or before the day they turned age + 1,
+    # so compare DOB to a cutoff date and let idx_patients_dob do a range scan
+    return fetch_data(conn, query, (years_before(age + 1),))
+
+
+def get_patients_under_age(conn, age):
+    """Retrieve all patients younger than a certain age."""
+    query = """
+    SELECT p.PatientID, p.FirstName, p.LastName, p.DOB
+    FROM Patients p
+    WHERE p.DOB > ?
     """
-    return fetch_data(conn, query, (age,))
+    return fetch_data(conn, query, (years_before(age),))
+
+
+def get_patient_age_buckets(conn, bucket_size=10, max_age=100):
+    """
+    Count patients per age band, e.g. [(0, 120), (10, 98), ..., (100, 3)].
+    :param bucket_size: Width in years of every band but the last
+    :param max_age: The last band starts at the highest multiple of bucket_size up to
+                    max_age and is open-ended: bucket_size=10, max_age=95 puts every
+                    patient aged 90 or over in the 90 band
+    :return: List of (band start age, patient count), including empty bands
+    """
+    bands = list(range(0, max_age + 1, bucket_size))
+    # Band b holds DOBs in (cutoff of b + bucket_size, cutoff of b]; a CASE over
+    # descending cutoffs lets one index-only pass over idx_patients_dob count them all
+    cases = " ".join("WHEN p.DOB > ? THEN ?" for _ in bands[:-1])
+    query = f"""
+    SELECT CASE {cases} ELSE ? END AS AgeBand, COUNT(*) AS Patients
+    FROM Patients p
+    WHERE p.DOB IS NOT NULL
+    GROUP BY AgeBand
+    """
+    params = []
+    for band in bands[:-1]:
+        params.extend([years_before(band + bucket_size), band])
+    params.append(bands[-1])
+    counts = {band: count for band, count in fetch_data(conn, query, tuple(params)) or []}
+    return [(band, counts.get(band, 0)) for band in bands]
 
 
 def get_healthcare_professionals_by_department(conn, department):
@@ -155,10 +188,11 @@ def get_medications_and_side_effects(conn):
     """Retrieve all medications and their associated side effects."""
     query = """
     SELECT m.MedicationName, m.Dosage,
-           (SELECT GROUP_CONCAT(CONCAT(Severity, ': ', SideEffectDescription) SEPARATOR '; ')
-            FROM SideEffects s
-            WHERE s.MedicationID = m.MedicationID) SideEffects
+           GROUP_CONCAT(CONCAT(s.Severity, ': ', s.SideEffectDescription)
+                        ORDER BY s.SideEffectDescription SEPARATOR '; ') SideEffects
     FROM Medications m
+    LEFT JOIN SideEffects s ON s.MedicationID = m.MedicationID
+    GROUP BY m.MedicationID, m.MedicationName, m.Dosage
     """
     return fetch_data(conn, query)
 
@@ -166,36 +200,25 @@ def get_medications_and_side_effects(conn):
 def get_average_visits_per_patient_by_department(conn, department):
     """Calculate the average number of visits per patient for a specific department."""
     query = """
-    SELECT (SELECT COUNT(*)
-            FROM Visits v
-            WHERE v.PatientID IN (
-                SELECT p.PatientID
-                FROM Patients p
-                WHERE p.PrimaryHCPID IN (
-                    SELECT h.HCPID
-                    FROM HealthCareProfessionals h
-                    WHERE h.Department = ?
-                )
-            )) /
-           (SELECT COUNT(*)
-            FROM Patients p
-            WHERE p.PrimaryHCPID IN (
-                SELECT h.HCPID
-                FROM HealthCareProfessionals h
-                WHERE h.Department = ?
-            )) AS AvgVisitsPerPatient
+    SELECT COUNT(v.PatientID) * 1.0 / COUNT(DISTINCT p.PatientID) AS AvgVisitsPerPatient
+    FROM HealthCareProfessionals h
+    JOIN Patients p ON p.PrimaryHCPID = h.HCPID
+    LEFT JOIN Visits v ON v.PatientID = p.PatientID
+    WHERE h.Department = ?
     """
-    return fetch_data(conn, query, (department, department))
+    # MariaDB divides integers to a DECIMAL but SQLite truncates; * 1.0 gives both a fractional average
+    return fetch_data(conn, query, (department,))
 
 
 def get_patients_grouped_by_hcp(conn):
     """List patients grouped by their primary healthcare provider."""
     query = """
     SELECT h.HCPID, h.FirstName AS HCP_FirstName, h.LastName AS HCP_LastName,
-           (SELECT GROUP_CONCAT(CONCAT(p.FirstName, ' ', p.LastName) SEPARATOR '; ')
-            FROM Patients p
-            WHERE p.PrimaryHCPID = h.HCPID) AS Patients
+           GROUP_CONCAT(CONCAT(p.FirstName, ' ', p.LastName)
+                        ORDER BY p.PatientID SEPARATOR '; ') AS Patients
     FROM HealthCareProfessionals h
+    LEFT JOIN Patients p ON p.PrimaryHCPID = h.HCPID
+    GROUP BY h.HCPID, h.FirstName, h.LastName
     """
     return fetch_data(conn, query)
 
@@ -228,6 +251,9 @@ def test_queries():
         print("\nPatients Over Age 65:")
         print(get_patients_over_age(conn, 65)) 
 
+        print("\nPatients Per 10-Year Age Band:")
+        print(get_patient_age_buckets(conn))
+
         print("\nHealthcare Professionals in Cardiology:")
         print(get_healthcare_professionals_by_department(conn, "Cardiology"))
 
@@ -0,0 +1,117 @@
+import threading
+from contextlib import contextmanager
+
+
+# Open transaction depth per physical connection
+_depths = {}
+_depths_lock = threading.Lock()
+
+# Callbacks waiting for the outermost transaction on a connection to commit
+_after_commit = {}
+
+
+def _key(conn):
+    # Pooled connections are proxies; track the driver connection underneath
+    return id(getattr(conn, "raw", conn))
+
+
+def transaction_depth(conn):
+    """Return how many transaction() blocks are currently open on conn."""
+    with _depths_lock:
+        return _depths.get(_key(conn), 0)
+
+
+def in_transaction(conn):
+    """True while conn is inside a transaction() block."""
+    return transaction_depth(conn) > 0
+
+
+def after_commit(conn, callback, *args):
+    """
+    Call callback(*args) once the work done on conn so far is committed: at the end
+    of the outermost transaction() block, or immediately outside one.
+    Callbacks are dropped if the block, or the savepoint they were added in, rolls back.
+    """
+    key = _key(conn)
+    with _depths_lock:
+        if _depths.get(key, 0):
+            _after_commit.setdefault(key, []).append((callback, args))
+            return
+    callback(*args)
+
+
+def _pending(key):
+    with _depths_lock:
+        return len(_after_commit.get(key, ()))
+
+
+def _discard_after(key, count):
+    """Forget the callbacks added after the first count."""
+    with _depths_lock:
+        callbacks = _after_commit.get(key)
+        if callbacks:
+            del callbacks[count:]
+
+
+def _execute(conn, statement):
+    cur = conn.cursor()
+    try:
+        cur.execute(statement)
+    finally:
+        cur.close()
+
+
+@contextmanager
+def transaction(conn):
+    """
+    Run a block of statements as one unit of work.
+    :param conn: Database connection
+    :return: Context manager yielding the same connection
+
+    The outermost block commits on success and rolls back on error. Nested
+    blocks use savepoints, so an inner failure only undoes the inner work.
+    While a block is open, execute_query/insert_data/update_data skip their
+    per-statement commit and re-raise errors instead of swallowing them.
+    Callbacks registered with after_commit() run once the outermost block commits.
+    """
+    key = _key(conn)
+    with _depths_lock:
+        depth = _depths.get(key, 0)
+        _depths[key] = depth + 1
+    savepoint = f"sp_{depth}" if depth else None
+    pending = _pending(key)
+    callbacks = []
+
+    try:
+        if savepoint:
+            _execute(conn, f"SAVEPOINT {savepoint}")
+        elif hasattr(conn, "begin"):
+            conn.begin()
+
+        try:
+            yield conn
+        except BaseException:
+            _discard_after(key, pending)
+            if savepoint:
+                _execute(conn, f"ROLLBACK TO SAVEPOINT {savepoint}")
+                _execute(conn, f"RELEASE SAVEPOINT {savepoint}")
+            else:
+                conn.rollback()
+            raise
+
+        if savepoint:
+            _execute(conn, f"RELEASE SAVEPOINT {savepoint}")
+        else:
+            conn.commit()
+            with _depths_lock:
+                callbacks = _after_commit.pop(key, [])
+    finally:
+        with _depths_lock:
+            if depth:
+                _depths[key] = depth
+            else:
+                _depths.pop(key, None)
+                _after_commit.pop(key, None)
+
+    for callback, args in callbacks:
+        callback(*args)
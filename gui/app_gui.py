@@ -1,5 +1,7 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
+from ttkbootstrap.dialogs import Messagebox
+from gui.theme import apply_theme
 from gui.patients_view import PatientsView
 from gui.hcps_view import HCPsView
 from gui.insurance_view import InsuranceView
@@ -9,26 +11,54 @@ from gui.patient_medications_view import PatientMedicationsView
 from gui.patient_insurance_view import PatientInsuranceView
 from gui.side_effects_view import SideEffectsView
 from gui.hcp_departments_view import HCPDepartmentsView
+from gui.db_worker import DBWorker
+
+
+# Sidebar entries: (button text, view class). Views are built on first use.
+VIEWS = [
+    ("Patients", PatientsView),
+    ("Healthcare Professionals", HCPsView),
+    ("Insurance", InsuranceView),
+    ("Visits", VisitsView),
+    ("Medications", MedicationsView),
+    ("Patient Medications", PatientMedicationsView),
+    ("Patient Insurance", PatientInsuranceView),
+    ("Side Effects", SideEffectsView),
+    ("HCP Departments", HCPDepartmentsView),
+]
 
 
 class HospitalAppGUI:
-    def __init__(self, root, db_conn):
+    def __init__(self, root, pool):
         self.root = root
-        self.db_conn = db_conn
+        self.worker = DBWorker(self.root, pool)  # Database calls run off the Tk thread
+        self.views = {}  # View class -> instance, filled in as views are opened
+        self.current_view = None
         self.root.title("Hospital Management System")
         self.root.geometry("1200x800")
+        apply_theme()
         self.setup_main_frames()
-
-        # Initialize views
-        self.patients_view = PatientsView(self.root, self.db_conn)
-        self.hcps_view = HCPsView(self.root, self.db_conn)
-        self.insurance_view = InsuranceView(self.root, self.db_conn)
-        self.visits_view = VisitsView(self.root, self.db_conn)
-        self.medications_view = MedicationsView(self.root, self.db_conn)
-        self.patient_medications_view = PatientMedicationsView(self.root, self.db_conn)
-        self.patient_insurance_view = PatientInsuranceView(self.root, self.db_conn)
-        self.side_effects_view = SideEffectsView(self.root, self.db_conn)
-        self.hcp_departments_view = HCPDepartmentsView(self.root, self.db_conn)
+        self.worker.add_busy_listener(self.show_busy)
+
+        # Connect once the window has been drawn, so start-up never waits on the database
+        self.root.after_idle(self.warm_up)
+
+    def show_view(self, view_class):
+        """Display a view, constructing it the first time it is opened and hiding the previous one."""
+        view = self.views.get(view_class)
+        if view is None:
+            view = self.views[view_class] = view_class(self.root, self.worker)
+        if self.current_view is not None and self.current_view is not view:
+            self.current_view.hide()
+        self.current_view = view
+        view.show(self.content_frame)
+
+    def warm_up(self):
+        """Open a worker connection in the background so the first view loads quickly."""
+        self.worker.submit(
+            lambda conn: None,
+            on_error=lambda e: Messagebox.show_error(f"Could not connect to the database: {e}", title="Error"),
+        )
 
     def setup_main_frames(self):
         # Header
@@ -43,56 +73,40 @@ class HospitalAppGUI:
         )
         header_label.pack()
 
+        # Shown while any database call is running
+        self.busy_bar = tb.Progressbar(header_frame, mode="indeterminate", bootstyle=INFO)
+
         # Sidebar
         sidebar_frame = tb.Frame(self.root, padding=10)
         sidebar_frame.pack(side="left", fill="y")
 
         # Buttons for each view
-        tb.Button(
-            sidebar_frame, text="Patients", command=lambda: self.patients_view.show(self.content_frame), bootstyle=PRIMARY
-        ).pack(fill="x", pady=5)
-
-        tb.Button(
-            sidebar_frame, text="Healthcare Professionals", command=lambda: self.hcps_view.show(self.content_frame), bootstyle=PRIMARY
-        ).pack(fill="x", pady=5)
-
-        tb.Button(
-            sidebar_frame, text="Insurance", command=lambda: self.insurance_view.show(self.content_frame), bootstyle=PRIMARY
-        ).pack(fill="x", pady=5)
-
-        tb.Button(
-            sidebar_frame, text="Visits", command=lambda: self.visits_view.show(self.content_frame), bootstyle=PRIMARY
-        ).pack(fill="x", pady=5)
-
-        tb.Button(
-            sidebar_frame, text="Medications", command=lambda: self.medications_view.show(self.content_frame), bootstyle=PRIMARY
-        ).pack(fill="x", pady=5)
-
-        tb.Button(
-            sidebar_frame, text="Patient Medications", command=lambda: self.patient_medications_view.show(self.content_frame), bootstyle=PRIMARY
-        ).pack(fill="x", pady=5)
-
-        tb.Button(
-            sidebar_frame, text="Patient Insurance", command=lambda: self.patient_insurance_view.show(self.content_frame), bootstyle=PRIMARY
-        ).pack(fill="x", pady=5)
-
-        tb.Button(
-            sidebar_frame, text="Side Effects", command=lambda: self.side_effects_view.show(self.content_frame), bootstyle=PRIMARY
-        ).pack(fill="x", pady=5)
-
-        tb.Button(
-            sidebar_frame, text="HCP Departments", command=lambda: self.hcp_departments_view.show(self.content_frame), bootstyle=PRIMARY
-        ).pack(fill="x", pady=5)
+        for text, view_class in VIEWS:
+            tb.Button(
+                sidebar_frame, text=text, command=lambda v=view_class: self.show_view(v), bootstyle=PRIMARY
+            ).pack(fill="x", pady=5)
 
         # Main Content Area
         self.content_frame = tb.Frame(self.root, padding=10)
         self.content_frame.pack(side="right", fill="both", expand=True)
 
+    def show_busy(self, busy):
+        """Show or hide the header progress bar."""
+        if busy:
+            self.busy_bar.pack(fill="x", pady=(5, 0))
+            self.busy_bar.start(10)
+        else:
+            self.busy_bar.stop()
+            self.busy_bar.pack_forget()
+
 
 if __name__ == "__main__":
-    from database.db_connection import connect_to_db
+    from database.db_connection import get_pool, close_pool
 
     app = tb.Window(themename="journal")
-    conn = connect_to_db()
-    gui = HospitalAppGUI(app, conn)
-    app.mainloop()
+    gui = HospitalAppGUI(app, get_pool())
+    try:
+        app.mainloop()
+    finally:
+        gui.worker.shutdown()
+        close_pool()
@@ -0,0 +1,212 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ttkbootstrap.dialogs import Messagebox
+
+
+# Background threads available for database work
+DB_WORKERS = 4
+
+# How often the Tk thread checks for finished database calls (milliseconds)
+POLL_INTERVAL_MS = 25
+
+# Rows handed to the Tk thread at a time by stream()
+STREAM_CHUNK_SIZE = 50
+
+
+class DBWorker:
+    """
+    Runs database calls on background threads so the Tk mainloop never blocks.
+
+    Each call checks a connection out of the pool for as long as it runs, so a
+    connection is never used by two threads at once and is rolled back between
+    calls, which ends the read snapshot of a call that only read. Results are
+    queued and handed to callbacks on the Tk thread by a root.after() polling loop.
+
+    :param root: Tk root window
+    :param pool: ConnectionPool the worker threads draw connections from
+    :param max_workers: Number of background threads
+    """
+
+    def __init__(self, root, pool, max_workers=DB_WORKERS):
+        self.root = root
+        self.pool = pool
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        # Per-key bookkeeping, dropped once every request for the key has been delivered
+        self._generations = {}  # key -> generation of the newest request
+        self._outstanding = {}  # key -> requests submitted but not yet delivered
+        self._futures = {}  # key -> future of the newest request
+        self._jobs = {}  # key -> {"conn": connection while running, "interruptible": bool}
+        self._pending = 0
+        self._busy_listeners = []
+        self._closed = False
+        self._after_id = self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def submit(self, func, *args, on_success=None, on_error=None, key=None, interruptible=False, **kwargs):
+        """
+        Run func(conn, *args, **kwargs) on a worker thread.
+        :param on_success: Called on the Tk thread with the return value
+        :param on_error: Called on the Tk thread with the exception; defaults to an error dialog
+        :param key: Requests sharing a key supersede each other: a newer request
+                    cancels the older one if it has not started and discards its
+                    result if it has
+        :param interruptible: If a newer request supersedes this one while it is
+                              running, kill its statement on the server (KILL QUERY)
+        :return: concurrent.futures.Future
+        """
+        generation = None
+        if key is not None:
+            self._supersede(key)
+            generation = self._generations[key] = self._generations.get(key, 0) + 1
+            self._outstanding[key] = self._outstanding.get(key, 0) + 1
+
+        job = {"interruptible": interruptible}
+        future = self._executor.submit(self._run, job, func, args, kwargs)
+        if key is not None:
+            self._futures[key] = future
+            self._jobs[key] = job
+        self._set_pending(self._pending + 1)
+        future.add_done_callback(
+            lambda f: self._results.put(("done", f, key, generation, on_success, on_error))
+        )
+        return future
+
+    def stream(self, func, *args, on_rows=None, on_success=None, on_error=None, key=None,
+               interruptible=False, chunk_size=STREAM_CHUNK_SIZE, **kwargs):
+        """
+        Run func(conn, *args, **kwargs), which returns an iterable of rows, and hand
+        the rows to the Tk thread in chunks as they arrive.
+        :param on_rows: Called on the Tk thread with (rows, first) for each chunk;
+                        first is True for the first chunk, which is always delivered
+                        even if there are no rows
+        :param on_success: Called on the Tk thread with the total row count
+        Other parameters are as for submit(). A superseded stream stops reading rows.
+        """
+        # The generation submit() is about to assign; only the Tk thread changes generations
+        generation = self._generations.get(key, 0) + 1 if key is not None else None
+
+        def run(conn, *args, **kwargs):
+            chunk = []
+            first = True
+            count = 0
+            for row in func(conn, *args, **kwargs):
+                if key is not None and generation != self._generations.get(key):
+                    break  # Superseded; stop reading from the server
+                chunk.append(row)
+                count += 1
+                if len(chunk) >= chunk_size:
+                    self._results.put(("rows", key, generation, on_rows, chunk, first))
+                    chunk, first = [], False
+            if chunk or first:
+                self._results.put(("rows", key, generation, on_rows, chunk, first))
+            return count
+
+        return self.submit(
+            run, *args, on_success=on_success, on_error=on_error, key=key, interruptible=interruptible, **kwargs
+        )
+
+    def cancel(self, key):
+        """Drop the newest request for key: cancel it if queued, ignore its result if running."""
+        if key in self._generations:
+            self._generations[key] += 1
+            self._supersede(key)
+
+    def add_busy_listener(self, callback):
+        """Call callback(True/False) when work starts or the last request finishes."""
+        self._busy_listeners.append(callback)
+
+    def shutdown(self):
+        """Stop polling and wait for running calls, which return their connections to the pool."""
+        self._closed = True
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _supersede(self, key):
+        """
+        Stop the newest request for key, interrupting it on the server if allowed.
+        The caller moves the key's generation on, so the request's result is ignored.
+        """
+        future = self._futures.pop(key, None)
+        job = self._jobs.pop(key, None)
+        if future is not None and not future.cancel() and job["interruptible"]:
+            conn = job.get("conn")
+            if conn is not None and not future.done():
+                self._interrupt(conn)
+
+    def _interrupt(self, conn):
+        """
+        Kill the statement running on conn without blocking the Tk thread.
+        conn is the superseded call's own checkout, so if the call has finished by
+        the time the thread runs, pool.interrupt() finds it returned and does nothing,
+        even when the next call is already running on the same driver connection.
+        """
+        threading.Thread(target=self.pool.interrupt, args=(conn,), name="db-interrupt", daemon=True).start()
+
+    def _run(self, job, func, args, kwargs):
+        with self.pool.connection() as conn:
+            job["conn"] = conn
+            try:
+                return func(conn, *args, **kwargs)
+            finally:
+                job["conn"] = None
+
+    def _poll(self):
+        """Deliver finished results and streamed rows on the Tk thread."""
+        try:
+            while True:
+                try:
+                    item = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                if item[0] == "rows":
+                    self._deliver_rows(*item[1:])
+                else:
+                    self._deliver(*item[1:])
+        finally:
+            if not self._closed:
+                self._after_id = self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _deliver_rows(self, key, generation, on_rows, rows, first):
+        if key is not None and generation != self._generations.get(key):
+            return  # Superseded by a newer request
+        if on_rows is not None:
+            on_rows(rows, first)
+
+    def _deliver(self, future, key, generation, on_success, on_error):
+        self._set_pending(self._pending - 1)
+        if key is not None:
+            current = generation == self._generations.get(key)
+            self._outstanding[key] -= 1
+            if not self._outstanding[key]:
+                # Nothing left in flight for key; forget it so keys holding widgets can be freed
+                del self._outstanding[key]
+                self._generations.pop(key, None)
+                self._futures.pop(key, None)
+                self._jobs.pop(key, None)
+            elif current:
+                self._futures.pop(key, None)
+                self._jobs.pop(key, None)
+            if not current:
+                return  # Superseded by a newer request
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is not None:
+            if on_error is not None:
+                on_error(error)
+            else:
+                Messagebox.show_error(f"Database error: {error}", title="Error")
+        elif on_success is not None:
+            on_success(future.result())
+
+    def _set_pending(self, pending):
+        was_busy = self._pending > 0
+        self._pending = pending
+        if was_busy != (pending > 0):
+            for callback in self._busy_listeners:
+                callback(pending > 0)
@@ -0,0 +1,192 @@
+import re
+from bisect import bisect_left
+import ttkbootstrap as tb
+from gui.live_search import LiveSearch
+from database.cache import reference_cache
+from database.basic_queries import (
+    get_patients_page,
+    find_patients,
+    get_hcps_page,
+    find_hcps,
+    get_insurance_page,
+    find_insurance,
+    get_medications_page,
+    find_medications,
+)
+
+
+# Largest table loaded whole into a picker's prefix index; bigger tables are searched on the server
+PICKER_CACHE_LIMIT = 5000
+
+# Suggestions shown in a picker's drop-down list
+PICKER_RESULTS = 20
+
+# Pause in typing after which suggestions are refreshed (milliseconds)
+PICKER_DELAY_MS = 150
+
+# Suggestions end with the ID in brackets, e.g. "Smith, Jane - Cardiology [H0000001]"
+LABEL_ID = re.compile(r"\[([^\[\]]+)\]$")
+
+
+class PrefixIndex:
+    """
+    Case-insensitive prefix lookup over (text, value) pairs, kept in a sorted list searched with bisect.
+    A value may be indexed under several texts (name, ID, ...) and is returned once per search.
+    """
+
+    def __init__(self, pairs):
+        self._entries = sorted((text.casefold(), value) for text, value in pairs if text)
+        self.values = {value for _, value in self._entries}
+
+    def search(self, prefix, limit=PICKER_RESULTS):
+        """Return up to limit distinct values indexed under a text starting with prefix."""
+        prefix = prefix.casefold()
+        results = []
+        seen = set()
+        i = bisect_left(self._entries, (prefix,))
+        while i < len(self._entries) and len(results) < limit:
+            text, value = self._entries[i]
+            if not text.startswith(prefix):
+                break
+            if value not in seen:
+                seen.add(value)
+                results.append(value)
+            i += 1
+        return results
+
+
+def _describe_patient(row):
+    return f"{row[2]}, {row[1]} [{row[0]}]", (row[0], row[1], row[2], f"{row[1]} {row[2]}")
+
+def _describe_hcp(row):
+    return f"{row[2]}, {row[1]} - {row[4]} [{row[0]}]", (row[0], row[1], row[2], f"{row[1]} {row[2]}", row[4])
+
+def _describe_insurance(row):
+    return f"{row[1]} [{row[0]}]", (row[0], row[1])
+
+def _describe_medication(row):
+    return f"{row[1]} {row[2]} [{row[0]}]", (row[0], row[1], row[3])
+
+
+def load_index(conn, table, fetch_page, describe, limit=PICKER_CACHE_LIMIT):
+    """
+    Build a prefix index of labels for a whole table, cached until the table is written.
+    :return: PrefixIndex, or False when the table has more than limit rows
+    """
+    def load():
+        rows, next_token = fetch_page(conn, page_size=limit)
+        if next_token is not None:
+            return False
+        pairs = []
+        for row in rows:
+            label, texts = describe(row)
+            pairs.extend((str(text), label) for text in texts if text)
+        return PrefixIndex(pairs)
+
+    return reference_cache.get_or_load((table, "picker_index", limit), load)
+
+
+class ForeignKeyPicker:
+    """
+    Combobox that suggests rows of a referenced table as the user types and resolves the choice to its ID.
+    Small tables are searched in a cached prefix index; larger ones through the table's find_* query.
+
+    :param parent: Parent widget
+    :param worker: DBWorker used for loading and lookups
+    :param table: Referenced table, also the cache key
+    :param fetch_page: get_*_page function used to load the index
+    :param find: find_* function used once the table is too large to index
+    :param describe: Maps a row to (label, texts the label is indexed under)
+    """
+
+    def __init__(self, parent, worker, table, fetch_page, find, describe, width=30):
+        self.worker = worker
+        self.find = find
+        self.describe = describe
+        self.index = None  # PrefixIndex, False when searching the server, None while loading
+        self.ids = set()  # IDs in the index, to accept an ID typed in full
+        self.combobox = tb.Combobox(parent, width=width)
+        LiveSearch(self.combobox, self.suggest, self.clear, delay_ms=PICKER_DELAY_MS, min_length=1)
+
+        def on_loaded(index):
+            self.index = index if index is not None else False
+            if self.index:
+                self.ids = {LABEL_ID.search(label).group(1) for label in self.index.values}
+
+        def on_error(e):
+            print(f"Error loading {table} suggestions: {e}")
+            self.index = False
+
+        worker.submit(
+            load_index, table, fetch_page, describe,
+            on_success=on_loaded, on_error=on_error, key=(self, "load")
+        )
+
+    def suggest(self, text):
+        """Fill the drop-down list with rows matching text."""
+        if LABEL_ID.search(text):
+            return  # A suggestion was just chosen
+        if self.index:
+            self.combobox.configure(values=self.index.search(text))
+            return
+
+        def on_success(rows):
+            if not self.combobox.winfo_exists():
+                return  # Form closed while the lookup ran
+            self.combobox.configure(values=[self.describe(row)[0] for row in rows or []])
+
+        def on_error(e):
+            print(f"Error looking up '{text}': {e}")
+
+        self.worker.submit(
+            self.find, text, limit=PICKER_RESULTS,
+            on_success=on_success, on_error=on_error, key=(self, "lookup"), interruptible=True
+        )
+
+    def clear(self):
+        self.worker.cancel((self, "lookup"))
+        self.combobox.configure(values=[])
+
+    def get(self):
+        """
+        Return the ID of the chosen row, or the typed text if it is an ID.
+        Returns an empty string when the text matches nothing in an indexed table.
+        """
+        text = self.combobox.get().strip()
+        match = LABEL_ID.search(text)
+        if match:
+            return match.group(1)
+        if self.index and text not in self.ids:
+            return ""
+        return text
+
+    def insert(self, index, text):
+        self.combobox.insert(index, text)
+
+    def grid(self, **kwargs):
+        self.combobox.grid(**kwargs)
+
+
+def unresolved(entries):
+    """Return the first form field whose picker text matches no row, or None."""
+    for field, entry in entries.items():
+        if isinstance(entry, ForeignKeyPicker) and entry.combobox.get().strip() and not entry.get():
+            return field
+    return None
+
+
+def patient_picker(parent, worker):
+    """Picker for a PatientID."""
+    return ForeignKeyPicker(parent, worker, "Patients", get_patients_page, find_patients, _describe_patient)
+
+def hcp_picker(parent, worker):
+    """Picker for an HCPID."""
+    return ForeignKeyPicker(parent, worker, "HealthCareProfessionals", get_hcps_page, find_hcps, _describe_hcp)
+
+def insurance_picker(parent, worker):
+    """Picker for an InsuranceID."""
+    return ForeignKeyPicker(parent, worker, "Insurance", get_insurance_page, find_insurance, _describe_insurance)
+
+def medication_picker(parent, worker):
+    """Picker for a MedicationID."""
+    return ForeignKeyPicker(parent, worker, "Medications", get_medications_page, find_medications, _describe_medication)
@@ -1,9 +1,13 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
-import tkinter as tk
+from gui.virtual_table import VirtualTable
+from gui.live_search import LiveSearch
+from database.create_tables import indexed_columns
 from database.basic_queries import (
-    get_all_hcp_departments,
+    get_hcp_departments_page,
+    get_hcp_department,
+    find_hcp_departments,
     add_hcp_department_to_db,
     update_hcp_department,
     delete_hcp_department,
@@ -11,24 +15,39 @@ from database.basic_queries import (
 
 
 class HCPDepartmentsView:
-    def __init__(self, root, db_conn):
+    def __init__(self, root, worker):
         self.root = root
-        self.db_conn = db_conn
+        self.worker = worker
+        self.frame = None  # Built on first show and reused afterwards
+        self.search_query = None  # Search shown in the table, kept when re-sorting
 
     def show(self, content_frame):
         """Display the HCP Departments view."""
-        # Clear the content frame
-        for widget in content_frame.winfo_children():
-            widget.destroy()
+        if self.frame is None:
+            self.build(content_frame)
+        self.frame.pack(fill="both", expand=True)
+
+        # Rows loaded on an earlier visit are reused until they go stale
+        if self.table.is_stale():
+            self.load_hcp_departments()
+
+    def hide(self):
+        """Hide the view, keeping its widgets and rows for the next visit."""
+        self.frame.pack_forget()
+
+    def build(self, content_frame):
+        """Create the view's widgets inside content_frame."""
+        self.frame = tb.Frame(content_frame)
 
         # Search bar
-        search_frame = tb.Frame(content_frame)
+        search_frame = tb.Frame(self.frame)
         search_frame.pack(side="top", fill="x", pady=10)
 
         search_label = tb.Label(search_frame, text="Search:")
         search_label.pack(side="left", padx=5)
         search_entry = tb.Entry(search_frame)
         search_entry.pack(side="left", padx=5)
+        LiveSearch(search_entry, self.run_search, self.load_hcp_departments)
 
         search_button = tb.Button(
             search_frame,
@@ -46,32 +65,25 @@ class HCPDepartmentsView:
         )
         add_button.pack(side="right", padx=5)
 
-        # Table for displaying HCP Departments
-        tree_frame = tb.Frame(content_frame)
-        tree_frame.pack(fill="both", expand=True)
-
-        columns = ("HCPID", "Department Name")
-        self.tree = tb.Treeview(
-            tree_frame, columns=columns, show="headings", style="Treeview"
+        # Table for displaying HCP Departments; rows are paged in as the user scrolls
+        self.table = VirtualTable(
+            self.frame,
+            columns=[
+                ("HCPID", "HCP ID", "center", 150),
+                ("Department Name", "Department Name", "w", 300),
+            ],
+            fetch_page=get_hcp_departments_page,
+            worker=self.worker,
+            key_indexes=(0, 1),
+            sort_columns=["HCPID", "DepartmentName"],
+            fast_columns=indexed_columns("HCPDepartments"),
+            on_sort=self.sort_hcp_departments,
         )
-
-        # Configure columns
-        self.tree.column("#0", width=0, stretch=tk.NO)  # Hide default column
-        self.tree.column("HCPID", anchor="center", width=150)
-        self.tree.column("Department Name", anchor="w", width=300)
-
-        # Add headers
-        self.tree.heading("HCPID", text="HCP ID", anchor="center")
-        self.tree.heading("Department Name", text="Department Name", anchor="w")
-
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar = tb.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
 
         # Action buttons
-        actions_frame = tb.Frame(content_frame)
+        actions_frame = tb.Frame(self.frame)
         actions_frame.pack(side="bottom", fill="x", pady=10)
 
         edit_button = tb.Button(
@@ -90,21 +102,19 @@ class HCPDepartmentsView:
         )
         delete_button.pack(side="left", padx=5)
 
-        # Load initial data
-        self.load_hcp_departments()
 
     def load_hcp_departments(self):
         """Load HCP departments from the database."""
-        self.tree.delete(*self.tree.get_children())
-        try:
-            hcp_departments = get_all_hcp_departments(self.db_conn)
-            for idx, department in enumerate(hcp_departments):
-                tag = "evenrow" if idx % 2 == 0 else "oddrow"
-                self.tree.insert("", "end", values=department, tags=(tag,))
-            self.tree.tag_configure("evenrow", background="#f9f9f9")
-            self.tree.tag_configure("oddrow", background="#ffffff")
-        except Exception as e:
-            Messagebox.show_error(f"Failed to load HCP departments: {e}", title="Error")
+        self.search_query = None
+        self.worker.cancel((self, "search"))
+        self.table.reload()
+
+    def sort_hcp_departments(self):
+        """Re-run the current search, or reload, in the table's new sort order."""
+        if self.search_query:
+            self.run_search(self.search_query)
+        else:
+            self.load_hcp_departments()
 
     def search_hcp_departments(self, search_entry):
         """Search HCP departments based on the search query."""
@@ -113,19 +123,22 @@ class HCPDepartmentsView:
             Messagebox.show_warning("Please enter a search query.", title="Warning")
             return
 
-        self.tree.delete(*self.tree.get_children())
-        try:
-            hcp_departments = get_all_hcp_departments(self.db_conn)
-            filtered_departments = [
-                department
-                for department in hcp_departments
-                if query.lower() in str(department).lower()
-            ]
-            for department in filtered_departments:
-                self.tree.insert("", "end", values=department)
-        except Exception as e:
+        self.run_search(query)
+
+    def run_search(self, query):
+        """Stream matching HCP departments into the table, replacing any search still running."""
+        def on_rows(hcp_departments, first):
+            self.table.show_rows(hcp_departments, append=not first)
+
+        def on_error(e):
             Messagebox.show_error(f"Search failed: {e}", title="Error")
 
+        self.search_query = query
+        self.worker.stream(
+            find_hcp_departments, query, stream=True, sort=self.table.sort, descending=self.table.descending,
+            on_rows=on_rows, on_error=on_error, key=(self, "search"), interruptible=True
+        )
+
     def add_hcp_department(self):
         """Open a form to add a new HCP department."""
         add_window = tb.Toplevel(self.root)
@@ -155,15 +168,17 @@ class HCPDepartmentsView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                add_hcp_department_to_db(self.db_conn, data)
+            def on_success(_):
                 add_window.destroy()
-                self.load_hcp_departments()
-            except Exception as e:
+                self.table.refresh_row(get_hcp_department, (data["HCPID"], data["DepartmentName"]))
+
+            def on_error(e):
                 Messagebox.show_error(
                     f"Failed to add HCP department: {e}", title="Error"
                 )
 
+            self.worker.submit(add_hcp_department_to_db, data, on_success=on_success, on_error=on_error)
+
         save_button = tb.Button(
             form_frame, text="Save", command=save_hcp_department, bootstyle=SUCCESS
         )
@@ -205,15 +220,23 @@ class HCPDepartmentsView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                update_hcp_department(self.db_conn, values[0], data)
+            def on_success(_):
                 edit_window.destroy()
-                self.load_hcp_departments()
-            except Exception as e:
+                self.table.refresh_row(
+                    get_hcp_department, (values[0], data["DepartmentName"]), item=selected_item,
+                    on_missing=lambda: Messagebox.show_warning("This department entry no longer exists.", title="Warning"),
+                )
+
+            def on_error(e):
                 Messagebox.show_error(
                     f"Failed to update HCP department: {e}", title="Error"
                 )
 
+            self.worker.submit(
+                update_hcp_department, values[0], values[1], {"NewDepartmentName": data["DepartmentName"]},
+                on_success=on_success, on_error=on_error
+            )
+
         save_button = tb.Button(
             form_frame,
             text="Save",
@@ -250,14 +273,19 @@ class HCPDepartmentsView:
         if not confirm:
             return
 
-        try:
-            delete_hcp_department(self.db_conn, hcp_id, department_name)
-            self.load_hcp_departments()
+        def on_success(_):
+            self.table.delete_item(selected_item)
             Messagebox.show_info(
                 f"Department '{department_name}' for HCP ID '{hcp_id}' deleted successfully.",
                 title="Success",
             )
-        except Exception as e:
+
+        def on_error(e):
             Messagebox.show_error(
                 f"Failed to delete HCP department: {e}", title="Error"
-            )
\ No newline at end of file
+            )
+
+        self.worker.submit(
+            delete_hcp_department, hcp_id, department_name,
+            on_success=on_success, on_error=on_error
+        )
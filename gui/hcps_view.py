@@ -1,52 +1,46 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
-import tkinter as tk
-from database.basic_queries import get_all_hcps, add_hcp_to_db, update_hcp, delete_hcp
+from gui.virtual_table import VirtualTable
+from gui.live_search import LiveSearch
+from database.create_tables import indexed_columns
+from database.basic_queries import get_hcps_page, get_hcp, find_hcps, add_hcp_to_db, update_hcp, delete_hcp
 
 
 class HCPsView:
-    def __init__(self, root, db_conn):
+    def __init__(self, root, worker):
         self.root = root
-        self.db_conn = db_conn
-
-        # Configure table styles
-        style = tb.Style()
-        style.configure(
-            "Treeview",
-            background="white",
-            foreground="black",
-            rowheight=30,
-            fieldbackground="white",
-            borderwidth=0,
-            font=("Segoe UI", 11),
-        )
-        style.configure(
-            "Treeview.Heading",
-            background="#f8f9fa",
-            foreground="black",
-            font=("Segoe UI", 12, "bold"),
-        )
-        style.map(
-            "Treeview",
-            background=[("selected", "#e8f4ff")],
-            foreground=[("selected", "black")],
-        )
+        self.worker = worker
+        self.frame = None  # Built on first show and reused afterwards
+        self.search_query = None  # Search shown in the table, kept when re-sorting
 
     def show(self, content_frame):
         """Display the HCPs view."""
-        # Clear the content frame
-        for widget in content_frame.winfo_children():
-            widget.destroy()
+        if self.frame is None:
+            self.build(content_frame)
+        self.frame.pack(fill="both", expand=True)
+
+        # Rows loaded on an earlier visit are reused until they go stale
+        if self.table.is_stale():
+            self.load_hcps()
+
+    def hide(self):
+        """Hide the view, keeping its widgets and rows for the next visit."""
+        self.frame.pack_forget()
+
+    def build(self, content_frame):
+        """Create the view's widgets inside content_frame."""
+        self.frame = tb.Frame(content_frame)
 
         # Search bar
-        search_frame = tb.Frame(content_frame)
+        search_frame = tb.Frame(self.frame)
         search_frame.pack(side="top", fill="x", pady=10)
 
         search_label = tb.Label(search_frame, text="Search:")
         search_label.pack(side="left", padx=5)
         search_entry = tb.Entry(search_frame)
         search_entry.pack(side="left", padx=5)
+        LiveSearch(search_entry, self.run_search, self.load_hcps)
 
         search_button = tb.Button(
             search_frame,
@@ -64,36 +58,28 @@ class HCPsView:
         )
         add_button.pack(side="right", padx=5)
 
-        # Table for displaying HCPs
-        tree_frame = tb.Frame(content_frame)
-        tree_frame.pack(fill="both", expand=True)
-
-        columns = ("HCPID", "First Name", "Last Name", "Contact Number", "Department")
-        self.tree = tb.Treeview(tree_frame, columns=columns, show="headings", style="Treeview")
-
-        # Configure columns
-        self.tree.column("#0", width=0, stretch=tk.NO)  # Hide default column
-        self.tree.column("HCPID", anchor="center", width=100)
-        self.tree.column("First Name", anchor="w", width=150)
-        self.tree.column("Last Name", anchor="w", width=150)
-        self.tree.column("Contact Number", anchor="center", width=120)
-        self.tree.column("Department", anchor="w", width=200)
-
-        # Add headers
-        self.tree.heading("HCPID", text="HCP ID", anchor="center")
-        self.tree.heading("First Name", text="First Name", anchor="w")
-        self.tree.heading("Last Name", text="Last Name", anchor="w")
-        self.tree.heading("Contact Number", text="Contact Number", anchor="center")
-        self.tree.heading("Department", text="Department", anchor="w")
-
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar = tb.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        # Table for displaying HCPs; rows are paged in as the user scrolls
+        self.table = VirtualTable(
+            self.frame,
+            columns=[
+                ("HCPID", "HCP ID", "center", 100),
+                ("First Name", "First Name", "w", 150),
+                ("Last Name", "Last Name", "w", 150),
+                ("Contact Number", "Contact Number", "center", 120),
+                ("Department", "Department", "w", 200),
+            ],
+            fetch_page=get_hcps_page,
+            worker=self.worker,
+            key_indexes=(0,),
+            sort_columns=["HCPID", "FirstName", "LastName", "ContactNumber", "Department"],
+            fast_columns=indexed_columns("HealthCareProfessionals"),
+            on_sort=self.sort_hcps,
+        )
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
 
         # Action buttons
-        actions_frame = tb.Frame(content_frame)
+        actions_frame = tb.Frame(self.frame)
         actions_frame.pack(side="bottom", fill="x", pady=10)
 
         edit_button = tb.Button(
@@ -106,21 +92,19 @@ class HCPsView:
         )
         delete_button.pack(side="left", padx=5)
 
-        # Load initial data
-        self.load_hcps()
 
     def load_hcps(self):
         """Load HCPs from the database."""
-        self.tree.delete(*self.tree.get_children())
-        try:
-            hcps = get_all_hcps(self.db_conn)
-            for idx, hcp in enumerate(hcps):
-                tag = "evenrow" if idx % 2 == 0 else "oddrow"
-                self.tree.insert("", "end", values=hcp, tags=(tag,))
-            self.tree.tag_configure("evenrow", background="#f9f9f9")
-            self.tree.tag_configure("oddrow", background="#ffffff")
-        except Exception as e:
-            Messagebox.show_error(f"Failed to load HCPs: {e}", title="Error")
+        self.search_query = None
+        self.worker.cancel((self, "search"))
+        self.table.reload()
+
+    def sort_hcps(self):
+        """Re-run the current search, or reload, in the table's new sort order."""
+        if self.search_query:
+            self.run_search(self.search_query)
+        else:
+            self.load_hcps()
 
     def search_hcps(self, search_entry):
         """Search HCPs based on the search query."""
@@ -129,17 +113,22 @@ class HCPsView:
             Messagebox.show_warning("Please enter a search query.", title="Warning")
             return
 
-        self.tree.delete(*self.tree.get_children())
-        try:
-            hcps = get_all_hcps(self.db_conn)
-            filtered_hcps = [
-                h for h in hcps if query.lower() in h[1].lower() or query.lower() in h[2].lower()
-            ]
-            for hcp in filtered_hcps:
-                self.tree.insert("", "end", values=hcp)
-        except Exception as e:
+        self.run_search(query)
+
+    def run_search(self, query):
+        """Stream matching HCPs into the table, replacing any search still running."""
+        def on_rows(hcps, first):
+            self.table.show_rows(hcps, append=not first)
+
+        def on_error(e):
             Messagebox.show_error(f"Search failed: {e}", title="Error")
 
+        self.search_query = query
+        self.worker.stream(
+            find_hcps, query, stream=True, sort=self.table.sort, descending=self.table.descending,
+            on_rows=on_rows, on_error=on_error, key=(self, "search"), interruptible=True
+        )
+
     def add_hcp(self):
         """Open a form to add a new healthcare professional."""
         add_window = tb.Toplevel(self.root)
@@ -167,13 +156,15 @@ class HCPsView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                add_hcp_to_db(self.db_conn, data)
+            def on_success(_):
                 add_window.destroy()
-                self.load_hcps()
-            except Exception as e:
+                self.table.refresh_row(get_hcp, (data["HCPID"],))
+
+            def on_error(e):
                 Messagebox.show_error(f"Failed to add HCP: {e}", title="Error")
 
+            self.worker.submit(add_hcp_to_db, data, on_success=on_success, on_error=on_error)
+
         save_button = tb.Button(form_frame, text="Save", command=save_hcp, bootstyle=SUCCESS)
         save_button.grid(row=len(fields), column=0, columnspan=2, pady=10)
 
@@ -211,13 +202,18 @@ class HCPsView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                update_hcp(self.db_conn, data["HCPID"], data)
+            def on_success(_):
                 edit_window.destroy()
-                self.load_hcps()
-            except Exception as e:
+                self.table.refresh_row(
+                    get_hcp, (data["HCPID"],), item=selected_item,
+                    on_missing=lambda: Messagebox.show_warning("This healthcare professional no longer exists.", title="Warning"),
+                )
+
+            def on_error(e):
                 Messagebox.show_error(f"Failed to update HCP: {e}", title="Error")
 
+            self.worker.submit(update_hcp, data["HCPID"], data, on_success=on_success, on_error=on_error)
+
         save_button = tb.Button(form_frame, text="Save", command=update_hcp_record, bootstyle=SUCCESS)
         save_button.grid(row=len(fields), column=0, columnspan=2, pady=10)
 
@@ -246,11 +242,13 @@ class HCPsView:
         if not confirm:
             return
 
-        try:
-            # Call the database method to delete the HCP
-            delete_hcp(self.db_conn, hcp_id)
+        def on_success(_):
             # Remove the deleted item from the Treeview
-            self.tree.delete(selected_item)
+            self.table.delete_item(selected_item)
             Messagebox.show_info(f"Healthcare professional with ID '{hcp_id}' deleted successfully.", title="Success")
-        except Exception as e:
+
+        def on_error(e):
             Messagebox.show_error(f"Failed to delete HCP: {e}", title="Error")
+
+        # Call the database method to delete the HCP
+        self.worker.submit(delete_hcp, hcp_id, on_success=on_success, on_error=on_error)
@@ -1,52 +1,46 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
-import tkinter as tk
-from database.basic_queries import get_all_insurance, add_insurance_to_db, update_insurance, delete_insurance
+from gui.virtual_table import VirtualTable
+from gui.live_search import LiveSearch
+from database.create_tables import indexed_columns
+from database.basic_queries import get_insurance_page, get_insurance, find_insurance, add_insurance_to_db, update_insurance, delete_insurance
 
 
 class InsuranceView:
-    def __init__(self, root, db_conn):
+    def __init__(self, root, worker):
         self.root = root
-        self.db_conn = db_conn
-
-        # Configure table styles
-        style = tb.Style()
-        style.configure(
-            "Treeview",
-            background="white",
-            foreground="black",
-            rowheight=30,
-            fieldbackground="white",
-            borderwidth=0,
-            font=("Segoe UI", 11),
-        )
-        style.configure(
-            "Treeview.Heading",
-            background="#f8f9fa",
-            foreground="black",
-            font=("Segoe UI", 12, "bold"),
-        )
-        style.map(
-            "Treeview",
-            background=[("selected", "#e8f4ff")],
-            foreground=[("selected", "black")],
-        )
+        self.worker = worker
+        self.frame = None  # Built on first show and reused afterwards
+        self.search_query = None  # Search shown in the table, kept when re-sorting
 
     def show(self, content_frame):
         """Display the Insurance view."""
-        # Clear the content frame
-        for widget in content_frame.winfo_children():
-            widget.destroy()
+        if self.frame is None:
+            self.build(content_frame)
+        self.frame.pack(fill="both", expand=True)
+
+        # Rows loaded on an earlier visit are reused until they go stale
+        if self.table.is_stale():
+            self.load_insurance()
+
+    def hide(self):
+        """Hide the view, keeping its widgets and rows for the next visit."""
+        self.frame.pack_forget()
+
+    def build(self, content_frame):
+        """Create the view's widgets inside content_frame."""
+        self.frame = tb.Frame(content_frame)
 
         # Search bar
-        search_frame = tb.Frame(content_frame)
+        search_frame = tb.Frame(self.frame)
         search_frame.pack(side="top", fill="x", pady=10)
 
         search_label = tb.Label(search_frame, text="Search:")
         search_label.pack(side="left", padx=5)
         search_entry = tb.Entry(search_frame)
         search_entry.pack(side="left", padx=5)
+        LiveSearch(search_entry, self.run_search, self.load_insurance)
 
         search_button = tb.Button(
             search_frame,
@@ -64,34 +58,27 @@ class InsuranceView:
         )
         add_button.pack(side="right", padx=5)
 
-        # Table for displaying Insurance
-        tree_frame = tb.Frame(content_frame)
-        tree_frame.pack(fill="both", expand=True)
-
-        columns = ("InsuranceID", "Insurance Name", "Email", "Contact Number")
-        self.tree = tb.Treeview(tree_frame, columns=columns, show="headings", style="Treeview")
-
-        # Configure columns
-        self.tree.column("#0", width=0, stretch=tk.NO)  # Hide default column
-        self.tree.column("InsuranceID", anchor="center", width=100)
-        self.tree.column("Insurance Name", anchor="w", width=150)
-        self.tree.column("Email", anchor="w", width=200)
-        self.tree.column("Contact Number", anchor="center", width=120)
-
-        # Add headers
-        self.tree.heading("InsuranceID", text="Insurance ID", anchor="center")
-        self.tree.heading("Insurance Name", text="Insurance Name", anchor="w")
-        self.tree.heading("Email", text="Email", anchor="w")
-        self.tree.heading("Contact Number", text="Contact Number", anchor="center")
-
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar = tb.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        # Table for displaying Insurance; rows are paged in as the user scrolls
+        self.table = VirtualTable(
+            self.frame,
+            columns=[
+                ("InsuranceID", "Insurance ID", "center", 100),
+                ("Insurance Name", "Insurance Name", "w", 150),
+                ("Email", "Email", "w", 200),
+                ("Contact Number", "Contact Number", "center", 120),
+            ],
+            fetch_page=get_insurance_page,
+            worker=self.worker,
+            key_indexes=(0,),
+            sort_columns=["InsuranceID", "InsuranceName", "Email", "ContactNumber"],
+            fast_columns=indexed_columns("Insurance"),
+            on_sort=self.sort_insurance,
+        )
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
 
         # Action buttons
-        actions_frame = tb.Frame(content_frame)
+        actions_frame = tb.Frame(self.frame)
         actions_frame.pack(side="bottom", fill="x", pady=10)
 
         edit_button = tb.Button(
@@ -104,21 +91,19 @@ class InsuranceView:
         )
         delete_button.pack(side="left", padx=5)
 
-        # Load initial data
-        self.load_insurance()
 
     def load_insurance(self):
         """Load insurance records from the database."""
-        self.tree.delete(*self.tree.get_children())
-        try:
-            insurances = get_all_insurance(self.db_conn)
-            for idx, insurance in enumerate(insurances):
-                tag = "evenrow" if idx % 2 == 0 else "oddrow"
-                self.tree.insert("", "end", values=insurance, tags=(tag,))
-            self.tree.tag_configure("evenrow", background="#f9f9f9")
-            self.tree.tag_configure("oddrow", background="#ffffff")
-        except Exception as e:
-            Messagebox.show_error(f"Failed to load insurance records: {e}", title="Error")
+        self.search_query = None
+        self.worker.cancel((self, "search"))
+        self.table.reload()
+
+    def sort_insurance(self):
+        """Re-run the current search, or reload, in the table's new sort order."""
+        if self.search_query:
+            self.run_search(self.search_query)
+        else:
+            self.load_insurance()
 
     def search_insurance(self, search_entry):
         """Search insurance records based on the search query."""
@@ -127,17 +112,22 @@ class InsuranceView:
             Messagebox.show_warning("Please enter a search query.", title="Warning")
             return
 
-        self.tree.delete(*self.tree.get_children())
-        try:
-            insurances = get_all_insurance(self.db_conn)
-            filtered_insurances = [
-                i for i in insurances if query.lower() in i[1].lower() or query.lower() in i[2].lower()
-            ]
-            for insurance in filtered_insurances:
-                self.tree.insert("", "end", values=insurance)
-        except Exception as e:
+        self.run_search(query)
+
+    def run_search(self, query):
+        """Stream matching insurance into the table, replacing any search still running."""
+        def on_rows(insurances, first):
+            self.table.show_rows(insurances, append=not first)
+
+        def on_error(e):
             Messagebox.show_error(f"Search failed: {e}", title="Error")
 
+        self.search_query = query
+        self.worker.stream(
+            find_insurance, query, stream=True, sort=self.table.sort, descending=self.table.descending,
+            on_rows=on_rows, on_error=on_error, key=(self, "search"), interruptible=True
+        )
+
     def add_insurance(self):
         """Open a form to add a new insurance record."""
         add_window = tb.Toplevel(self.root)
@@ -165,13 +155,15 @@ class InsuranceView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                add_insurance_to_db(self.db_conn, data)
+            def on_success(_):
                 add_window.destroy()
-                self.load_insurance()
-            except Exception as e:
+                self.table.refresh_row(get_insurance, (data["InsuranceID"],))
+
+            def on_error(e):
                 Messagebox.show_error(f"Failed to add insurance: {e}", title="Error")
 
+            self.worker.submit(add_insurance_to_db, data, on_success=on_success, on_error=on_error)
+
         save_button = tb.Button(form_frame, text="Save", command=save_insurance, bootstyle=SUCCESS)
         save_button.grid(row=len(fields), column=0, columnspan=2, pady=10)
 
@@ -209,13 +201,21 @@ class InsuranceView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                update_insurance(self.db_conn, data["InsuranceID"], data)
+            def on_success(_):
                 edit_window.destroy()
-                self.load_insurance()
-            except Exception as e:
+                self.table.refresh_row(
+                    get_insurance, (data["InsuranceID"],), item=selected_item,
+                    on_missing=lambda: Messagebox.show_warning("This insurance provider no longer exists.", title="Warning"),
+                )
+
+            def on_error(e):
                 Messagebox.show_error(f"Failed to update insurance: {e}", title="Error")
 
+            self.worker.submit(
+                update_insurance, data["InsuranceID"], data,
+                on_success=on_success, on_error=on_error
+            )
+
         save_button = tb.Button(form_frame, text="Save", command=update_insurance_record, bootstyle=SUCCESS)
         save_button.grid(row=len(fields), column=0, columnspan=2, pady=10)
 
@@ -242,11 +242,13 @@ class InsuranceView:
         if not confirm:
             return
 
-        try:
-            # Call the database method to delete the insurance
-            delete_insurance(self.db_conn, insurance_id)
+        def on_success(_):
             # Remove the deleted item from the Treeview
-            self.tree.delete(selected_item)
+            self.table.delete_item(selected_item)
             Messagebox.show_info(f"Insurance with ID '{insurance_id}' deleted successfully.", title="Success")
-        except Exception as e:
-            Messagebox.show_error(f"Failed to delete insurance: {e}", title="Error")
\ No newline at end of file
+
+        def on_error(e):
+            Messagebox.show_error(f"Failed to delete insurance: {e}", title="Error")
+
+        # Call the database method to delete the insurance
+        self.worker.submit(delete_insurance, insurance_id, on_success=on_success, on_error=on_error)
@@ -0,0 +1,44 @@
+# Pause in typing after which a search runs (milliseconds)
+SEARCH_DELAY_MS = 300
+
+# Shortest text that triggers a search while typing
+MIN_SEARCH_LENGTH = 2
+
+
+class LiveSearch:
+    """
+    Runs a search when the user pauses typing in an Entry.
+
+    :param entry: Entry widget to watch
+    :param on_search: Called with the stripped text once typing pauses
+    :param on_clear: Called when the text is cleared
+    :param delay_ms: Pause that counts as the end of typing
+    :param min_length: Shorter text is ignored until more is typed
+    """
+
+    def __init__(self, entry, on_search, on_clear, delay_ms=SEARCH_DELAY_MS, min_length=MIN_SEARCH_LENGTH):
+        self.entry = entry
+        self.on_search = on_search
+        self.on_clear = on_clear
+        self.delay_ms = delay_ms
+        self.min_length = min_length
+        self._after_id = None
+        self._last = ""  # Text of the last search, so keys that change nothing are ignored
+        entry.bind("<KeyRelease>", self._on_key, add="+")
+
+    def _on_key(self, event):
+        if self._after_id is not None:
+            self.entry.after_cancel(self._after_id)
+        self._after_id = self.entry.after(self.delay_ms, self._fire)
+
+    def _fire(self):
+        self._after_id = None
+        text = self.entry.get().strip()
+        if text == self._last:
+            return
+        if not text:
+            self._last = text
+            self.on_clear()
+        elif len(text) >= self.min_length:
+            self._last = text
+            self.on_search(text)
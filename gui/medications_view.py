@@ -1,9 +1,13 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
-import tkinter as tk
+from gui.virtual_table import VirtualTable
+from gui.live_search import LiveSearch
+from database.create_tables import indexed_columns
 from database.basic_queries import (
-    get_all_medications,
+    get_medications_page,
+    get_medication,
+    find_medications,
     add_medication_to_db,
     update_medication,
     delete_medication,
@@ -11,47 +15,39 @@ from database.basic_queries import (
 
 
 class MedicationsView:
-    def __init__(self, root, db_conn):
+    def __init__(self, root, worker):
         self.root = root
-        self.db_conn = db_conn
-
-        # Configure table styles
-        style = tb.Style()
-        style.configure(
-            "Treeview",
-            background="white",
-            foreground="black",
-            rowheight=30,
-            fieldbackground="white",
-            borderwidth=0,
-            font=("Segoe UI", 11),
-        )
-        style.configure(
-            "Treeview.Heading",
-            background="#f8f9fa",
-            foreground="black",
-            font=("Segoe UI", 12, "bold"),
-        )
-        style.map(
-            "Treeview",
-            background=[("selected", "#e8f4ff")],
-            foreground=[("selected", "black")],
-        )
+        self.worker = worker
+        self.frame = None  # Built on first show and reused afterwards
+        self.search_query = None  # Search shown in the table, kept when re-sorting
 
     def show(self, content_frame):
         """Display the Medications view."""
-        # Clear the content frame
-        for widget in content_frame.winfo_children():
-            widget.destroy()
+        if self.frame is None:
+            self.build(content_frame)
+        self.frame.pack(fill="both", expand=True)
+
+        # Rows loaded on an earlier visit are reused until they go stale
+        if self.table.is_stale():
+            self.load_medications()
+
+    def hide(self):
+        """Hide the view, keeping its widgets and rows for the next visit."""
+        self.frame.pack_forget()
+
+    def build(self, content_frame):
+        """Create the view's widgets inside content_frame."""
+        self.frame = tb.Frame(content_frame)
 
         # Search bar
-        search_frame = tb.Frame(content_frame)
+        search_frame = tb.Frame(self.frame)
         search_frame.pack(side="top", fill="x", pady=10)
 
         search_label = tb.Label(search_frame, text="Search:")
         search_label.pack(side="left", padx=5)
         search_entry = tb.Entry(search_frame)
         search_entry.pack(side="left", padx=5)
+        LiveSearch(search_entry, self.run_search, self.load_medications)
 
         search_button = tb.Button(
             search_frame,
@@ -69,36 +65,27 @@ class MedicationsView:
         )
         add_button.pack(side="right", padx=5)
 
-        # Table for displaying Medications
-        tree_frame = tb.Frame(content_frame)
-        tree_frame.pack(fill="both", expand=True)
-
-        columns = ("MedicationID", "Medication Name", "Dosage", "Manufacturer")
-        self.tree = tb.Treeview(
-            tree_frame, columns=columns, show="headings", style="Treeview"
+        # Table for displaying Medications; rows are paged in as the user scrolls
+        self.table = VirtualTable(
+            self.frame,
+            columns=[
+                ("MedicationID", "Medication ID", "center", 100),
+                ("Medication Name", "Medication Name", "w", 200),
+                ("Dosage", "Dosage", "center", 100),
+                ("Manufacturer", "Manufacturer", "w", 200),
+            ],
+            fetch_page=get_medications_page,
+            worker=self.worker,
+            key_indexes=(0,),
+            sort_columns=["MedicationID", "MedicationName", "Dosage", "Manufacturer"],
+            fast_columns=indexed_columns("Medications"),
+            on_sort=self.sort_medications,
         )
-
-        # Configure columns
-        self.tree.column("#0", width=0, stretch=tk.NO)  # Hide default column
-        self.tree.column("MedicationID", anchor="center", width=100)
-        self.tree.column("Medication Name", anchor="w", width=200)
-        self.tree.column("Dosage", anchor="center", width=100)
-        self.tree.column("Manufacturer", anchor="w", width=200)
-
-        # Add headers
-        self.tree.heading("MedicationID", text="Medication ID", anchor="center")
-        self.tree.heading("Medication Name", text="Medication Name", anchor="w")
-        self.tree.heading("Dosage", text="Dosage", anchor="center")
-        self.tree.heading("Manufacturer", text="Manufacturer", anchor="w")
-
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar = tb.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
 
         # Action buttons
-        actions_frame = tb.Frame(content_frame)
+        actions_frame = tb.Frame(self.frame)
         actions_frame.pack(side="bottom", fill="x", pady=10)
 
         edit_button = tb.Button(
@@ -117,21 +104,19 @@ class MedicationsView:
         )
         delete_button.pack(side="left", padx=5)
 
-        # Load initial data
-        self.load_medications()
 
     def load_medications(self):
         """Load medications from the database."""
-        self.tree.delete(*self.tree.get_children())
-        try:
-            medications = get_all_medications(self.db_conn)
-            for idx, medication in enumerate(medications):
-                tag = "evenrow" if idx % 2 == 0 else "oddrow"
-                self.tree.insert("", "end", values=medication, tags=(tag,))
-            self.tree.tag_configure("evenrow", background="#f9f9f9")
-            self.tree.tag_configure("oddrow", background="#ffffff")
-        except Exception as e:
-            Messagebox.show_error(f"Failed to load medications: {e}", title="Error")
+        self.search_query = None
+        self.worker.cancel((self, "search"))
+        self.table.reload()
+
+    def sort_medications(self):
+        """Re-run the current search, or reload, in the table's new sort order."""
+        if self.search_query:
+            self.run_search(self.search_query)
+        else:
+            self.load_medications()
 
     def search_medications(self, search_entry):
         """Search medications based on the search query."""
@@ -140,19 +125,22 @@ class MedicationsView:
             Messagebox.show_warning("Please enter a search query.", title="Warning")
             return
 
-        self.tree.delete(*self.tree.get_children())
-        try:
-            medications = get_all_medications(self.db_conn)
-            filtered_medications = [
-                m
-                for m in medications
-                if query.lower() in m[1].lower() or query.lower() in m[3].lower()
-            ]
-            for medication in filtered_medications:
-                self.tree.insert("", "end", values=medication)
-        except Exception as e:
+        self.run_search(query)
+
+    def run_search(self, query):
+        """Stream matching medications into the table, replacing any search still running."""
+        def on_rows(medications, first):
+            self.table.show_rows(medications, append=not first)
+
+        def on_error(e):
             Messagebox.show_error(f"Search failed: {e}", title="Error")
 
+        self.search_query = query
+        self.worker.stream(
+            find_medications, query, stream=True, sort=self.table.sort, descending=self.table.descending,
+            on_rows=on_rows, on_error=on_error, key=(self, "search"), interruptible=True
+        )
+
     def add_medication(self):
         """Open a form to add a new medication."""
         add_window = tb.Toplevel(self.root)
@@ -182,13 +170,15 @@ class MedicationsView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                add_medication_to_db(self.db_conn, data)
+            def on_success(_):
                 add_window.destroy()
-                self.load_medications()
-            except Exception as e:
+                self.table.refresh_row(get_medication, (data["MedicationID"],))
+
+            def on_error(e):
                 Messagebox.show_error(f"Failed to add medication: {e}", title="Error")
 
+            self.worker.submit(add_medication_to_db, data, on_success=on_success, on_error=on_error)
+
         save_button = tb.Button(
             form_frame, text="Save", command=save_medication, bootstyle=SUCCESS
         )
@@ -230,15 +220,23 @@ class MedicationsView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                update_medication(self.db_conn, data["MedicationID"], data)
+            def on_success(_):
                 edit_window.destroy()
-                self.load_medications()
-            except Exception as e:
+                self.table.refresh_row(
+                    get_medication, (data["MedicationID"],), item=selected_item,
+                    on_missing=lambda: Messagebox.show_warning("This medication no longer exists.", title="Warning"),
+                )
+
+            def on_error(e):
                 Messagebox.show_error(
                     f"Failed to update medication: {e}", title="Error"
                 )
 
+            self.worker.submit(
+                update_medication, data["MedicationID"], data,
+                on_success=on_success, on_error=on_error
+            )
+
         save_button = tb.Button(
             form_frame, text="Save", command=update_medication_record, bootstyle=SUCCESS
         )
@@ -270,12 +268,14 @@ class MedicationsView:
         if not confirm:
             return
 
-        try:
-            delete_medication(self.db_conn, medication_id)
-            self.load_medications()
+        def on_success(_):
+            self.table.delete_item(selected_item)
             Messagebox.show_info(
                 f"Medication with ID '{medication_id}' deleted successfully.",
                 title="Success",
             )
-        except Exception as e:
-            Messagebox.show_error(f"Failed to delete medication: {e}", title="Error")
\ No newline at end of file
+
+        def on_error(e):
+            Messagebox.show_error(f"Failed to delete medication: {e}", title="Error")
+
+        self.worker.submit(delete_medication, medication_id, on_success=on_success, on_error=on_error)
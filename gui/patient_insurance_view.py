@@ -1,9 +1,14 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
-import tkinter as tk
+from gui.virtual_table import VirtualTable
+from gui.live_search import LiveSearch
+from gui.fk_picker import patient_picker, insurance_picker, unresolved
+from database.create_tables import indexed_columns
 from database.basic_queries import (
-    get_all_patient_insurance,
+    get_patient_insurance_page,
+    get_patient_insurance,
+    find_patient_insurance,
     add_patient_insurance_to_db,
     update_patient_insurance,
     delete_patient_insurance,
@@ -11,47 +16,39 @@ from database.basic_queries import (
 
 
 class PatientInsuranceView:
-    def __init__(self, root, db_conn):
+    def __init__(self, root, worker):
         self.root = root
-        self.db_conn = db_conn
-
-        # Configure table styles
-        style = tb.Style()
-        style.configure(
-            "Treeview",
-            background="white",
-            foreground="black",
-            rowheight=30,
-            fieldbackground="white",
-            borderwidth=0,
-            font=("Segoe UI", 11),
-        )
-        style.configure(
-            "Treeview.Heading",
-            background="#f8f9fa",
-            foreground="black",
-            font=("Segoe UI", 12, "bold"),
-        )
-        style.map(
-            "Treeview",
-            background=[("selected", "#e8f4ff")],
-            foreground=[("selected", "black")],
-        )
+        self.worker = worker
+        self.frame = None  # Built on first show and reused afterwards
+        self.search_query = None  # Search shown in the table, kept when re-sorting
 
     def show(self, content_frame):
         """Display the Patient Insurance view."""
-        # Clear the content frame
-        for widget in content_frame.winfo_children():
-            widget.destroy()
+        if self.frame is None:
+            self.build(content_frame)
+        self.frame.pack(fill="both", expand=True)
+
+        # Rows loaded on an earlier visit are reused until they go stale
+        if self.table.is_stale():
+            self.load_patient_insurance()
+
+    def hide(self):
+        """Hide the view, keeping its widgets and rows for the next visit."""
+        self.frame.pack_forget()
+
+    def build(self, content_frame):
+        """Create the view's widgets inside content_frame."""
+        self.frame = tb.Frame(content_frame)
 
         # Search bar
-        search_frame = tb.Frame(content_frame)
+        search_frame = tb.Frame(self.frame)
         search_frame.pack(side="top", fill="x", pady=10)
 
         search_label = tb.Label(search_frame, text="Search:")
         search_label.pack(side="left", padx=5)
         search_entry = tb.Entry(search_frame)
         search_entry.pack(side="left", padx=5)
+        LiveSearch(search_entry, self.run_search, self.load_patient_insurance)
 
         search_button = tb.Button(
             search_frame,
@@ -69,45 +66,27 @@ class PatientInsuranceView:
         )
         add_button.pack(side="right", padx=5)
 
-        # Table for displaying Patient Insurance
-        tree_frame = tb.Frame(content_frame)
-        tree_frame.pack(fill="both", expand=True)
-
-        columns = (
-            "PatientID",
-            "InsuranceID",
-            "Coverage Start Date",
-            "Coverage End Date",
-        )
-        self.tree = tb.Treeview(
-            tree_frame, columns=columns, show="headings", style="Treeview"
-        )
-
-        # Configure columns
-        self.tree.column("#0", width=0, stretch=tk.NO)  # Hide default column
-        self.tree.column("PatientID", anchor="center", width=100)
-        self.tree.column("InsuranceID", anchor="center", width=100)
-        self.tree.column("Coverage Start Date", anchor="center", width=150)
-        self.tree.column("Coverage End Date", anchor="center", width=150)
-
-        # Add headers
-        self.tree.heading("PatientID", text="Patient ID", anchor="center")
-        self.tree.heading("InsuranceID", text="Insurance ID", anchor="center")
-        self.tree.heading(
-            "Coverage Start Date", text="Coverage Start Date", anchor="center"
+        # Table for displaying Patient Insurance; rows are paged in as the user scrolls
+        self.table = VirtualTable(
+            self.frame,
+            columns=[
+                ("PatientID", "Patient ID", "center", 100),
+                ("InsuranceID", "Insurance ID", "center", 100),
+                ("Coverage Start Date", "Coverage Start Date", "center", 150),
+                ("Coverage End Date", "Coverage End Date", "center", 150),
+            ],
+            fetch_page=get_patient_insurance_page,
+            worker=self.worker,
+            key_indexes=(0, 1),
+            sort_columns=["PatientID", "InsuranceID", "CoverageStartDate", "CoverageEndDate"],
+            fast_columns=indexed_columns("PatientInsurance"),
+            on_sort=self.sort_patient_insurance,
         )
-        self.tree.heading(
-            "Coverage End Date", text="Coverage End Date", anchor="center"
-        )
-
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar = tb.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
 
         # Action buttons
-        actions_frame = tb.Frame(content_frame)
+        actions_frame = tb.Frame(self.frame)
         actions_frame.pack(side="bottom", fill="x", pady=10)
 
         edit_button = tb.Button(
@@ -126,23 +105,19 @@ class PatientInsuranceView:
         )
         delete_button.pack(side="left", padx=5)
 
-        # Load initial data
-        self.load_patient_insurance()
 
     def load_patient_insurance(self):
         """Load patient insurance from the database."""
-        self.tree.delete(*self.tree.get_children())
-        try:
-            patient_insurance = get_all_patient_insurance(self.db_conn)
-            for idx, entry in enumerate(patient_insurance):
-                tag = "evenrow" if idx % 2 == 0 else "oddrow"
-                self.tree.insert("", "end", values=entry, tags=(tag,))
-            self.tree.tag_configure("evenrow", background="#f9f9f9")
-            self.tree.tag_configure("oddrow", background="#ffffff")
-        except Exception as e:
-            Messagebox.show_error(
-                f"Failed to load patient insurance: {e}", title="Error"
-            )
+        self.search_query = None
+        self.worker.cancel((self, "search"))
+        self.table.reload()
+
+    def sort_patient_insurance(self):
+        """Re-run the current search, or reload, in the table's new sort order."""
+        if self.search_query:
+            self.run_search(self.search_query)
+        else:
+            self.load_patient_insurance()
 
     def search_patient_insurance(self, search_entry):
         """Search patient insurance based on the search query."""
@@ -151,19 +126,22 @@ class PatientInsuranceView:
             Messagebox.show_warning("Please enter a search query.", title="Warning")
             return
 
-        self.tree.delete(*self.tree.get_children())
-        try:
-            patient_insurance = get_all_patient_insurance(self.db_conn)
-            filtered_entries = [
-                entry
-                for entry in patient_insurance
-                if query.lower() in str(entry).lower()
-            ]
-            for entry in filtered_entries:
-                self.tree.insert("", "end", values=entry)
-        except Exception as e:
+        self.run_search(query)
+
+    def run_search(self, query):
+        """Stream matching patient insurance into the table, replacing any search still running."""
+        def on_rows(patient_insurance, first):
+            self.table.show_rows(patient_insurance, append=not first)
+
+        def on_error(e):
             Messagebox.show_error(f"Search failed: {e}", title="Error")
 
+        self.search_query = query
+        self.worker.stream(
+            find_patient_insurance, query, stream=True, sort=self.table.sort, descending=self.table.descending,
+            on_rows=on_rows, on_error=on_error, key=(self, "search"), interruptible=True
+        )
+
     def add_patient_insurance(self):
         """Open a form to add a new patient insurance record."""
         add_window = tb.Toplevel(self.root)
@@ -182,31 +160,38 @@ class PatientInsuranceView:
             "Coverage End Date",
         ]
         entries = {}
+        pickers = {"PatientID": patient_picker, "InsuranceID": insurance_picker}  # ID fields chosen by name
 
         for idx, field in enumerate(fields):
             tb.Label(form_frame, text=field).grid(
                 row=idx, column=0, padx=5, pady=5, sticky="e"
             )
-            entry = tb.Entry(form_frame)
+            entry = pickers[field](form_frame, self.worker) if field in pickers else tb.Entry(form_frame)
             entry.grid(row=idx, column=1, padx=5, pady=5, sticky="w")
             entries[field] = entry
 
         def save_patient_insurance():
             """Save the patient insurance to the database."""
             data = {field: entries[field].get().strip() for field in fields}
+            unknown = unresolved(entries)
+            if unknown:
+                Messagebox.show_warning(f"No match for {unknown}; choose one of the suggestions.", title="Warning")
+                return
             if not all(data.values()):
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                add_patient_insurance_to_db(self.db_conn, data)
+            def on_success(_):
                 add_window.destroy()
-                self.load_patient_insurance()
-            except Exception as e:
+                self.table.refresh_row(get_patient_insurance, (data["PatientID"], data["InsuranceID"]))
+
+            def on_error(e):
                 Messagebox.show_error(
                     f"Failed to add patient insurance: {e}", title="Error"
                 )
 
+            self.worker.submit(add_patient_insurance_to_db, data, on_success=on_success, on_error=on_error)
+
         save_button = tb.Button(
             form_frame, text="Save", command=save_patient_insurance, bootstyle=SUCCESS
         )
@@ -249,17 +234,23 @@ class PatientInsuranceView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                update_patient_insurance(
-                    self.db_conn, data["PatientID"], data["InsuranceID"], data
-                )
+            def on_success(_):
                 edit_window.destroy()
-                self.load_patient_insurance()
-            except Exception as e:
+                self.table.refresh_row(
+                    get_patient_insurance, (values[0], values[1]), item=selected_item,
+                    on_missing=lambda: Messagebox.show_warning("This insurance record no longer exists.", title="Warning"),
+                )
+
+            def on_error(e):
                 Messagebox.show_error(
                     f"Failed to update patient insurance: {e}", title="Error"
                 )
 
+            self.worker.submit(
+                update_patient_insurance, data["PatientID"], data["InsuranceID"], data,
+                on_success=on_success, on_error=on_error
+            )
+
         save_button = tb.Button(
             form_frame,
             text="Save",
@@ -296,14 +287,19 @@ class PatientInsuranceView:
         if not confirm:
             return
 
-        try:
-            delete_patient_insurance(self.db_conn, patient_id, insurance_id)
-            self.load_patient_insurance()
+        def on_success(_):
+            self.table.delete_item(selected_item)
             Messagebox.show_info(
                 f"Insurance record for Patient ID '{patient_id}' and Insurance ID '{insurance_id}' deleted successfully.",
                 title="Success",
             )
-        except Exception as e:
+
+        def on_error(e):
             Messagebox.show_error(
                 f"Failed to delete patient insurance: {e}", title="Error"
-            )
\ No newline at end of file
+            )
+
+        self.worker.submit(
+            delete_patient_insurance, patient_id, insurance_id,
+            on_success=on_success, on_error=on_error
+        )
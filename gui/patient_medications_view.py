@@ -1,9 +1,14 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
-import tkinter as tk
+from gui.virtual_table import VirtualTable
+from gui.live_search import LiveSearch
+from gui.fk_picker import patient_picker, medication_picker, unresolved
+from database.create_tables import indexed_columns
 from database.basic_queries import (
-    get_all_patient_medications,
+    get_patient_medications_page,
+    get_patient_medication,
+    find_patient_medications,
     add_patient_medication_to_db,
     update_patient_medication,
     delete_patient_medication,
@@ -11,47 +16,39 @@ from database.basic_queries import (
 
 
 class PatientMedicationsView:
-    def __init__(self, root, db_conn):
+    def __init__(self, root, worker):
         self.root = root
-        self.db_conn = db_conn
-
-        # Configure table styles
-        style = tb.Style()
-        style.configure(
-            "Treeview",
-            background="white",
-            foreground="black",
-            rowheight=30,
-            fieldbackground="white",
-            borderwidth=0,
-            font=("Segoe UI", 11),
-        )
-        style.configure(
-            "Treeview.Heading",
-            background="#f8f9fa",
-            foreground="black",
-            font=("Segoe UI", 12, "bold"),
-        )
-        style.map(
-            "Treeview",
-            background=[("selected", "#e8f4ff")],
-            foreground=[("selected", "black")],
-        )
+        self.worker = worker
+        self.frame = None  # Built on first show and reused afterwards
+        self.search_query = None  # Search shown in the table, kept when re-sorting
 
     def show(self, content_frame):
         """Display the Patient Medications view."""
-        # Clear the content frame
-        for widget in content_frame.winfo_children():
-            widget.destroy()
+        if self.frame is None:
+            self.build(content_frame)
+        self.frame.pack(fill="both", expand=True)
+
+        # Rows loaded on an earlier visit are reused until they go stale
+        if self.table.is_stale():
+            self.load_patient_medications()
+
+    def hide(self):
+        """Hide the view, keeping its widgets and rows for the next visit."""
+        self.frame.pack_forget()
+
+    def build(self, content_frame):
+        """Create the view's widgets inside content_frame."""
+        self.frame = tb.Frame(content_frame)
 
         # Search bar
-        search_frame = tb.Frame(content_frame)
+        search_frame = tb.Frame(self.frame)
         search_frame.pack(side="top", fill="x", pady=10)
 
         search_label = tb.Label(search_frame, text="Search:")
         search_label.pack(side="left", padx=5)
         search_entry = tb.Entry(search_frame)
         search_entry.pack(side="left", padx=5)
+        LiveSearch(search_entry, self.run_search, self.load_patient_medications)
 
         search_button = tb.Button(
             search_frame,
@@ -69,38 +66,28 @@ class PatientMedicationsView:
         )
         add_button.pack(side="right", padx=5)
 
-        # Table for displaying Patient Medications
-        tree_frame = tb.Frame(content_frame)
-        tree_frame.pack(fill="both", expand=True)
-
-        columns = ("PatientID", "MedicationID", "Start Date", "End Date", "Dosage")
-        self.tree = tb.Treeview(
-            tree_frame, columns=columns, show="headings", style="Treeview"
+        # Table for displaying Patient Medications; rows are paged in as the user scrolls
+        self.table = VirtualTable(
+            self.frame,
+            columns=[
+                ("PatientID", "Patient ID", "center", 100),
+                ("MedicationID", "Medication ID", "center", 100),
+                ("Start Date", "Start Date", "center", 120),
+                ("End Date", "End Date", "center", 120),
+                ("Dosage", "Dosage", "center", 100),
+            ],
+            fetch_page=get_patient_medications_page,
+            worker=self.worker,
+            key_indexes=(0, 1),
+            sort_columns=["PatientID", "MedicationID", "StartDate", "EndDate", "Dosage"],
+            fast_columns=indexed_columns("PatientMedications"),
+            on_sort=self.sort_patient_medications,
         )
-
-        # Configure columns
-        self.tree.column("#0", width=0, stretch=tk.NO)  # Hide default column
-        self.tree.column("PatientID", anchor="center", width=100)
-        self.tree.column("MedicationID", anchor="center", width=100)
-        self.tree.column("Start Date", anchor="center", width=120)
-        self.tree.column("End Date", anchor="center", width=120)
-        self.tree.column("Dosage", anchor="center", width=100)
-
-        # Add headers
-        self.tree.heading("PatientID", text="Patient ID", anchor="center")
-        self.tree.heading("MedicationID", text="Medication ID", anchor="center")
-        self.tree.heading("Start Date", text="Start Date", anchor="center")
-        self.tree.heading("End Date", text="End Date", anchor="center")
-        self.tree.heading("Dosage", text="Dosage", anchor="center")
-
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar = tb.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
 
         # Action buttons
-        actions_frame = tb.Frame(content_frame)
+        actions_frame = tb.Frame(self.frame)
         actions_frame.pack(side="bottom", fill="x", pady=10)
 
         edit_button = tb.Button(
@@ -119,23 +106,19 @@ class PatientMedicationsView:
         )
         delete_button.pack(side="left", padx=5)
 
-        # Load initial data
-        self.load_patient_medications()
 
     def load_patient_medications(self):
         """Load patient medications from the database."""
-        self.tree.delete(*self.tree.get_children())
-        try:
-            patient_medications = get_all_patient_medications(self.db_conn)
-            for idx, entry in enumerate(patient_medications):
-                tag = "evenrow" if idx % 2 == 0 else "oddrow"
-                self.tree.insert("", "end", values=entry, tags=(tag,))
-            self.tree.tag_configure("evenrow", background="#f9f9f9")
-            self.tree.tag_configure("oddrow", background="#ffffff")
-        except Exception as e:
-            Messagebox.show_error(
-                f"Failed to load patient medications: {e}", title="Error"
-            )
+        self.search_query = None
+        self.worker.cancel((self, "search"))
+        self.table.reload()
+
+    def sort_patient_medications(self):
+        """Re-run the current search, or reload, in the table's new sort order."""
+        if self.search_query:
+            self.run_search(self.search_query)
+        else:
+            self.load_patient_medications()
 
     def search_patient_medications(self, search_entry):
         """Search patient medications based on the search query."""
@@ -144,19 +127,22 @@ class PatientMedicationsView:
             Messagebox.show_warning("Please enter a search query.", title="Warning")
             return
 
-        self.tree.delete(*self.tree.get_children())
-        try:
-            patient_medications = get_all_patient_medications(self.db_conn)
-            filtered_entries = [
-                entry
-                for entry in patient_medications
-                if query.lower() in str(entry).lower()
-            ]
-            for entry in filtered_entries:
-                self.tree.insert("", "end", values=entry)
-        except Exception as e:
+        self.run_search(query)
+
+    def run_search(self, query):
+        """Stream matching patient medications into the table, replacing any search still running."""
+        def on_rows(patient_medications, first):
+            self.table.show_rows(patient_medications, append=not first)
+
+        def on_error(e):
             Messagebox.show_error(f"Search failed: {e}", title="Error")
 
+        self.search_query = query
+        self.worker.stream(
+            find_patient_medications, query, stream=True, sort=self.table.sort, descending=self.table.descending,
+            on_rows=on_rows, on_error=on_error, key=(self, "search"), interruptible=True
+        )
+
     def add_patient_medication(self):
         """Open a form to add a new patient medication."""
         add_window = tb.Toplevel(self.root)
@@ -170,31 +156,38 @@ class PatientMedicationsView:
         # Form fields
         fields = ["PatientID", "MedicationID", "StartDate", "EndDate", "Dosage"]
         entries = {}
+        pickers = {"PatientID": patient_picker, "MedicationID": medication_picker}  # ID fields chosen by name
 
         for idx, field in enumerate(fields):
             tb.Label(form_frame, text=field).grid(
                 row=idx, column=0, padx=5, pady=5, sticky="e"
             )
-            entry = tb.Entry(form_frame)
+            entry = pickers[field](form_frame, self.worker) if field in pickers else tb.Entry(form_frame)
             entry.grid(row=idx, column=1, padx=5, pady=5, sticky="w")
             entries[field] = entry
 
         def save_patient_medication():
             """Save the patient medication to the database."""
             data = {field: entries[field].get().strip() for field in fields}
+            unknown = unresolved(entries)
+            if unknown:
+                Messagebox.show_warning(f"No match for {unknown}; choose one of the suggestions.", title="Warning")
+                return
             if not all(data.values()):
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                add_patient_medication_to_db(self.db_conn, data)
+            def on_success(_):
                 add_window.destroy()
-                self.load_patient_medications()
-            except Exception as e:
+                self.table.refresh_row(get_patient_medication, (data["PatientID"], data["MedicationID"]))
+
+            def on_error(e):
                 Messagebox.show_error(
                     f"Failed to add patient medication: {e}", title="Error"
                 )
 
+            self.worker.submit(add_patient_medication_to_db, data, on_success=on_success, on_error=on_error)
+
         save_button = tb.Button(
             form_frame, text="Save", command=save_patient_medication, bootstyle=SUCCESS
         )
@@ -237,17 +230,23 @@ class PatientMedicationsView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                update_patient_medication(
-                    self.db_conn, data["PatientID"], data["MedicationID"], data
-                )
+            def on_success(_):
                 edit_window.destroy()
-                self.load_patient_medications()
-            except Exception as e:
+                self.table.refresh_row(
+                    get_patient_medication, (values[0], values[1]), item=selected_item,
+                    on_missing=lambda: Messagebox.show_warning("This medication record no longer exists.", title="Warning"),
+                )
+
+            def on_error(e):
                 Messagebox.show_error(
                     f"Failed to update patient medication: {e}", title="Error"
                 )
 
+            self.worker.submit(
+                update_patient_medication, data["PatientID"], data["MedicationID"], data,
+                on_success=on_success, on_error=on_error
+            )
+
         save_button = tb.Button(
             form_frame,
             text="Save",
@@ -285,14 +284,19 @@ class PatientMedicationsView:
         if not confirm:
             return
 
-        try:
-            delete_patient_medication(self.db_conn, patient_id, medication_id)
-            self.load_patient_medications()
+        def on_success(_):
+            self.table.delete_item(selected_item)
             Messagebox.show_info(
                 f"Medication record for Patient ID '{patient_id}' and Medication ID '{medication_id}' deleted successfully.",
                 title="Success",
             )
-        except Exception as e:
+
+        def on_error(e):
             Messagebox.show_error(
                 f"Failed to delete patient medication: {e}", title="Error"
-            )
\ No newline at end of file
+            )
+
+        self.worker.submit(
+            delete_patient_medication, patient_id, medication_id,
+            on_success=on_success, on_error=on_error
+        )
@@ -1,52 +1,47 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
-import tkinter as tk
-from database.basic_queries import get_all_patients, add_patient_to_db, update_patient, delete_patient
+from gui.virtual_table import VirtualTable
+from gui.live_search import LiveSearch
+from gui.fk_picker import hcp_picker, unresolved
+from database.create_tables import indexed_columns
+from database.basic_queries import get_patients_page, get_patient, find_patients, add_patient_to_db, update_patient, delete_patient
 
 
 class PatientsView:
-    def __init__(self, root, db_conn):
+    def __init__(self, root, worker):
         self.root = root
-        self.db_conn = db_conn
-
-        # Configure table styles
-        style = tb.Style()
-        style.configure(
-            "Treeview",
-            background="white",
-            foreground="black",
-            rowheight=30,
-            fieldbackground="white",
-            borderwidth=0,
-            font=("Segoe UI", 11),
-        )
-        style.configure(
-            "Treeview.Heading",
-            background="#f8f9fa",
-            foreground="black",
-            font=("Segoe UI", 12, "bold"),
-        )
-        style.map(
-            "Treeview",
-            background=[("selected", "#e8f4ff")],
-            foreground=[("selected", "black")],
-        )
+        self.worker = worker
+        self.frame = None  # Built on first show and reused afterwards
+        self.search_query = None  # Search shown in the table, kept when re-sorting
 
     def show(self, content_frame):
         """Display the Patients view."""
-        # Clear the content frame
-        for widget in content_frame.winfo_children():
-            widget.destroy()
+        if self.frame is None:
+            self.build(content_frame)
+        self.frame.pack(fill="both", expand=True)
+
+        # Rows loaded on an earlier visit are reused until they go stale
+        if self.table.is_stale():
+            self.load_patients()
+
+    def hide(self):
+        """Hide the view, keeping its widgets and rows for the next visit."""
+        self.frame.pack_forget()
+
+    def build(self, content_frame):
+        """Create the view's widgets inside content_frame."""
+        self.frame = tb.Frame(content_frame)
 
         # Search bar
-        search_frame = tb.Frame(content_frame)
+        search_frame = tb.Frame(self.frame)
         search_frame.pack(side="top", fill="x", pady=10)
 
         search_label = tb.Label(search_frame, text="Search:")
         search_label.pack(side="left", padx=5)
         search_entry = tb.Entry(search_frame)
         search_entry.pack(side="left", padx=5)
+        LiveSearch(search_entry, self.run_search, self.load_patients)
 
         search_button = tb.Button(
             search_frame,
@@ -61,40 +56,30 @@ class PatientsView:
         )
         add_button.pack(side="right", padx=5)
 
-        # Table for displaying Patients
-        tree_frame = tb.Frame(content_frame)
-        tree_frame.pack(fill="both", expand=True)
-
-        columns = ("PatientID", "First Name", "Last Name", "DOB", "Address", "Phone Number", "PrimaryHCPID")
-        self.tree = tb.Treeview(tree_frame, columns=columns, show="headings", style="Treeview")
-
-        # Configure columns
-        self.tree.column("#0", width=0, stretch=tk.NO)  # Hide default column
-        self.tree.column("PatientID", anchor="center", width=100)
-        self.tree.column("First Name", anchor="w", width=150)
-        self.tree.column("Last Name", anchor="w", width=150)
-        self.tree.column("DOB", anchor="center", width=120)
-        self.tree.column("Address", anchor="w", width=200)
-        self.tree.column("Phone Number", anchor="center", width=120)
-        self.tree.column("PrimaryHCPID", anchor="center", width=100)
-
-        # Add headers
-        self.tree.heading("PatientID", text="Patient ID", anchor="center")
-        self.tree.heading("First Name", text="First Name", anchor="w")
-        self.tree.heading("Last Name", text="Last Name", anchor="w")
-        self.tree.heading("DOB", text="Date of Birth", anchor="center")
-        self.tree.heading("Address", text="Address", anchor="w")
-        self.tree.heading("Phone Number", text="Phone Number", anchor="center")
-        self.tree.heading("PrimaryHCPID", text="Primary HCP ID", anchor="center")
-
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar = tb.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        # Table for displaying Patients; rows are paged in as the user scrolls
+        self.table = VirtualTable(
+            self.frame,
+            columns=[
+                ("PatientID", "Patient ID", "center", 100),
+                ("First Name", "First Name", "w", 150),
+                ("Last Name", "Last Name", "w", 150),
+                ("DOB", "Date of Birth", "center", 120),
+                ("Address", "Address", "w", 200),
+                ("Phone Number", "Phone Number", "center", 120),
+                ("PrimaryHCPID", "Primary HCP ID", "center", 100),
+            ],
+            fetch_page=get_patients_page,
+            worker=self.worker,
+            key_indexes=(0,),
+            sort_columns=["PatientID", "FirstName", "LastName", "DOB", "Address", "PhoneNumber", "PrimaryHCPID"],
+            fast_columns=indexed_columns("Patients"),
+            on_sort=self.sort_patients,
+        )
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
 
         # Action buttons
-        actions_frame = tb.Frame(content_frame)
+        actions_frame = tb.Frame(self.frame)
         actions_frame.pack(side="bottom", fill="x", pady=10)
 
         edit_button = tb.Button(
@@ -107,21 +92,19 @@ class PatientsView:
         )
         delete_button.pack(side="left", padx=5)
 
-        # Load initial data
-        self.load_patients()
 
     def load_patients(self):
         """Load patients from the database."""
-        self.tree.delete(*self.tree.get_children())
-        try:
-            patients = get_all_patients(self.db_conn)
-            for idx, patient in enumerate(patients):
-                tag = "evenrow" if idx % 2 == 0 else "oddrow"
-                self.tree.insert("", "end", values=patient, tags=(tag,))
-            self.tree.tag_configure("evenrow", background="#f9f9f9")
-            self.tree.tag_configure("oddrow", background="#ffffff")
-        except Exception as e:
-            Messagebox.show_error(f"Failed to load patients: {e}", title="Error")
+        self.search_query = None
+        self.worker.cancel((self, "search"))
+        self.table.reload()
+
+    def sort_patients(self):
+        """Re-run the current search, or reload, in the table's new sort order."""
+        if self.search_query:
+            self.run_search(self.search_query)
+        else:
+            self.load_patients()
 
     def search_patients(self, search_entry):
         """Search patients based on the search query."""
@@ -130,17 +113,22 @@ class PatientsView:
             Messagebox.show_warning("Please enter a search query.", title="Warning")
             return
 
-        self.tree.delete(*self.tree.get_children())
-        try:
-            patients = get_all_patients(self.db_conn)
-            filtered_patients = [
-                p for p in patients if query.lower() in p[1].lower() or query.lower() in p[2].lower()
-            ]
-            for patient in filtered_patients:
-                self.tree.insert("", "end", values=patient)
-        except Exception as e:
+        self.run_search(query)
+
+    def run_search(self, query):
+        """Stream matching patients into the table, replacing any search still running."""
+        def on_rows(patients, first):
+            self.table.show_rows(patients, append=not first)
+
+        def on_error(e):
             Messagebox.show_error(f"Search failed: {e}", title="Error")
 
+        self.search_query = query
+        self.worker.stream(
+            find_patients, query, stream=True, sort=self.table.sort, descending=self.table.descending,
+            on_rows=on_rows, on_error=on_error, key=(self, "search"), interruptible=True
+        )
+
     def add_patient(self):
         """Open a form to add a new patient."""
         add_window = tb.Toplevel(self.root)
@@ -154,27 +142,34 @@ class PatientsView:
         # Form fields
         fields = ["PatientID", "FirstName", "LastName", "DOB", "Address", "PhoneNumber", "PrimaryHCPID"]
         entries = {}
+        pickers = {"PrimaryHCPID": hcp_picker}  # ID fields chosen by name
 
         for idx, field in enumerate(fields):
             tb.Label(form_frame, text=field).grid(row=idx, column=0, padx=5, pady=5, sticky="e")
-            entry = tb.Entry(form_frame)
+            entry = pickers[field](form_frame, self.worker) if field in pickers else tb.Entry(form_frame)
             entry.grid(row=idx, column=1, padx=5, pady=5, sticky="w")
             entries[field] = entry
 
         def save_patient():
             """Save the patient to the database."""
             data = {field: entries[field].get().strip() for field in fields}
+            unknown = unresolved(entries)
+            if unknown:
+                Messagebox.show_warning(f"No match for {unknown}; choose one of the suggestions.", title="Warning")
+                return
             if not all(data.values()):
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                add_patient_to_db(self.db_conn, data)
+            def on_success(_):
                 add_window.destroy()
-                self.load_patients()
-            except Exception as e:
+                self.table.refresh_row(get_patient, (data["PatientID"],))
+
+            def on_error(e):
                 Messagebox.show_error(f"Failed to add patient: {e}", title="Error")
 
+            self.worker.submit(add_patient_to_db, data, on_success=on_success, on_error=on_error)
+
         save_button = tb.Button(form_frame, text="Save", command=save_patient, bootstyle=SUCCESS)
         save_button.grid(row=len(fields), column=0, columnspan=2, pady=10)
 
@@ -196,10 +191,11 @@ class PatientsView:
 
         fields = ["FirstName", "LastName", "DOB", "Address", "PhoneNumber", "PrimaryHCPID"]
         entries = {}
+        pickers = {"PrimaryHCPID": hcp_picker}  # ID fields chosen by name
 
         for idx, field in enumerate(fields):
             tb.Label(form_frame, text=field).grid(row=idx, column=0, padx=5, pady=5, sticky="e")
-            entry = tb.Entry(form_frame)
+            entry = pickers[field](form_frame, self.worker) if field in pickers else tb.Entry(form_frame)
             entry.insert(0, values[idx + 1])  # Skip PatientID
             entry.grid(row=idx, column=1, padx=5, pady=5, sticky="w")
             entries[field] = entry
@@ -207,18 +203,30 @@ class PatientsView:
         def update_patient_record():
             """Update patient in the database."""
             data = {field: entries[field].get().strip() for field in fields}
+            unknown = unresolved(entries)
+            if unknown:
+                Messagebox.show_warning(f"No match for {unknown}; choose one of the suggestions.", title="Warning")
+                return
             data["PatientID"] = values[0]
             if not all(data.values()):
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                update_patient(self.db_conn, data["PatientID"], data)
+            def on_success(_):
                 edit_window.destroy()
-                self.load_patients()
-            except Exception as e:
+                self.table.refresh_row(
+                    get_patient, (data["PatientID"],), item=selected_item,
+                    on_missing=lambda: Messagebox.show_warning("This patient no longer exists.", title="Warning"),
+                )
+
+            def on_error(e):
                 Messagebox.show_error(f"Failed to update patient: {e}", title="Error")
 
+            self.worker.submit(
+                update_patient, data["PatientID"], data,
+                on_success=on_success, on_error=on_error
+            )
+
         save_button = tb.Button(form_frame, text="Save", command=update_patient_record, bootstyle=SUCCESS)
         save_button.grid(row=len(fields), column=0, columnspan=2, pady=10)
 
@@ -247,12 +255,13 @@ class PatientsView:
         if not confirm:
             return
 
-        try:
-            # Call the database method to delete the patient
-            delete_patient(self.db_conn, patient_id)
+        def on_success(_):
             # Remove the deleted item from the Treeview
-            self.tree.delete(selected_item)
+            self.table.delete_item(selected_item)
             Messagebox.show_info(f"Patient with ID '{patient_id}' deleted successfully.", title="Success")
-        except Exception as e:
+
+        def on_error(e):
             Messagebox.show_error(f"Failed to delete patient: {e}", title="Error")
 
+        # Call the database method to delete the patient
+        self.worker.submit(delete_patient, patient_id, on_success=on_success, on_error=on_error)
@@ -1,9 +1,13 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
-import tkinter as tk
+from gui.virtual_table import VirtualTable
+from gui.live_search import LiveSearch
+from database.create_tables import indexed_columns
 from database.basic_queries import (
-    get_all_side_effects,
+    get_side_effects_page,
+    get_side_effect,
+    find_side_effects,
     add_side_effect_to_db,
     update_side_effect,
     delete_side_effect,
@@ -11,24 +15,39 @@ from database.basic_queries import (
 
 
 class SideEffectsView:
-    def __init__(self, root, db_conn):
+    def __init__(self, root, worker):
         self.root = root
-        self.db_conn = db_conn
+        self.worker = worker
+        self.frame = None  # Built on first show and reused afterwards
+        self.search_query = None  # Search shown in the table, kept when re-sorting
 
     def show(self, content_frame):
         """Display the Side Effects view."""
-        # Clear the content frame
-        for widget in content_frame.winfo_children():
-            widget.destroy()
+        if self.frame is None:
+            self.build(content_frame)
+        self.frame.pack(fill="both", expand=True)
+
+        # Rows loaded on an earlier visit are reused until they go stale
+        if self.table.is_stale():
+            self.load_side_effects()
+
+    def hide(self):
+        """Hide the view, keeping its widgets and rows for the next visit."""
+        self.frame.pack_forget()
+
+    def build(self, content_frame):
+        """Create the view's widgets inside content_frame."""
+        self.frame = tb.Frame(content_frame)
 
         # Search bar
-        search_frame = tb.Frame(content_frame)
+        search_frame = tb.Frame(self.frame)
         search_frame.pack(side="top", fill="x", pady=10)
 
         search_label = tb.Label(search_frame, text="Search:")
         search_label.pack(side="left", padx=5)
         search_entry = tb.Entry(search_frame)
         search_entry.pack(side="left", padx=5)
+        LiveSearch(search_entry, self.run_search, self.load_side_effects)
 
         search_button = tb.Button(
             search_frame,
@@ -46,36 +65,26 @@ class SideEffectsView:
         )
         add_button.pack(side="right", padx=5)
 
-        # Table for displaying Side Effects
-        tree_frame = tb.Frame(content_frame)
-        tree_frame.pack(fill="both", expand=True)
-
-        columns = ("MedicationID", "Side Effect Description", "Severity")
-        self.tree = tb.Treeview(
-            tree_frame, columns=columns, show="headings", style="Treeview"
+        # Table for displaying Side Effects; rows are paged in as the user scrolls
+        self.table = VirtualTable(
+            self.frame,
+            columns=[
+                ("MedicationID", "Medication ID", "center", 150),
+                ("Side Effect Description", "Side Effect Description", "w", 300),
+                ("Severity", "Severity", "center", 150),
+            ],
+            fetch_page=get_side_effects_page,
+            worker=self.worker,
+            key_indexes=(0, 1),
+            sort_columns=["MedicationID", "SideEffectDescription", "Severity"],
+            fast_columns=indexed_columns("SideEffects"),
+            on_sort=self.sort_side_effects,
         )
-
-        # Configure columns
-        self.tree.column("#0", width=0, stretch=tk.NO)  # Hide default column
-        self.tree.column("MedicationID", anchor="center", width=150)
-        self.tree.column("Side Effect Description", anchor="w", width=300)
-        self.tree.column("Severity", anchor="center", width=150)
-
-        # Add headers
-        self.tree.heading("MedicationID", text="Medication ID", anchor="center")
-        self.tree.heading(
-            "Side Effect Description", text="Side Effect Description", anchor="w"
-        )
-        self.tree.heading("Severity", text="Severity", anchor="center")
-
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar = tb.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
 
         # Action buttons
-        actions_frame = tb.Frame(content_frame)
+        actions_frame = tb.Frame(self.frame)
         actions_frame.pack(side="bottom", fill="x", pady=10)
 
         edit_button = tb.Button(
@@ -94,21 +103,19 @@ class SideEffectsView:
         )
         delete_button.pack(side="left", padx=5)
 
-        # Load initial data
-        self.load_side_effects()
 
     def load_side_effects(self):
         """Load side effects from the database."""
-        self.tree.delete(*self.tree.get_children())
-        try:
-            side_effects = get_all_side_effects(self.db_conn)
-            for idx, effect in enumerate(side_effects):
-                tag = "evenrow" if idx % 2 == 0 else "oddrow"
-                self.tree.insert("", "end", values=effect, tags=(tag,))
-            self.tree.tag_configure("evenrow", background="#f9f9f9")
-            self.tree.tag_configure("oddrow", background="#ffffff")
-        except Exception as e:
-            Messagebox.show_error(f"Failed to load side effects: {e}", title="Error")
+        self.search_query = None
+        self.worker.cancel((self, "search"))
+        self.table.reload()
+
+    def sort_side_effects(self):
+        """Re-run the current search, or reload, in the table's new sort order."""
+        if self.search_query:
+            self.run_search(self.search_query)
+        else:
+            self.load_side_effects()
 
     def search_side_effects(self, search_entry):
         """Search side effects based on the search query."""
@@ -117,19 +124,22 @@ class SideEffectsView:
             Messagebox.show_warning("Please enter a search query.", title="Warning")
             return
 
-        self.tree.delete(*self.tree.get_children())
-        try:
-            side_effects = get_all_side_effects(self.db_conn)
-            filtered_effects = [
-                effect
-                for effect in side_effects
-                if query.lower() in str(effect).lower()
-            ]
-            for effect in filtered_effects:
-                self.tree.insert("", "end", values=effect)
-        except Exception as e:
+        self.run_search(query)
+
+    def run_search(self, query):
+        """Stream matching side effects into the table, replacing any search still running."""
+        def on_rows(side_effects, first):
+            self.table.show_rows(side_effects, append=not first)
+
+        def on_error(e):
             Messagebox.show_error(f"Search failed: {e}", title="Error")
 
+        self.search_query = query
+        self.worker.stream(
+            find_side_effects, query, stream=True, sort=self.table.sort, descending=self.table.descending,
+            on_rows=on_rows, on_error=on_error, key=(self, "search"), interruptible=True
+        )
+
     def add_side_effect(self):
         """Open a form to add a new side effect."""
         add_window = tb.Toplevel(self.root)
@@ -159,13 +169,15 @@ class SideEffectsView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                add_side_effect_to_db(self.db_conn, data)
+            def on_success(_):
                 add_window.destroy()
-                self.load_side_effects()
-            except Exception as e:
+                self.table.refresh_row(get_side_effect, (data["MedicationID"], data["SideEffectDescription"]))
+
+            def on_error(e):
                 Messagebox.show_error(f"Failed to add side effect: {e}", title="Error")
 
+            self.worker.submit(add_side_effect_to_db, data, on_success=on_success, on_error=on_error)
+
         save_button = tb.Button(
             form_frame, text="Save", command=save_side_effect, bootstyle=SUCCESS
         )
@@ -207,17 +219,23 @@ class SideEffectsView:
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                update_side_effect(
-                    self.db_conn, values[1], data
-                )  # Use SideEffectDescription as key
+            def on_success(_):
                 edit_window.destroy()
-                self.load_side_effects()
-            except Exception as e:
+                self.table.refresh_row(
+                    get_side_effect, (values[0], data["SideEffectDescription"]), item=selected_item,
+                    on_missing=lambda: Messagebox.show_warning("This side effect no longer exists.", title="Warning"),
+                )
+
+            def on_error(e):
                 Messagebox.show_error(
                     f"Failed to update side effect: {e}", title="Error"
                 )
 
+            self.worker.submit(
+                update_side_effect, values[0], values[1], data,
+                on_success=on_success, on_error=on_error
+            )
+
         save_button = tb.Button(
             form_frame,
             text="Save",
@@ -253,12 +271,17 @@ class SideEffectsView:
         if not confirm:
             return
 
-        try:
-            delete_side_effect(self.db_conn, medication_id, side_effect_description)
-            self.load_side_effects()
+        def on_success(_):
+            self.table.delete_item(selected_item)
             Messagebox.show_info(
                 f"Side effect '{side_effect_description}' for Medication ID '{medication_id}' deleted successfully.",
                 title="Success",
             )
-        except Exception as e:
-            Messagebox.show_error(f"Failed to delete side effect: {e}", title="Error")
\ No newline at end of file
+
+        def on_error(e):
+            Messagebox.show_error(f"Failed to delete side effect: {e}", title="Error")
+
+        self.worker.submit(
+            delete_side_effect, medication_id, side_effect_description,
+            on_success=on_success, on_error=on_error
+        )
@@ -0,0 +1,26 @@
+import ttkbootstrap as tb
+
+
+def apply_theme():
+    """Configure the widget styles shared by every view. Call once, after the root window exists."""
+    style = tb.Style()
+    style.configure(
+        "Treeview",
+        background="white",
+        foreground="black",
+        rowheight=30,
+        fieldbackground="white",
+        borderwidth=0,
+        font=("Segoe UI", 11),
+    )
+    style.configure(
+        "Treeview.Heading",
+        background="#f8f9fa",
+        foreground="black",
+        font=("Segoe UI", 12, "bold"),
+    )
+    style.map(
+        "Treeview",
+        background=[("selected", "#e8f4ff")],
+        foreground=[("selected", "black")],
+    )
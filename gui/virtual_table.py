@@ -0,0 +1,356 @@
+import time
+from collections import deque
+
+import ttkbootstrap as tb
+import tkinter as tk
+from ttkbootstrap.dialogs import Messagebox
+from database.crud_operations import encode_page_token
+
+
+# Rows requested per page from the data source
+PAGE_SIZE = 200
+
+# Pages kept in the Treeview at once; older pages are dropped as new ones load
+MAX_PAGES = 5
+
+# Seconds loaded rows are reused when a hidden view is shown again
+STALE_AFTER = 120
+
+# Fraction of the scroll range from either end at which the next page is fetched
+EDGE_THRESHOLD = 0.1
+
+
+class VirtualTable:
+    """
+    Treeview that holds only a sliding window of rows from a paginated source.
+
+    :param parent: Parent widget
+    :param columns: List of (column id, heading text, anchor, width)
+    :param fetch_page: Callable(conn, after=None, before=None, page_size=...) returning
+                       (rows, continuation token), e.g. get_patients_page
+    :param worker: DBWorker that runs fetch_page off the Tk thread
+    :param key_indexes: Positions of the ordering key within each row
+    :param page_size: Rows per page
+    :param max_pages: Pages kept loaded; scrolling past them fetches more
+    :param max_age: Seconds after loading at which is_stale() reports the rows out of date
+    :param sort_columns: Database column shown in each position, or None if it cannot
+                         be sorted; clicking a heading passes sort=column and descending=...
+                         to fetch_page
+    :param fast_columns: Database columns backed by an index, flagged in their headings
+    :param on_sort: Called after the sort order changes; defaults to reload()
+    """
+
+    def __init__(self, parent, columns, fetch_page, worker, key_indexes=(0,), page_size=PAGE_SIZE,
+                 max_pages=MAX_PAGES, max_age=STALE_AFTER, sort_columns=None, fast_columns=(), on_sort=None):
+        self.fetch_page = fetch_page
+        self.worker = worker
+        self.key_indexes = key_indexes
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.columns = columns
+        self.sort_columns = sort_columns or [None] * len(columns)
+        self.fast_columns = set(fast_columns) | {self.sort_columns[key_indexes[0]]}
+        self.on_sort = on_sort or self.reload
+        self.sort = None  # Database column the rows are ordered by; None for key order
+        self.descending = False
+
+        self.frame = tb.Frame(parent)
+        self.tree = tb.Treeview(
+            self.frame, columns=[c[0] for c in columns], show="headings", style="Treeview"
+        )
+
+        # Configure columns
+        self.tree.column("#0", width=0, stretch=tk.NO)  # Hide default column
+        for index, (column_id, text, anchor, width) in enumerate(columns):
+            self.tree.column(column_id, anchor=anchor, width=width)
+            self.tree.heading(column_id, anchor=anchor)
+            if self.sort_columns[index] is not None:
+                self.tree.heading(column_id, command=lambda i=index: self.sort_by(i))
+        self._update_headings()
+        self.tree.tag_configure("evenrow", background="#f9f9f9")
+        self.tree.tag_configure("oddrow", background="#ffffff")
+
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar = tb.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.loading_label = tb.Label(self.frame, text="Loading...", bootstyle="secondary")
+
+        # Wheel scrolling at either end leaves yview unchanged, so no scroll
+        # callback fires; check the edges explicitly after every wheel event
+        for event in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(event, lambda e: self.tree.after_idle(self._check_edges), add="+")
+
+        self.rows = {}  # Treeview item id -> original row tuple
+        self._pages = deque()  # Item ids of each loaded page, top to bottom
+        self._head_token = None  # Continuation for rows above the window
+        self._tail_token = None  # Continuation for rows below the window
+        self._top_serial = 0  # Row number of the first item, for striping
+        self._busy = False  # A page request is in flight
+        self._paged = False  # Rows come from the paginated source, in key order
+        self._loaded_at = None  # time.monotonic() of the last reload or show_rows
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def clear(self):
+        """Remove every row, forget the paging position and drop any pending page."""
+        self.worker.cancel((self, "page"))
+        self._set_busy(False)
+        self.tree.delete(*self.tree.get_children())
+        self.rows.clear()
+        self._pages.clear()
+        self._head_token = self._tail_token = None
+        self._top_serial = 0
+
+    def reload(self):
+        """Reset to the first page of the data source."""
+        self.clear()
+        self._paged = True
+        self._loaded_at = time.monotonic()
+        self._request(self._on_first_page, after=None)
+
+    def show_rows(self, rows, append=False):
+        """Display a fixed list of rows (e.g. search results) with paging switched off."""
+        if not append:
+            self.clear()
+        self._paged = False
+        self._loaded_at = time.monotonic()
+        self._pages.append(self._insert(rows or [], "end"))
+
+    def sort_by(self, index):
+        """Order by the column at index, flipping the direction if it is already the sort column."""
+        column = self.sort_columns[index]
+        if column is None:
+            return
+        self.descending = not self.descending if column == self.sort else False
+        self.sort = column
+        self._update_headings()
+        self.on_sort()
+
+    def _update_headings(self):
+        """Show the sort direction on the active heading and flag index-backed columns."""
+        for (column_id, text, _, _), column in zip(self.columns, self.sort_columns):
+            if column is not None and column == self.sort:
+                text += " \u25bc" if self.descending else " \u25b2"
+            elif column in self.fast_columns:
+                text += " \u21c5"
+            self.tree.heading(column_id, text=text)
+
+    def is_stale(self):
+        """True if nothing has been loaded yet or the rows are older than max_age."""
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age
+
+    def delete_item(self, item):
+        """Remove a single row from the table."""
+        index = self.tree.index(item)
+        self.tree.delete(item)
+        self.rows.pop(item, None)
+        for page in self._pages:
+            if item in page:
+                page.remove(item)
+                if not page:
+                    self._pages.remove(page)
+                break
+        self._restripe(index)
+
+    def refresh_row(self, fetch_row, key, item=None, on_found=None, on_missing=None):
+        """
+        Re-query one row by primary key and apply it in place instead of reloading.
+        :param fetch_row: Callable(conn, *key) returning the row or None, e.g. get_patient
+        :param key: Primary key of the row, after any edit
+        :param item: Treeview item the row replaces; None for a newly added row
+        :param on_found: Called with the row once it is shown
+        :param on_missing: Called if no row has the key, e.g. another user deleted it;
+                           item is removed from the table first
+        """
+        def on_success(row):
+            if row is None:
+                if item is not None and self.tree.exists(item):
+                    self.delete_item(item)
+                if on_missing is not None:
+                    on_missing()
+                return
+            self.apply_row(row, item)
+            if on_found is not None:
+                on_found(row)
+
+        self.worker.submit(fetch_row, *key, on_success=on_success)
+
+    def apply_row(self, row, item=None):
+        """Update item with row, or insert row where it belongs in the loaded window."""
+        if row is None:
+            return  # Nothing stored under that key; leave the table as it is
+        if item is None or not self.tree.exists(item):
+            item = self._find(self._key(row))
+        if item is not None:
+            self.tree.item(item, values=row)
+            self.rows[item] = row
+            return
+
+        index = self._position(row)
+        if index is None:
+            return  # Outside the loaded window; paging will reach it
+        children = self.tree.get_children()
+        new_item = self._insert_row(row, index, self._top_serial + index)
+        if index < len(children):
+            page = next(p for p in self._pages if children[index] in p)
+            page.insert(page.index(children[index]), new_item)
+        elif self._pages:
+            self._pages[-1].append(new_item)
+        else:
+            self._pages.append([new_item])
+        self._restripe(index + 1)
+
+    def _key(self, row):
+        return tuple(row[i] for i in self.key_indexes)
+
+    def _find(self, key):
+        for item, row in self.rows.items():
+            if self._key(row) == key:
+                return item
+        return None
+
+    def _position(self, row):
+        """Index at which row belongs, or None if it falls outside the loaded pages."""
+        children = self.tree.get_children()
+        if not self._paged:
+            return len(children)  # Search results are unordered; show it last
+        key = self._order_key(row)
+        index = 0
+        for index, item in enumerate(children):
+            other = self._order_key(self.rows[item])
+            if (other < key) if self.descending else (other > key):
+                break
+        else:
+            index = len(children)
+        if index == 0 and self._head_token is not None:
+            return None
+        if index == len(children) and self._tail_token is not None:
+            return None
+        return index
+
+    def _token_indexes(self):
+        """Row positions of the values a page token holds: the sort column, then the key."""
+        if self.sort is None:
+            return self.key_indexes
+        sort_index = self.sort_columns.index(self.sort)
+        return (sort_index,) + tuple(i for i in self.key_indexes if i != sort_index)
+
+    def _order_key(self, row):
+        """Comparable key matching the database order, with NULLs first as in MariaDB."""
+        return tuple((row[i] is not None, row[i]) for i in self._token_indexes())
+
+    def _restripe(self, start):
+        """Recolour rows from index start down after a row was inserted or removed."""
+        for serial, item in enumerate(self.tree.get_children()[start:], self._top_serial + start):
+            self.tree.item(item, tags=("evenrow" if serial % 2 == 0 else "oddrow",))
+
+    def _token_for(self, item):
+        row = self.rows[item]
+        return encode_page_token([row[i] for i in self._token_indexes()])
+
+    def _insert(self, rows, position):
+        """Insert rows at "end" or at index 0, keeping the stripe pattern continuous."""
+        items = []
+        if position == "end":
+            serial = self._top_serial + len(self.rows)
+            for row in rows:
+                items.append(self._insert_row(row, "end", serial))
+                serial += 1
+        else:
+            self._top_serial -= len(rows)
+            serial = self._top_serial
+            for index, row in enumerate(rows):
+                items.append(self._insert_row(row, index, serial))
+                serial += 1
+        return items
+
+    def _insert_row(self, row, index, serial):
+        tag = "evenrow" if serial % 2 == 0 else "oddrow"
+        item = self.tree.insert("", index, values=row, tags=(tag,))
+        self.rows[item] = row
+        return item
+
+    def _request(self, on_rows, **kwargs):
+        """Fetch a page on the worker; on_rows runs on the Tk thread with the result."""
+        self._set_busy(True)
+
+        def on_success(result):
+            self._set_busy(False)
+            on_rows(*result)
+
+        def on_error(error):
+            self._set_busy(False)
+            self._loaded_at = None  # Retry on the next visit
+            Messagebox.show_error(f"Failed to load rows: {error}", title="Error")
+
+        self.worker.submit(
+            self.fetch_page, page_size=self.page_size, sort=self.sort, descending=self.descending,
+            on_success=on_success, on_error=on_error, key=(self, "page"), **kwargs
+        )
+
+    def _set_busy(self, busy):
+        self._busy = busy
+        if busy:
+            self.loading_label.place(relx=0.5, rely=1.0, anchor="s", y=-4)
+        else:
+            self.loading_label.place_forget()
+
+    def _on_first_page(self, rows, token):
+        self._tail_token = token
+        if rows:
+            self._pages.append(self._insert(rows, "end"))
+
+    def _on_next_page(self, rows, token):
+        top_index = self._top_index()
+        self._tail_token = token
+        if not rows:
+            return
+        self._pages.append(self._insert(rows, "end"))
+
+        if len(self._pages) > self.max_pages:
+            dropped = self._pages.popleft()
+            self.tree.delete(*dropped)
+            for item in dropped:
+                self.rows.pop(item, None)
+            self._top_serial += len(dropped)
+            self._head_token = self._token_for(self._pages[0][0])
+            # Keep the rows the user is looking at in place
+            self._move_to(top_index - len(dropped))
+
+    def _on_previous_page(self, rows, token):
+        top_index = self._top_index()
+        self._head_token = token
+        if not rows:
+            return
+        self._pages.appendleft(self._insert(rows, 0))
+
+        if len(self._pages) > self.max_pages:
+            dropped = self._pages.pop()
+            self.tree.delete(*dropped)
+            for item in dropped:
+                self.rows.pop(item, None)
+            self._tail_token = self._token_for(self._pages[-1][-1])
+        self._move_to(top_index + len(rows))
+
+    def _top_index(self):
+        return round(self.tree.yview()[0] * len(self.rows))
+
+    def _move_to(self, index):
+        if self.rows:
+            self.tree.yview_moveto(max(0, index) / len(self.rows))
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.tree.after_idle(self._check_edges)
+
+    def _check_edges(self):
+        if self._busy or not self._pages:
+            return
+        first, last = self.tree.yview()
+        if self._tail_token is not None and last >= 1.0 - EDGE_THRESHOLD:
+            self._request(self._on_next_page, after=self._tail_token)
+        elif self._head_token is not None and first <= EDGE_THRESHOLD:
+            self._request(self._on_previous_page, before=self._head_token)
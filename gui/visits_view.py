@@ -2,51 +2,58 @@ import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ttkbootstrap.dialogs import Messagebox
 import tkinter as tk
-from database.basic_queries import get_all_visits, add_visit_to_db, update_visit, delete_visit
+from gui.virtual_table import VirtualTable
+from gui.live_search import LiveSearch
+from gui.fk_picker import patient_picker, hcp_picker, unresolved
+from database.create_tables import indexed_columns
+from database.basic_queries import (
+    get_visits_page,
+    get_visit,
+    find_visits,
+    search_visit_notes,
+    add_visit_to_db,
+    update_visit,
+    delete_visit,
+    NOTES_PAGE_SIZE,
+)
 
 
 class VisitsView:
-    def __init__(self, root, db_conn):
+    def __init__(self, root, worker):
         self.root = root
-        self.db_conn = db_conn
-
-        # Configure table styles
-        style = tb.Style()
-        style.configure(
-            "Treeview",
-            background="white",
-            foreground="black",
-            rowheight=30,
-            fieldbackground="white",
-            borderwidth=0,
-            font=("Segoe UI", 11),
-        )
-        style.configure(
-            "Treeview.Heading",
-            background="#f8f9fa",
-            foreground="black",
-            font=("Segoe UI", 12, "bold"),
-        )
-        style.map(
-            "Treeview",
-            background=[("selected", "#e8f4ff")],
-            foreground=[("selected", "black")],
-        )
+        self.worker = worker
+        self.frame = None  # Built on first show and reused afterwards
+        self.search_query = None  # Search shown in the table, kept when re-sorting
+        self.notes_query = None  # Full-text search whose results "More" pages through
+        self.notes_page = 0
 
     def show(self, content_frame):
         """Display the Visits view."""
-        # Clear the content frame
-        for widget in content_frame.winfo_children():
-            widget.destroy()
+        if self.frame is None:
+            self.build(content_frame)
+        self.frame.pack(fill="both", expand=True)
+
+        # Rows loaded on an earlier visit are reused until they go stale
+        if self.table.is_stale():
+            self.load_visits()
+
+    def hide(self):
+        """Hide the view, keeping its widgets and rows for the next visit."""
+        self.frame.pack_forget()
+
+    def build(self, content_frame):
+        """Create the view's widgets inside content_frame."""
+        self.frame = tb.Frame(content_frame)
 
         # Search bar
-        search_frame = tb.Frame(content_frame)
+        search_frame = tb.Frame(self.frame)
         search_frame.pack(side="top", fill="x", pady=10)
 
         search_label = tb.Label(search_frame, text="Search:")
         search_label.pack(side="left", padx=5)
         search_entry = tb.Entry(search_frame)
         search_entry.pack(side="left", padx=5)
+        LiveSearch(search_entry, self.run_search, self.load_visits)
 
         search_button = tb.Button(
             search_frame,
@@ -56,6 +63,16 @@ class VisitsView:
         )
         search_button.pack(side="left", padx=5)
 
+        # Full-text search over Reason and Notes instead of IDs/dates/reason prefix
+        self.search_notes = tk.BooleanVar(value=False)
+        notes_toggle = tb.Checkbutton(
+            search_frame,
+            text="Search Notes",
+            variable=self.search_notes,
+            bootstyle="round-toggle",
+        )
+        notes_toggle.pack(side="left", padx=5)
+
         add_button = tb.Button(
             search_frame,
             text="Add Visit",
@@ -64,35 +81,28 @@ class VisitsView:
         )
         add_button.pack(side="right", padx=5)
 
-        # Table for displaying Visits
-        tree_frame = tb.Frame(content_frame)
-        tree_frame.pack(fill="both", expand=True)
-
-        columns = ("PatientID", "VisitDate", "HCPID", "Reason", "Notes")
-        self.tree = tb.Treeview(tree_frame, columns=columns, show="headings", style="Treeview")
-
-        # Configure columns
-        self.tree.column("#0", width=0, stretch=tk.NO)  # Hide default column
-        self.tree.column("PatientID", anchor="center", width=100)
-        self.tree.column("VisitDate", anchor="center", width=120)
-        self.tree.column("HCPID", anchor="center", width=100)
-        self.tree.column("Reason", anchor="w", width=200)
-        self.tree.column("Notes", anchor="w", width=250)
-
-        # Add headers
-        self.tree.heading("PatientID", text="Patient ID", anchor="center")
-        self.tree.heading("VisitDate", text="Visit Date", anchor="center")
-        self.tree.heading("HCPID", text="HCP ID", anchor="center")
-        self.tree.heading("Reason", text="Reason", anchor="w")
-        self.tree.heading("Notes", text="Notes", anchor="w")
-
-        self.tree.pack(side="left", fill="both", expand=True)
-
-        scrollbar = tb.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
-                # Action buttons
-        actions_frame = tb.Frame(content_frame)
+        # Table for displaying Visits; rows are paged in as the user scrolls
+        self.table = VirtualTable(
+            self.frame,
+            columns=[
+                ("PatientID", "Patient ID", "center", 100),
+                ("VisitDate", "Visit Date", "center", 120),
+                ("HCPID", "HCP ID", "center", 100),
+                ("Reason", "Reason", "w", 200),
+                ("Notes", "Notes", "w", 250),
+            ],
+            fetch_page=get_visits_page,
+            worker=self.worker,
+            key_indexes=(0, 1),
+            sort_columns=["PatientID", "VisitDate", "HCPID", "Reason", None],  # Notes is TEXT
+            fast_columns=indexed_columns("Visits"),
+            on_sort=self.sort_visits,
+        )
+        self.table.pack(fill="both", expand=True)
+        self.tree = self.table.tree
+
+        # Action buttons
+        actions_frame = tb.Frame(self.frame)
         actions_frame.pack(side="bottom", fill="x", pady=10)
 
         edit_button = tb.Button(
@@ -105,24 +115,24 @@ class VisitsView:
         )
         delete_button.pack(side="left", padx=5)
 
-        # Load initial data
-        self.load_visits()
+        self.more_button = tb.Button(
+            actions_frame, text="More Results", command=self.load_more_notes, bootstyle=SECONDARY, state=DISABLED
+        )
+        self.more_button.pack(side="right", padx=5)
+
 
     def load_visits(self):
         """Load visits from the database."""
-        self.tree.delete(*self.tree.get_children())
-        try:
-            visits = get_all_visits(self.db_conn)
-            # Ensure the data matches the order of Treeview columns: PatientID, VisitDate, HCPID, Reason, Notes
-            for idx, visit in enumerate(visits):
-                patient_id, visit_date, hcp_id, reason, notes = visit  # Adjust to match your query results
-                tag = "evenrow" if idx % 2 == 0 else "oddrow"
-                self.tree.insert("", "end", values=(patient_id, visit_date, hcp_id, reason, notes), tags=(tag,))
-            self.tree.tag_configure("evenrow", background="#f9f9f9")
-            self.tree.tag_configure("oddrow", background="#ffffff")
-        except Exception as e:
-            Messagebox.show_error(f"Failed to load visits: {e}", title="Error")
+        self.search_query = None
+        self.worker.cancel((self, "search"))
+        self.table.reload()
 
+    def sort_visits(self):
+        """Re-run the current search, or reload, in the table's new sort order."""
+        if self.search_query:
+            self.run_search(self.search_query)
+        else:
+            self.load_visits()
 
     def search_visits(self, search_entry):
         """Search visits based on the search query."""
@@ -131,17 +141,51 @@ class VisitsView:
             Messagebox.show_warning("Please enter a search query.", title="Warning")
             return
 
-        self.tree.delete(*self.tree.get_children())
-        try:
-            visits = get_all_visits(self.db_conn)
-            filtered_visits = [
-                v for v in visits if query.lower() in str(v).lower()
-            ]
-            for visit in filtered_visits:
-                self.tree.insert("", "end", values=visit)
-        except Exception as e:
+        self.run_search(query)
+
+    def run_search(self, query):
+        """Stream matching visits into the table, replacing any search still running."""
+        self.search_query = query
+        if self.search_notes.get():
+            self.notes_query = query
+            self.notes_page = 0
+            self.table.clear()
+            self.show_note_results()
+            return
+
+        self.more_button.configure(state=DISABLED)
+
+        def on_rows(visits, first):
+            self.table.show_rows(visits, append=not first)
+
+        def on_error(e):
             Messagebox.show_error(f"Search failed: {e}", title="Error")
 
+        self.worker.stream(
+            find_visits, query, stream=True, sort=self.table.sort, descending=self.table.descending,
+            on_rows=on_rows, on_error=on_error, key=(self, "search"), interruptible=True
+        )
+
+    def show_note_results(self):
+        """Append the current page of full-text note search results."""
+        def on_success(visits):
+            self.table.show_rows([visit[:5] for visit in visits], append=True)  # Drop the Relevance column
+            more = len(visits) == NOTES_PAGE_SIZE
+            self.more_button.configure(state=NORMAL if more else DISABLED)
+
+        def on_error(e):
+            Messagebox.show_error(f"Search failed: {e}", title="Error")
+
+        self.worker.submit(
+            search_visit_notes, self.notes_query, page=self.notes_page,
+            on_success=on_success, on_error=on_error, key=(self, "search")
+        )
+
+    def load_more_notes(self):
+        """Fetch the next page of full-text note search results."""
+        self.notes_page += 1
+        self.show_note_results()
+
     def add_visit(self):
         """Open a form to add a new visit."""
         add_window = tb.Toplevel(self.root)
@@ -154,27 +198,34 @@ class VisitsView:
 
         fields = ["PatientID", "VisitDate", "HCPID", "Reason", "Notes"]
         entries = {}
+        pickers = {"PatientID": patient_picker, "HCPID": hcp_picker}  # ID fields chosen by name
 
         for idx, field in enumerate(fields):
             tb.Label(form_frame, text=field).grid(row=idx, column=0, padx=5, pady=5, sticky="e")
-            entry = tb.Entry(form_frame)
+            entry = pickers[field](form_frame, self.worker) if field in pickers else tb.Entry(form_frame)
             entry.grid(row=idx, column=1, padx=5, pady=5, sticky="w")
             entries[field] = entry
 
         def save_visit():
             """Save the visit to the database."""
             data = {field: entries[field].get().strip() for field in fields}
+            unknown = unresolved(entries)
+            if unknown:
+                Messagebox.show_warning(f"No match for {unknown}; choose one of the suggestions.", title="Warning")
+                return
             if not all(data.values()):
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                add_visit_to_db(self.db_conn, data)
+            def on_success(_):
                 add_window.destroy()
-                self.load_visits()
-            except Exception as e:
+                self.table.refresh_row(get_visit, (data["PatientID"], data["VisitDate"]))
+
+            def on_error(e):
                 Messagebox.show_error(f"Failed to add visit: {e}", title="Error")
 
+            self.worker.submit(add_visit_to_db, data, on_success=on_success, on_error=on_error)
+
         save_button = tb.Button(form_frame, text="Save", command=save_visit, bootstyle=SUCCESS)
         save_button.grid(row=len(fields), column=0, columnspan=2, pady=10)
 
@@ -200,10 +251,11 @@ class VisitsView:
 
         fields = ["VisitDate", "HCPID", "Reason", "Notes"]
         entries = {}
+        pickers = {"HCPID": hcp_picker}  # ID fields chosen by name
 
         for idx, field in enumerate(fields):
             tb.Label(form_frame, text=field).grid(row=idx, column=0, padx=5, pady=5, sticky="e")
-            entry = tb.Entry(form_frame)
+            entry = pickers[field](form_frame, self.worker) if field in pickers else tb.Entry(form_frame)
             entry.insert(0, values[idx + 1])  # Start from index 1 to skip PatientID
             entry.grid(row=idx, column=1, padx=5, pady=5, sticky="w")
             entries[field] = entry
@@ -211,18 +263,30 @@ class VisitsView:
         def update_visit_record():
             """Update visit in the database."""
             data = {field: entries[field].get().strip() for field in fields}
+            unknown = unresolved(entries)
+            if unknown:
+                Messagebox.show_warning(f"No match for {unknown}; choose one of the suggestions.", title="Warning")
+                return
             if not all(data.values()):
                 Messagebox.show_warning("All fields are required.", title="Warning")
                 return
 
-            try:
-                update_visit(self.db_conn, values[0], values[1], data)  # PatientID, VisitDate, and data
+            def on_success(_):
                 edit_window.destroy()
-                self.load_visits()
-                Messagebox.show_info(f"Visit on '{values[1]}' updated successfully.", title="Success")
-            except Exception as e:
+                self.table.refresh_row(
+                    get_visit, (values[0], data["VisitDate"]), item=selected_item,
+                    on_found=lambda _: Messagebox.show_info(f"Visit on '{values[1]}' updated successfully.", title="Success"),
+                    on_missing=lambda: Messagebox.show_warning("This visit no longer exists.", title="Warning"),
+                )
+
+            def on_error(e):
                 Messagebox.show_error(f"Failed to update visit: {e}", title="Error")
 
+            self.worker.submit(
+                update_visit, values[0], values[1], data,
+                on_success=on_success, on_error=on_error
+            )
+
         save_button = tb.Button(form_frame, text="Save", command=update_visit_record, bootstyle=SUCCESS)
         save_button.grid(row=len(fields), column=0, columnspan=2, pady=10)
 
@@ -251,9 +315,11 @@ class VisitsView:
         if not confirm:
             return
 
-        try:
-            delete_visit(self.db_conn, patient_id, visit_date)
-            self.tree.delete(selected_item)
+        def on_success(_):
+            self.table.delete_item(selected_item)
             Messagebox.show_info(f"Visit on '{visit_date}' deleted successfully.", title="Success")
-        except Exception as e:
+
+        def on_error(e):
             Messagebox.show_error(f"Failed to delete visit: {e}", title="Error")
+
+        self.worker.submit(delete_visit, patient_id, visit_date, on_success=on_success, on_error=on_error)
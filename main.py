@@ -1,20 +1,18 @@
 from gui.app_gui import HospitalAppGUI
-from database.db_connection import connect_to_db, close_connection
+from database.db_connection import get_pool, close_pool
 import tkinter as tk
 
 def main():
-    # Establish database connection
-    db_connection = connect_to_db()
-
-    # Initialize the GUI and pass the database connection
+    # Create the window first; the pool opens connections lazily, on the GUI's worker threads
     root = tk.Tk()
-    app = HospitalAppGUI(root, db_connection)
+    app = HospitalAppGUI(root, get_pool())
 
     try:
         root.mainloop()
     finally:
-        # Ensure the database connection is closed when the app exits
-        close_connection(db_connection)
+        # Ensure the worker connections are returned and the pool is closed when the app exits
+        app.worker.shutdown()
+        close_pool()
 
 if __name__ == "__main__":
     main()
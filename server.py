@@ -0,0 +1,299 @@
+"""
+HTTP/JSON service exposing the basic_queries and advanced_queries functions.
+
+Clients share the service's connection pool instead of each holding their own
+connections. Reads are cached for a few seconds, and identical reads that
+arrive together share a single database call. Any write clears the cache.
+
+There is no authentication. The server listens on 127.0.0.1 unless --host
+says otherwise, and only the read functions (get_*, find_*, search_*) are
+served unless it is started with --allow-writes. Put it behind an
+authenticating proxy before exposing it beyond this machine.
+
+    python server.py --port 8765
+    curl "http://127.0.0.1:8765/api/find_patients?term=Smi"
+    curl -X POST -d '{"patient_id": "00000001"}' http://127.0.0.1:8765/api/get_patient
+"""
+import argparse
+import inspect
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+from database.async_operations import query_functions
+from database.cache import TTLCache
+from database.db_connection import get_pool, close_pool
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Seconds a read's response is reused for other clients; short, since the GUI also writes directly
+RESPONSE_TTL = 5
+
+# Function name prefixes that only read, and so may be cached and coalesced
+READ_PREFIXES = ("get_", "find_", "search_")
+
+# Types of the non-string arguments, converted from query-string text
+PARAMETER_TYPES = {
+    "age": int,
+    "limit": int,
+    "page": int,
+    "page_size": int,
+    "chunk_size": int,
+    "descending": bool,
+    "phrase": bool,
+}
+
+# Largest request body accepted (bytes)
+MAX_BODY = 1024 * 1024
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return str(value)
+
+
+def encode(result):
+    """Encode a query result as the JSON body sent to clients."""
+    return json.dumps({"result": result}, default=_json_default).encode()
+
+
+class QueryService:
+    """
+    Runs query functions for HTTP clients on a shared pool.
+
+    :param pool: ConnectionPool the requests draw connections from
+    :param ttl: Seconds a read's response is served from the cache
+    :param allow_writes: Also serve the functions that change data (add_*, update_*, delete_*)
+    """
+
+    def __init__(self, pool, ttl=RESPONSE_TTL, allow_writes=False):
+        self.pool = pool
+        self.functions = {
+            name: func for name, func in query_functions().items() if allow_writes or self.is_read(name)
+        }
+        self.cache = TTLCache(ttl)
+        self.coalesced = 0  # Reads answered by joining an identical read already running
+        self._inflight = {}  # key -> Future of the read running for it
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_read(name):
+        return name.startswith(READ_PREFIXES)
+
+    def call(self, name, kwargs):
+        """
+        Run a query function and return its encoded result.
+        Reads come from the cache or join an identical running read; writes clear the cache.
+        """
+        func = self.functions[name]
+        kwargs.pop("stream", None)  # Generators cannot be sent over HTTP
+        kwargs = _coerce(kwargs)
+        if not self.is_read(name):
+            body = self._run(func, kwargs)
+            self.cache.invalidate()
+            return body
+
+        key = (name, json.dumps(kwargs, sort_keys=True, default=_json_default))
+        return self.cache.get_or_load(key, lambda: self._coalesce(key, func, kwargs))
+
+    def _coalesce(self, key, func, kwargs):
+        """Run a read, or wait for the identical read another request is already running."""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            body = self._run(func, kwargs)
+            future.set_result(body)
+            return body
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def _run(self, func, kwargs):
+        with self.pool.connection() as conn:
+            return encode(func(conn, **kwargs))
+
+
+def _coerce(kwargs):
+    """
+    Convert query-string text to the types in PARAMETER_TYPES.
+    :raises ValueError: If a value cannot be converted
+    """
+    coerced = dict(kwargs)
+    for name, value in kwargs.items():
+        kind = PARAMETER_TYPES.get(name)
+        if kind is None or not isinstance(value, str):
+            continue
+        if kind is bool:
+            if value.lower() not in ("1", "true", "yes", "0", "false", "no"):
+                raise ValueError(f"{name} must be true or false, not {value!r}")
+            coerced[name] = value.lower() in ("1", "true", "yes")
+        else:
+            try:
+                coerced[name] = kind(value)
+            except ValueError:
+                raise ValueError(f"{name} must be a number, not {value!r}") from None
+    return coerced
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """
+    GET  /api                 list the available functions
+    GET  /api/<function>?...  run a read, arguments as query parameters
+    POST /api/<function>      run a read or write, arguments as a JSON object
+    """
+
+    server_version = "HospitalQueryService/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") == "/api":
+            service = self.server.service
+            self._send(200, encode({name: "read" if service.is_read(name) else "write" for name in service.functions}))
+            return
+        name = self._function_name(url.path)
+        if name is None:
+            return
+        if not self.server.service.is_read(name):
+            self._error(405, f"{name} changes data; use POST")
+            return
+        self._call(name, dict(parse_qsl(url.query)))
+
+    def do_POST(self):
+        name = self._function_name(urlsplit(self.path).path)
+        if name is None:
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            self._error(413, "Request body too large")
+            return
+        try:
+            kwargs = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._error(400, f"Invalid JSON: {e}")
+            return
+        if not isinstance(kwargs, dict):
+            self._error(400, "Body must be a JSON object of arguments")
+            return
+        self._call(name, kwargs)
+
+    def _function_name(self, path):
+        """Return the function named by /api/<function>, or send 404 and return None."""
+        prefix, _, name = path.rstrip("/").rpartition("/")
+        if prefix != "/api" or name not in self.server.service.functions:
+            self._error(404, f"Unknown function: {path}")
+            return None
+        return name
+
+    def _call(self, name, kwargs):
+        try:
+            body = self.server.service.call(name, kwargs)
+        except (TypeError, ValueError) as e:
+            self._error(400, str(e))
+        except LookupError as e:
+            self._error(404, str(e))
+        except Exception as e:
+            self._error(500, str(e))
+        else:
+            self._send(200, body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(pool, host=DEFAULT_HOST, port=DEFAULT_PORT, ttl=RESPONSE_TTL, allow_writes=False):
+    """Create the HTTP server; call serve_forever() on the result to start it."""
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.service = QueryService(pool, ttl, allow_writes)
+    return server
+
+
+class ServiceClient:
+    """
+    Calls the service's query functions as methods, with the same arguments minus conn:
+
+        client = ServiceClient()
+        rows = client.find_patients("Smi")
+    """
+
+    def __init__(self, url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=30):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self._functions = query_functions()
+
+    def __getattr__(self, name):
+        func = self._functions.get(name) if not name.startswith("_") else None
+        if func is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        def call(*args, **kwargs):
+            arguments = inspect.signature(func).bind(None, *args, **kwargs).arguments
+            arguments.pop(next(iter(arguments)))  # conn
+            request = urllib.request.Request(
+                f"{self.url}/api/{name}",
+                data=json.dumps(arguments, default=_json_default).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return json.loads(response.read())["result"]
+            except urllib.error.HTTPError as e:
+                raise RuntimeError(f"Service error {e.code}: {e.read().decode(errors='replace')}")
+
+        call.__name__ = name
+        call.__doc__ = func.__doc__
+        return call
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the hospital database queries over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to listen on; there is no authentication")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--ttl", type=float, default=RESPONSE_TTL, help="Seconds read responses are cached")
+    parser.add_argument("--allow-writes", action="store_true", help="Also serve add_*, update_* and delete_*")
+    args = parser.parse_args()
+
+    server = make_server(get_pool(), args.host, args.port, args.ttl, args.allow_writes)
+    print(f"Serving on http://{args.host}:{args.port}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import contextlib
+import io
+import logging
+
+import pytest
+
+from database import instrumentation
+from database.cache import reference_cache
+from database.create_tables import create_tables
+from database.data_generator import load_generated_data
+from database.db_connection import SQLiteBackend, use_backend, get_pool
+
+
+# Generated data loaded into the test database; 0.05 is 500 patients
+SCALE_FACTOR = 0.05
+
+
+@pytest.fixture(scope="session")
+def database():
+    """
+    Switch the process to an in-memory SQLite database filled with generated data.
+    :return: The SQLiteBackend in use
+    """
+    backend = SQLiteBackend(":memory:")
+    use_backend(backend)
+    anchor = backend.connect()  # The shared in-memory database lasts while a connection is open
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_tables()
+        with get_pool().connection() as conn:
+            load_generated_data(conn, SCALE_FACTOR)
+    yield backend
+    use_backend(None)
+    anchor.close()
+
+
+@pytest.fixture
+def conn(database):
+    """A pooled connection to the test database, with the query cache emptied."""
+    reference_cache.invalidate()
+    with get_pool().connection() as conn:
+        yield conn
+    reference_cache.invalidate()
+
+
+def _close_slow_query_log():
+    logger = logging.getLogger("database.slow_queries")
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+@pytest.fixture(autouse=True)
+def slow_query_log(tmp_path, monkeypatch):
+    """Write the slow-query log under tmp_path, not the working directory."""
+    _close_slow_query_log()
+    path = tmp_path / "slow_queries.log"
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_LOG", str(path))
+    monkeypatch.setattr(instrumentation, "_slow_log", None)
+    yield path
+    _close_slow_query_log()
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+from database.async_operations import AsyncPool
+from database.basic_queries import get_all_patients
+from database.connection_pool import ConnectionPool
+from database.crud_operations import fetch_data
+
+
+@pytest.fixture
+def single(database):
+    """A pool with one connection, so every call competes for it."""
+    pool = ConnectionPool(database.connect, min_size=0, max_size=1, checkout_timeout=5)
+    yield pool
+    pool.close()
+
+
+def test_queries_run_concurrently_as_coroutines(database):
+    async def main():
+        async with AsyncPool() as db:
+            return await asyncio.gather(db.get_all_patients(), db.fetch("SELECT COUNT(*) FROM Patients"))
+
+    patients, count = asyncio.run(main())
+    assert len(patients) == count[0][0] > 0
+
+
+def test_stream_holding_the_only_connection_does_not_starve(single):
+    async def main():
+        async with AsyncPool(single, max_workers=1) as db:
+            rows = 0
+            waiting = None
+            async for _ in db.stream(get_all_patients, stream=True, chunk_size=10, timeout=5):
+                rows += 1
+                if waiting is None:
+                    # Occupies the only worker thread waiting for the stream's connection
+                    waiting = asyncio.ensure_future(db.fetch("SELECT COUNT(*) FROM Patients", timeout=5))
+                    await asyncio.sleep(0.05)
+            return rows, (await waiting)[0][0]
+
+    rows, count = asyncio.run(main())
+    assert rows == count
+
+
+def test_call_abandoned_while_waiting_for_a_connection_never_runs(single):
+    calls = []
+
+    def record(conn):
+        calls.append(conn)
+        return fetch_data(conn, "SELECT 1")
+
+    async def main():
+        async with AsyncPool(single) as db:
+            held = single.acquire()
+            try:
+                with pytest.raises(asyncio.TimeoutError):
+                    await db.run(record, timeout=0.1)
+            finally:
+                held.close()
+            await asyncio.sleep(0.1)  # Let the abandoned call get the connection
+
+    asyncio.run(main())
+    assert calls == []
+
+
+def test_leaving_a_stream_early_returns_its_connection(single):
+    async def main():
+        async with AsyncPool(single) as db:
+            async for _ in db.stream(get_all_patients, stream=True, chunk_size=10):
+                break
+        deadline = time.monotonic() + 2
+        while single.idle_count != single.size and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert single.idle_count == single.size == 1
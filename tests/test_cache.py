@@ -0,0 +1,157 @@
+import pytest
+
+from database.basic_queries import (
+    add_medication_to_db,
+    delete_medication,
+    get_all_medications,
+    get_medication,
+    get_medications_page,
+)
+from database.create_tables import TABLE_COLUMNS
+from database.cache import TTLCache, reference_cache
+from database.transactions import transaction, after_commit
+
+MEDICATION = {"MedicationID": "MTEST001", "MedicationName": "Testamol", "Dosage": "5mg", "Manufacturer": "Acme"}
+
+
+def test_hit_after_load():
+    cache = TTLCache()
+    assert cache.get_or_load(("T", 1), lambda: "a") == "a"
+    assert cache.get_or_load(("T", 1), lambda: "b") == "a"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_none_is_not_cached():
+    cache = TTLCache()
+    cache.get_or_load(("T", 1), lambda: None)
+    assert cache.get_or_load(("T", 1), lambda: "a") == "a"
+
+
+def test_expired_entry_is_reloaded():
+    cache = TTLCache(ttl=0)
+    cache.get_or_load(("T", 1), lambda: "a")
+    assert cache.get_or_load(("T", 1), lambda: "b") == "b"
+
+
+def test_invalidate_drops_only_that_table():
+    cache = TTLCache()
+    cache.get_or_load(("T", 1), lambda: "a")
+    cache.get_or_load(("U", 1), lambda: "a")
+    cache.invalidate("T")
+    assert cache.get_or_load(("T", 1), lambda: "b") == "b"
+    assert cache.get_or_load(("U", 1), lambda: "b") == "a"
+
+
+def test_load_overlapping_invalidation_is_not_stored():
+    cache = TTLCache()
+
+    def load():
+        cache.invalidate("T")  # A write lands while the read is running
+        return "stale"
+
+    assert cache.get_or_load(("T", 1), load) == "stale"
+    assert cache.get_or_load(("T", 1), lambda: "fresh") == "fresh"
+
+
+def test_load_overlapping_full_clear_is_not_stored():
+    cache = TTLCache()
+
+    def load():
+        cache.invalidate()
+        return "stale"
+
+    cache.get_or_load(("T", 1), load)
+    assert len(cache) == 0
+
+
+def test_after_commit_runs_at_once_outside_a_transaction(conn):
+    calls = []
+    after_commit(conn, calls.append, 1)
+    assert calls == [1]
+
+
+def test_after_commit_waits_for_outermost_commit(conn):
+    calls = []
+    with transaction(conn):
+        with transaction(conn):
+            after_commit(conn, calls.append, 1)
+        assert calls == []
+    assert calls == [1]
+
+
+def test_after_commit_dropped_on_rollback(conn):
+    calls = []
+    try:
+        with transaction(conn):
+            after_commit(conn, calls.append, 1)
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    with transaction(conn):
+        pass
+    assert calls == []
+
+
+def test_after_commit_dropped_with_rolled_back_savepoint(conn):
+    calls = []
+    with transaction(conn):
+        after_commit(conn, calls.append, "outer")
+        try:
+            with transaction(conn):
+                after_commit(conn, calls.append, "inner")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+    assert calls == ["outer"]
+
+
+def test_write_invalidates_cached_reads(conn):
+    rows, _ = get_medications_page(conn, page_size=1000)
+    add_medication_to_db(conn, MEDICATION)
+    assert len(get_medications_page(conn, page_size=1000)[0]) == len(rows) + 1
+    delete_medication(conn, MEDICATION["MedicationID"])
+    assert len(get_medications_page(conn, page_size=1000)[0]) == len(rows)
+
+
+def test_write_in_transaction_invalidates_on_commit(conn):
+    with transaction(conn):
+        add_medication_to_db(conn, MEDICATION)
+        # Another connection cannot see the row yet, so what it caches now is stale at commit
+        reference_cache.get_or_load(("Medications", "other reader"), lambda: "old rows")
+        assert reference_cache.get_or_load(("Medications", "other reader"), lambda: "new rows") == "old rows"
+    assert reference_cache.get_or_load(("Medications", "other reader"), lambda: "new rows") == "new rows"
+    delete_medication(conn, MEDICATION["MedicationID"])
+
+
+def test_transaction_reads_its_own_writes(conn):
+    before = get_all_medications(conn)  # Cached outside the transaction
+    try:
+        with transaction(conn):
+            assert get_medication(conn, MEDICATION["MedicationID"]) is None
+            add_medication_to_db(conn, MEDICATION)
+            assert len(get_all_medications(conn)) == len(before) + 1
+            assert get_medication(conn, MEDICATION["MedicationID"]) is not None
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert get_medication(conn, MEDICATION["MedicationID"]) is None
+    assert len(get_all_medications(conn)) == len(before)
+
+
+def test_rolled_back_rows_are_not_cached(conn):
+    try:
+        with transaction(conn):
+            add_medication_to_db(conn, MEDICATION)
+            get_medication(conn, MEDICATION["MedicationID"])
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert len(reference_cache) == 0
+    assert get_medication(conn, MEDICATION["MedicationID"]) is None
+
+
+def test_failed_page_is_not_cached(conn, monkeypatch):
+    monkeypatch.setitem(TABLE_COLUMNS, "Medications", TABLE_COLUMNS["Medications"] + ("Missing",))
+    with pytest.raises(Exception):
+        get_medications_page(conn, sort="Missing")
+    assert len(reference_cache) == 0
@@ -0,0 +1,176 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from database import db_connection
+from database.connection_pool import ConnectionPool, PoolExhaustedError
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, statement, values=None):
+        if self.conn.dead:
+            raise ConnectionError("gone away")
+        self.conn.executed.append(statement)
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    ids = itertools.count(1)
+
+    def __init__(self):
+        self.connection_id = next(self.ids)
+        self.executed = []
+        self.dead = False
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def ping(self):
+        if self.dead:
+            raise ConnectionError("gone away")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    opened = []
+
+    def connect():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    pool = ConnectionPool(connect, min_size=0, max_size=1, checkout_timeout=0.1)
+    pool.opened = opened
+    yield pool
+    pool.close()
+
+
+def test_exhausted_pool_raises(pool):
+    with pool.connection():
+        with pytest.raises(PoolExhaustedError):
+            pool.acquire()
+
+
+def test_interrupt_does_not_need_a_free_pooled_connection(pool):
+    with pool.connection() as conn:
+        done = threading.Event()
+        threading.Thread(target=lambda: (pool.interrupt(conn), done.set())).start()
+        assert done.wait(1)  # The only pooled connection is checked out
+    assert pool.opened[1].executed == [f"KILL QUERY {pool.opened[0].connection_id}"]
+    assert pool.size == 1
+
+
+def test_interrupt_after_release_kills_nothing(pool):
+    conn = pool.acquire()
+    conn.close()
+    pool.interrupt(conn)
+    assert len(pool.opened) == 1  # No control connection was even opened
+
+
+def test_release_waits_for_a_kill_in_progress(pool):
+    conn = pool.acquire()
+    with conn._lock:  # As interrupt() holds it while the KILL is sent
+        closer = threading.Thread(target=conn.close)
+        closer.start()
+        closer.join(0.1)
+        assert closer.is_alive() and not conn.closed
+    closer.join(1)
+    assert conn.closed
+
+
+def test_control_connection_is_reused_and_reopened(pool):
+    with pool.connection() as conn:
+        pool.interrupt(conn)
+        pool.interrupt(conn)
+        assert len(pool.opened) == 2
+        pool.opened[1].dead = True
+        pool.interrupt(conn)
+    assert len(pool.opened) == 3
+    assert pool.opened[2].executed == [f"KILL QUERY {pool.opened[0].connection_id}"]
+
+
+def test_close_closes_the_control_connection(pool):
+    with pool.connection() as conn:
+        pool.interrupt(conn)
+    pool.close()
+    assert all(raw.closed for raw in pool.opened)
+
+
+def test_interrupt_of_an_ended_checkout_spares_the_next_one(pool):
+    old = pool.acquire()
+    old.close()
+    with pool.connection() as new:
+        assert new.raw is pool.opened[0]  # Same driver connection, new checkout
+        pool.interrupt(old)
+    assert pool.opened[0].executed == [] and len(pool.opened) == 1
+
+
+def test_checkout_waits_for_a_release(pool):
+    conn = pool.acquire()
+    threading.Timer(0.05, conn.close).start()
+    with pool.connection(timeout=1) as again:
+        assert again.raw is pool.opened[0]
+
+
+def test_acquire_times_out_after_the_given_wait(pool):
+    with pool.connection():
+        start = time.monotonic()
+        with pytest.raises(PoolExhaustedError):
+            pool.acquire(timeout=0.2)
+        assert time.monotonic() - start >= 0.2
+
+
+def test_dead_idle_connection_is_replaced(pool):
+    with pool.connection():
+        pass
+    pool.opened[0].dead = True
+    with pool.connection() as conn:
+        assert conn.raw is pool.opened[1]
+    assert pool.opened[0].closed and pool.size == 1
+
+
+def test_fill_opens_min_size_connections():
+    pool = ConnectionPool(FakeConnection, min_size=3, max_size=5)
+    pool.fill()
+    assert pool.size == pool.idle_count == 3
+    pool.fill()
+    assert pool.size == 3
+
+
+def test_idle_connections_expire_down_to_min_size():
+    pool = ConnectionPool(FakeConnection, min_size=1, max_size=3, idle_timeout=0.05)
+    held = [pool.acquire() for _ in range(3)]
+    raws = [conn.raw for conn in held]
+    for conn in held:
+        conn.close()
+    time.sleep(0.1)
+    with pool.connection():
+        assert pool.size == 1
+    assert sum(raw.closed for raw in raws) == 2
+
+
+def test_get_pool_opens_min_size_connections(monkeypatch):
+    monkeypatch.setattr(db_connection, "_pool", None)
+    monkeypatch.setattr(db_connection, "_open_connection", FakeConnection)
+    monkeypatch.setattr(db_connection, "DB_POOL_MIN_SIZE", 2)
+    pool = db_connection.get_pool()
+    try:
+        assert pool.idle_count == 2
+    finally:
+        pool.close()
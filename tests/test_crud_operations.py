@@ -0,0 +1,128 @@
+import pytest
+
+from database.crud_operations import bulk_insert, execute_query, fetch_data, stream_data
+from database.transactions import transaction
+
+INSERT = "INSERT INTO BulkTest (ID) VALUES (?)"
+
+
+class RecordingConnection:
+    """Remembers the size of every executemany() batch."""
+
+    def __init__(self):
+        self.batches = []
+
+    def cursor(self):
+        return self
+
+    def executemany(self, query, rows):
+        self.batches.append(len(rows))
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def bulk_table(conn):
+    execute_query(conn, "CREATE TABLE BulkTest (ID INTEGER PRIMARY KEY)", ())
+    yield conn
+    execute_query(conn, "DROP TABLE BulkTest", ())
+
+
+def ids(conn):
+    return [row[0] for row in fetch_data(conn, "SELECT ID FROM BulkTest ORDER BY ID")]
+
+
+@pytest.mark.parametrize("count, batches", [(0, []), (3, [3]), (6, [3, 3]), (7, [3, 3, 1])])
+def test_rows_are_sent_in_batches(count, batches):
+    conn = RecordingConnection()
+    assert bulk_insert(conn, INSERT, ((i,) for i in range(count)), batch_size=3) == count
+    assert conn.batches == batches
+
+
+def test_rows_from_every_batch_are_inserted(bulk_table):
+    assert bulk_insert(bulk_table, INSERT, ((i,) for i in range(10)), batch_size=4) == 10
+    assert ids(bulk_table) == list(range(10))
+
+
+def test_failed_batch_rolls_back_earlier_batches(bulk_table):
+    rows = [(i,) for i in range(8)] + [(0,)]  # The last batch repeats a key
+    with pytest.raises(Exception):
+        bulk_insert(bulk_table, INSERT, rows, batch_size=4)
+    assert ids(bulk_table) == []
+
+
+def test_failure_inside_a_transaction_rolls_it_back(bulk_table):
+    with pytest.raises(Exception):
+        with transaction(bulk_table):
+            execute_query(bulk_table, INSERT, (100,))
+            bulk_insert(bulk_table, INSERT, [(1,), (1,)])
+    assert ids(bulk_table) == []
+
+
+class TrackedConnection:
+    """Wraps a connection to count fetchmany() calls and see whether the cursor was closed."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.fetches = []
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        tracked = self
+        cur = self.conn.cursor(**kwargs)
+
+        class Cursor:
+            def __getattr__(self, name):
+                return getattr(cur, name)
+
+            def fetchmany(self, size):
+                rows = cur.fetchmany(size)
+                tracked.fetches.append(len(rows))
+                return rows
+
+            def close(self):
+                tracked.closed = True
+                cur.close()
+
+        return Cursor()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 500, 10_000])
+def test_stream_returns_every_row_across_chunks(conn, chunk_size):
+    query = "SELECT * FROM Patients ORDER BY PatientID"
+    expected = fetch_data(conn, query)
+    tracked = TrackedConnection(conn)
+    assert list(stream_data(tracked, query, chunk_size=chunk_size)) == expected
+    full, last = divmod(len(expected), chunk_size)
+    assert tracked.fetches == [chunk_size] * full + ([last] if last else []) + [0]
+    assert tracked.closed
+
+
+def test_stream_passes_parameters(conn):
+    patient_id = fetch_data(conn, "SELECT MIN(PatientID) FROM Patients")[0][0]
+    rows = list(stream_data(conn, "SELECT PatientID FROM Patients WHERE PatientID = ?", (patient_id,)))
+    assert rows == [(patient_id,)]
+
+
+def test_stream_closed_early_closes_its_cursor(conn):
+    tracked = TrackedConnection(conn)
+    rows = stream_data(tracked, "SELECT * FROM Patients", chunk_size=10)
+    for _ in range(15):
+        next(rows)
+    assert tracked.fetches == [10, 10] and not tracked.closed
+    rows.close()
+    assert tracked.closed
+    assert fetch_data(conn, "SELECT COUNT(*) FROM Patients")[0][0] > 0  # The connection is usable again
+
+
+def test_stream_opens_no_cursor_until_iterated(conn):
+    tracked = TrackedConnection(conn)
+    stream_data(tracked, "SELECT * FROM Patients")
+    assert tracked.fetches == [] and not tracked.closed
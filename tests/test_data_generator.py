@@ -0,0 +1,32 @@
+import pytest
+
+from database import data_generator
+from database.crud_operations import execute_query, fetch_data
+from tests.conftest import SCALE_FACTOR
+
+
+def test_failed_load_raises_instead_of_reporting_success(conn, monkeypatch):
+    def generate(scale_factor, seed):
+        return iter([(1,), (2,), (3,), (3,)])  # The second chunk repeats a key
+
+    monkeypatch.setattr(data_generator, "TABLES", [("LoadTest", ("ID",), generate)])
+    execute_query(conn, "CREATE TABLE LoadTest (ID INTEGER PRIMARY KEY)", ())
+    try:
+        with pytest.raises(Exception):
+            data_generator.load_generated_data(conn, commit_every=2)
+        assert fetch_data(conn, "SELECT ID FROM LoadTest ORDER BY ID") == [(1,), (2,)]
+    finally:
+        execute_query(conn, "DROP TABLE LoadTest", ())
+
+
+@pytest.mark.parametrize("table, generate", [(table, generate) for table, _, generate in data_generator.TABLES])
+def test_same_seed_gives_the_same_rows(table, generate):
+    rows = list(generate(SCALE_FACTOR, data_generator.DEFAULT_SEED))
+    assert rows and rows == list(generate(SCALE_FACTOR, data_generator.DEFAULT_SEED))
+    if len(rows) > 1:
+        assert rows != list(generate(SCALE_FACTOR, data_generator.DEFAULT_SEED + 1))
+
+
+def test_loaded_data_satisfies_every_foreign_key(conn):
+    assert fetch_data(conn, "PRAGMA foreign_key_check") == []
+
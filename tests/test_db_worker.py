@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+pytest.importorskip("ttkbootstrap")
+
+from database.connection_pool import ConnectionPool
+from gui.db_worker import DBWorker
+from tests.test_connection_pool import FakeConnection
+
+
+class FakeRoot:
+    """Stands in for the Tk root; tests deliver results by calling worker._poll()."""
+
+    def after(self, ms, callback):
+        return "after"
+
+    def after_cancel(self, after_id):
+        pass
+
+
+@pytest.fixture
+def pool():
+    opened = []
+
+    def connect():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    pool = ConnectionPool(connect, min_size=0, max_size=1, checkout_timeout=1)
+    pool.opened = opened
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def worker(pool):
+    worker = DBWorker(FakeRoot(), pool, max_workers=1)
+    yield worker
+    worker.shutdown()
+
+
+def test_each_call_returns_its_connection(worker, pool):
+    used = []
+    for _ in range(3):
+        worker.submit(used.append).result(1)
+    assert len(used) == 3 and all(conn.closed for conn in used)
+    assert pool.idle_count == 1 and len(pool.opened) == 1
+
+
+def test_shutdown_leaves_nothing_checked_out(worker, pool):
+    worker.submit(lambda conn: None).result(1)
+    worker.shutdown()
+    assert pool.idle_count == pool.size == 1
+
+
+def test_interrupt_arriving_after_the_call_finished_kills_nothing(worker, pool, monkeypatch):
+    interrupts = []
+    monkeypatch.setattr(worker, "_interrupt", interrupts.append)  # Run the interrupt thread by hand
+    first_running, release_first, second_running, release_second = (threading.Event() for _ in range(4))
+
+    def first(conn):
+        first_running.set()
+        release_first.wait(1)
+
+    def second(conn):
+        second_running.set()
+        release_second.wait(1)
+
+    worker.submit(first, key="search", interruptible=True)
+    assert first_running.wait(1)
+    newer = worker.submit(second, key="search", interruptible=True)
+    assert len(interrupts) == 1
+
+    release_first.set()
+    assert second_running.wait(1)  # The superseded call is over; the newer one holds the same connection
+    pool.interrupt(interrupts[0])
+    assert len(pool.opened) == 1 and pool.opened[0].executed == []  # No KILL was sent
+    release_second.set()
+    newer.result(1)
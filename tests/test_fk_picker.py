@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("ttkbootstrap")
+
+from database.basic_queries import (
+    add_patient_medication_to_db,
+    delete_patient_medication,
+    get_medications_page,
+    get_patient_medication,
+)
+from database.crud_operations import fetch_data
+from gui.fk_picker import LABEL_ID, PrefixIndex, _describe_medication, load_index
+
+
+def test_prefix_index_matches_any_indexed_text_once():
+    index = PrefixIndex([("Aspirin", "Aspirin [M1]"), ("M1", "Aspirin [M1]"), ("Asp", "Asp [M2]")])
+    assert index.search("as") == ["Asp [M2]", "Aspirin [M1]"]
+    assert index.search("m1") == ["Aspirin [M1]"]
+    assert index.search("x") == []
+
+
+def test_too_large_table_is_not_indexed(conn):
+    assert load_index(conn, "Medications", get_medications_page, _describe_medication, limit=1) is False
+
+
+def test_chosen_medication_saves_from_the_add_form(conn):
+    """A label picked from the medication picker resolves to an ID the add form can save."""
+    patient_id, medication_id, name = fetch_data(
+        conn,
+        "SELECT p.PatientID, m.MedicationID, m.MedicationName FROM Patients p, Medications m "
+        "WHERE NOT EXISTS (SELECT 1 FROM PatientMedications x "
+        "WHERE x.PatientID = p.PatientID AND x.MedicationID = m.MedicationID) LIMIT 1",
+    )[0]
+    index = load_index(conn, "Medications", get_medications_page, _describe_medication)
+    label = next(label for label in index.search(name) if label.endswith(f"[{medication_id}]"))
+    data = {
+        "PatientID": patient_id, "MedicationID": LABEL_ID.search(label).group(1),
+        "StartDate": "2024-01-01", "EndDate": "2024-02-01", "Dosage": "5mg",
+    }
+    add_patient_medication_to_db(conn, data)
+    try:
+        assert get_patient_medication(conn, patient_id, medication_id) is not None
+    finally:
+        delete_patient_medication(conn, patient_id, medication_id)
@@ -0,0 +1,38 @@
+import re
+
+import pytest
+
+from database import basic_queries
+from database.create_tables import FULLTEXT_INDEXES, INDEXES, TABLE_COLUMNS, index_definition
+
+# Columns a search can look up directly: each table's leading primary key column and index leads
+LOOKUP_COLUMNS = {table: {columns[0]} for table, columns in TABLE_COLUMNS.items()}
+for _, table, columns in INDEXES:
+    LOOKUP_COLUMNS[table].add(columns[0])
+
+SEARCHES = [name for name in vars(basic_queries) if name.startswith("find_")]
+
+
+@pytest.mark.parametrize("name", SEARCHES)
+def test_every_search_column_is_indexed(monkeypatch, name):
+    captured = []
+    monkeypatch.setattr(basic_queries, "fetch_data", lambda conn, query, values=None: captured.append(query))
+    getattr(basic_queries, name)(None, "2020-01-01")  # A date, so date columns are searched too
+
+    table = re.search(r"FROM (\w+)", captured[0]).group(1)
+    columns = re.findall(r"(\w+) (?:=|LIKE) %s", captured[0])
+    assert columns
+    assert set(columns) <= LOOKUP_COLUMNS[table]
+
+
+def test_index_names_are_unique_and_columns_exist():
+    definitions = INDEXES + FULLTEXT_INDEXES
+    assert len({name for name, _, _ in definitions}) == len(definitions)
+    for name, table, columns in definitions:
+        assert set(columns) <= set(TABLE_COLUMNS[table])
+        assert index_definition(name) == (table, columns, (name, table, columns) in FULLTEXT_INDEXES)
+
+
+def test_unknown_index_is_an_error():
+    with pytest.raises(KeyError):
+        index_definition("idx_nothing")
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+from database import instrumentation
+from database.async_operations import AsyncPool
+from database.basic_queries import get_all_patients
+from database.crud_operations import execute_query, fetch_data
+
+
+@pytest.fixture
+def recorded():
+    """Statements recorded while the test runs, as (fingerprint, seconds, rows, caller, failed)."""
+    calls = []
+    listener = lambda *args: calls.append(args)
+    instrumentation.add_listener(listener)
+    yield calls
+    instrumentation.remove_listener(listener)
+
+
+def drain(rows):
+    return sum(1 for _ in rows)
+
+
+def test_stream_is_credited_to_the_function_that_opened_it(conn, recorded):
+    rows = get_all_patients(conn, stream=True)
+    count = drain(rows)
+    assert recorded[-1][2] == count
+    assert recorded[-1][3] == "database.basic_queries.get_all_patients"
+
+
+def test_stream_closed_early_is_not_a_failure(conn, recorded):
+    rows = get_all_patients(conn, stream=True, chunk_size=10)
+    next(rows)
+    rows.close()
+    assert recorded[-1][4] is False
+
+
+def test_failed_statement_is_recorded(conn, recorded):
+    assert fetch_data(conn, "SELECT * FROM NoSuchTable") is None
+    fingerprint, _, rows, _, failed = recorded[-1]
+    assert fingerprint == "SELECT * FROM NoSuchTable"
+    assert rows is None and failed
+
+
+def test_write_is_timed_through_commit(recorded):
+    class SlowCommit:
+        rowcount = 1
+
+        def cursor(self):
+            return self
+
+        def execute(self, query, values):
+            pass
+
+        def commit(self):
+            time.sleep(0.05)
+
+        def close(self):
+            pass
+
+    execute_query(SlowCommit(), "UPDATE T SET a = ?", (1,))
+    assert recorded[-1][1] >= 0.05
+
+
+def test_fingerprint_groups_literals():
+    assert instrumentation.fingerprint("SELECT * FROM T WHERE a = 'x' AND b IN (1, 2, 3)") == \
+        "SELECT * FROM T WHERE a = ? AND b IN (...)"
+
+
+def test_slow_statements_are_logged_to_the_configured_file(conn, slow_query_log, monkeypatch):
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_SECONDS", 0)
+    fetch_data(conn, "SELECT COUNT(*) FROM Patients")
+    assert "SELECT COUNT(*) FROM Patients" in slow_query_log.read_text()
+
+
+def test_async_calls_are_credited_to_the_awaiting_coroutine(database, recorded):
+    async def nightly_report():
+        async with AsyncPool() as db:
+            await db.fetch("SELECT COUNT(*) FROM Patients")
+            await db.run(fetch_data, "SELECT COUNT(*) FROM Visits")
+            await db.get_all_patients()
+            async for _ in db.iterate("SELECT PatientID FROM Patients"):
+                pass
+
+    asyncio.run(nightly_report())
+    this = f"{__name__}.nightly_report"
+    assert [call[3] for call in recorded] == [this, this, "database.basic_queries.get_all_patients", this]
@@ -0,0 +1,76 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from database import migrate
+from database.create_tables import FULLTEXT_INDEXES, INDEXES
+from database.crud_operations import execute_query, fetch_data
+
+MIGRATIONS = migrate.discover_migrations()
+ADDED = re.compile(r"ADD (?:FULLTEXT )?INDEX IF NOT EXISTS (\w+) \(")
+DROPPED = re.compile(r"DROP INDEX IF EXISTS (\w+)")
+
+
+@pytest.fixture
+def schema(conn, monkeypatch):
+    """Two SQLite-compatible migrations in place of the MariaDB ones."""
+    migrations = [
+        (1, "first", SimpleNamespace(UP=["CREATE TABLE MigFirst (ID INT)"], DOWN=["DROP TABLE MigFirst"])),
+        (2, "second", SimpleNamespace(UP=["CREATE TABLE MigSecond (ID INT)"], DOWN=["DROP TABLE MigSecond"])),
+    ]
+    monkeypatch.setattr(migrate, "discover_migrations", lambda: migrations)
+    yield conn
+    for table in ("MigFirst", "MigSecond", "SchemaVersion"):
+        execute_query(conn, f"DROP TABLE IF EXISTS {table}", ())
+
+
+def tables(conn):
+    rows = fetch_data(conn, "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'Mig%'")
+    return {row[0] for row in rows}
+
+
+def test_every_index_is_added_and_dropped_by_one_migration():
+    added = [name for _, _, module in MIGRATIONS for statement in module.UP for name in ADDED.findall(statement)]
+    dropped = [name for _, _, module in MIGRATIONS for statement in module.DOWN for name in DROPPED.findall(statement)]
+    defined = [name for name, _, _ in INDEXES + FULLTEXT_INDEXES]
+    assert sorted(added) == sorted(dropped) == sorted(defined)
+
+
+def test_dry_run_prints_every_statement_in_order(conn, capsys, monkeypatch):
+    assert migrate.migrate(conn, dry_run=True) == [version for version, _, _ in MIGRATIONS]
+    printed = [line.strip() for line in capsys.readouterr().out.splitlines() if line.startswith("  ")]
+    assert printed == [statement for _, _, module in MIGRATIONS for statement in module.UP]
+    assert migrate.applied_versions(conn) == set()
+
+    monkeypatch.setattr(migrate, "applied_versions", lambda conn: {version for version, _, _ in MIGRATIONS})
+    assert migrate.rollback(conn, 0, dry_run=True) == [version for version, _, _ in reversed(MIGRATIONS)]
+    printed = [line.strip() for line in capsys.readouterr().out.splitlines() if line.startswith("  ")]
+    assert printed == [statement for _, _, module in reversed(MIGRATIONS) for statement in module.DOWN]
+
+
+def test_up_and_down_round_trip(schema):
+    assert migrate.migrate(schema, target=1) == [1]
+    assert tables(schema) == {"MigFirst"}
+    assert migrate.migrate(schema) == [2]
+    assert migrate.migrate(schema) == []
+    assert migrate.applied_versions(schema) == {1, 2}
+
+    assert migrate.rollback(schema, 1) == [2]
+    assert tables(schema) == {"MigFirst"} and migrate.applied_versions(schema) == {1}
+    assert migrate.rollback(schema, 0) == [1]
+    assert tables(schema) == set() and migrate.applied_versions(schema) == set()
+
+
+def test_dry_run_changes_nothing(schema):
+    migrate.migrate(schema, target=1)
+    assert migrate.migrate(schema, dry_run=True) == [2]
+    assert migrate.rollback(schema, 0, dry_run=True) == [1]
+    assert tables(schema) == {"MigFirst"} and migrate.applied_versions(schema) == {1}
+
+
+def test_migration_without_down_cannot_be_rolled_back(schema):
+    migrate.migrate(schema)
+    del migrate.discover_migrations()[1][2].DOWN
+    with pytest.raises(RuntimeError):
+        migrate.rollback(schema, 0)
@@ -0,0 +1,94 @@
+import pytest
+
+from database.create_tables import TABLE_COLUMNS
+from database.crud_operations import fetch_data, fetch_page, encode_page_token, execute_query, page_columns
+from database.transactions import transaction
+
+PAGE_SIZE = 7
+
+
+def walk(conn, table, key_columns, **kwargs):
+    """Follow next tokens from the first page to the last; return the pages."""
+    pages = []
+    token = None
+    while True:
+        rows, token = fetch_page(conn, table, key_columns, after=token, page_size=PAGE_SIZE, **kwargs)
+        pages.append(rows)
+        if token is None:
+            return pages
+
+
+@pytest.mark.parametrize("table, key_columns", [
+    ("Patients", ("PatientID",)),
+    ("Visits", ("PatientID", "VisitDate")),
+    ("PatientMedications", ("PatientID", "MedicationID")),
+])
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_the_table_in_key_order(conn, table, key_columns, descending):
+    order = ", ".join(f"{column}{' DESC' if descending else ''}" for column in key_columns)
+    expected = fetch_data(conn, f"SELECT * FROM {table} ORDER BY {order}")
+    pages = walk(conn, table, key_columns, descending=descending)
+    assert [row for page in pages for row in page] == expected
+    assert all(len(page) == PAGE_SIZE for page in pages[:-1])
+
+
+def test_before_returns_the_previous_page(conn):
+    pages = walk(conn, "Visits", ("PatientID", "VisitDate"))
+    first_row = pages[2][0]
+    token = encode_page_token(first_row[:2])
+    rows, previous = fetch_page(conn, "Visits", ("PatientID", "VisitDate"), before=token, page_size=PAGE_SIZE)
+    assert rows == pages[1]
+    rows, _ = fetch_page(conn, "Visits", ("PatientID", "VisitDate"), before=previous, page_size=PAGE_SIZE)
+    assert rows == pages[0]
+
+
+def test_before_the_first_row_is_empty(conn):
+    first_row = walk(conn, "Patients", ("PatientID",))[0][0]
+    rows, token = fetch_page(conn, "Patients", ("PatientID",), before=encode_page_token(first_row[:1]))
+    assert rows == [] and token is None
+
+
+class Rollback(Exception):
+    pass
+
+
+@pytest.fixture
+def patchy_addresses(conn):
+    """Give some patients a NULL address and others a shared one, undone after the test."""
+    try:
+        with transaction(conn):
+            execute_query(conn, "UPDATE Patients SET Address = NULL WHERE PatientID IN "
+                                "(SELECT PatientID FROM Patients ORDER BY PatientID LIMIT 10)", ())
+            execute_query(conn, "UPDATE Patients SET Address = 'Shared' WHERE PatientID IN "
+                                "(SELECT PatientID FROM Patients ORDER BY PatientID DESC LIMIT 10)", ())
+            yield conn
+            raise Rollback
+    except Rollback:
+        pass
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_pages_cover_nulls_and_ties(patchy_addresses, descending):
+    conn = patchy_addresses
+    order = " DESC" if descending else ""
+    expected = fetch_data(conn, f"SELECT * FROM Patients ORDER BY Address{order}, PatientID{order}")
+    assert sum(row[4] is None for row in expected) == 10
+    pages = walk(conn, "Patients", ("PatientID",), sort="Address", descending=descending)
+    assert [row for page in pages for row in page] == expected
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_before_crosses_the_nulls(patchy_addresses, descending):
+    conn = patchy_addresses
+    pages = walk(conn, "Patients", ("PatientID",), sort="Address", descending=descending)
+    columns = page_columns(("PatientID",), "Address")
+    for previous, page in zip(pages, pages[1:]):
+        first = dict(zip(TABLE_COLUMNS["Patients"], page[0]))
+        token = encode_page_token([first[column] for column in columns])
+        rows, _ = fetch_page(conn, "Patients", ("PatientID",), before=token, page_size=PAGE_SIZE,
+                             sort="Address", descending=descending)
+        assert rows == previous
+
+
+def test_address_changes_were_rolled_back(conn):
+    assert fetch_data(conn, "SELECT COUNT(*) FROM Patients WHERE Address IS NULL OR Address = 'Shared'") == [(0,)]
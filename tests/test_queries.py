@@ -0,0 +1,108 @@
+from datetime import date, timedelta
+
+import pytest
+
+from database import advanced_queries, queries
+from database.crud_operations import execute_query, fetch_data
+from database.transactions import transaction
+from utils.helpers import years_before
+
+
+def age(dob, today):
+    """Whole years from dob to today, as MariaDB's TIMESTAMPDIFF(YEAR, dob, today) counts them."""
+    return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+
+# Days around each birthday that can fall on a cutoff, including Feb 29 in leap and non-leap years
+TODAYS = [date(2023, 2, 27), date(2023, 2, 28), date(2023, 3, 1), date(2024, 2, 28), date(2024, 2, 29),
+          date(2024, 3, 1), date(2025, 2, 28), date(2025, 3, 1), date(2024, 12, 31), date(2025, 1, 1)]
+
+
+@pytest.mark.parametrize("today", TODAYS)
+@pytest.mark.parametrize("years", [0, 1, 3, 4, 23, 65])
+def test_cutoff_agrees_with_age(today, years):
+    cutoff = years_before(years, today)
+    for offset in range(-3, 4):
+        for dob in (cutoff + timedelta(days=offset), date(today.year - years, 2, 28), date(2020 - 4 * years, 2, 29)):
+            if dob <= today:
+                assert (dob > cutoff) == (age(dob, today) < years), dob
+
+
+def test_reference_age_matches_timestampdiff(conn):
+    for today in TODAYS:
+        for dob in (date(2020, 2, 29), date(2000, 2, 28), date(2000, 3, 1), date(2019, 12, 31)):
+            expected = age(dob, today)
+            assert fetch_data(conn, "SELECT TIMESTAMPDIFF(YEAR, %s, %s)", (dob, today)) == [(expected,)]
+
+
+# Patients born on and either side of the cutoffs, for a fixed today of 2025-02-28
+TODAY = date(2025, 2, 28)
+BIRTHDAYS = {
+    "AGE00001": date(2024, 2, 29),  # 0: turns 1 tomorrow, Feb 29 having no day this year
+    "AGE00002": date(2024, 2, 28),  # 1 today
+    "AGE00003": date(2020, 2, 29),  # 4
+    "AGE00004": date(1960, 2, 28),  # 65 today
+    "AGE00005": date(1960, 3, 1),   # 64
+    "AGE00006": date(1959, 2, 28),  # 66 today
+}
+
+
+@pytest.fixture
+def birthdays(conn, monkeypatch):
+    for module in (queries, advanced_queries):
+        monkeypatch.setattr(module, "years_before", lambda years: years_before(years, TODAY))
+    try:
+        with transaction(conn):
+            for patient_id, dob in BIRTHDAYS.items():
+                execute_query(conn, "INSERT INTO Patients (PatientID, FirstName, LastName, DOB) VALUES (%s, 'Age', 'Test', %s)",
+                              (patient_id, dob))
+            yield conn
+            raise RuntimeError  # Undo the inserts
+    except RuntimeError:
+        pass
+
+
+def ours(rows):
+    return {row[0] for row in rows if row[0] in BIRTHDAYS}
+
+
+@pytest.mark.parametrize("years", [1, 4, 65])
+def test_under_and_over_age_split_on_the_birthday(birthdays, years):
+    under = ours(queries.get_patients_under_age(birthdays, years))
+    over = ours(queries.get_patients_over_age(birthdays, years))
+    assert under == {p for p, dob in BIRTHDAYS.items() if age(dob, TODAY) < years}
+    assert over == {p for p, dob in BIRTHDAYS.items() if age(dob, TODAY) > years}
+    assert ours(advanced_queries.get_patients_over_age(birthdays, years)) == over
+
+
+def test_age_buckets_put_birthdays_in_the_right_band(birthdays):
+    before = dict(queries.get_patient_age_buckets(birthdays, bucket_size=5, max_age=62))
+    execute_query(birthdays, "DELETE FROM Patients WHERE PatientID LIKE 'AGE%'", ())
+    after = dict(queries.get_patient_age_buckets(birthdays, bucket_size=5, max_age=62))
+    added = {band: before[band] - after[band] for band in before if before[band] != after[band]}
+    assert added == {0: 3, 60: 3}  # Ages 0, 1, 4 and 64, 65, 66; the open 60 band holds everyone over 60
+
+
+def test_last_band_starts_at_the_last_multiple_of_bucket_size(conn):
+    assert [band for band, _ in queries.get_patient_age_buckets(conn, bucket_size=10, max_age=95)] == \
+        [0, 10, 20, 30, 40, 50, 60, 70, 80, 90]
+
+
+
+# Where each module's version of the average-visits report finds a department
+DEPARTMENTS = {queries: ("HealthCareProfessionals", "Department"), advanced_queries: ("HCPDepartments", "DepartmentName")}
+
+
+@pytest.mark.parametrize("module", [queries, advanced_queries])
+def test_average_visits_is_not_truncated(conn, module):
+    table, column = DEPARTMENTS[module]
+    counts = fetch_data(conn, f"""
+        SELECT h.{column}, COUNT(v.PatientID), COUNT(DISTINCT p.PatientID)
+        FROM {table} h
+        JOIN Patients p ON p.PrimaryHCPID = h.HCPID
+        LEFT JOIN Visits v ON v.PatientID = p.PatientID
+        GROUP BY h.{column}
+    """)
+    department, visits, patients = next(row for row in counts if row[1] % row[2])  # A fractional average
+    (average,), = module.get_average_visits_per_patient_by_department(conn, department)
+    assert average == pytest.approx(visits / patients)
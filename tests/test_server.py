@@ -0,0 +1,73 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from database.db_connection import get_pool
+from server import make_server, _coerce
+
+
+def serve(allow_writes=False):
+    server = make_server(get_pool(), port=0, ttl=0, allow_writes=allow_writes)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def url(conn):
+    server = serve()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api"
+    server.shutdown()
+    server.server_close()
+
+
+def request(url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_coerce_converts_known_parameters():
+    assert _coerce({"age": "65", "descending": "true", "term": "12"}) == {"age": 65, "descending": True, "term": "12"}
+    with pytest.raises(ValueError):
+        _coerce({"age": "old"})
+    with pytest.raises(ValueError):
+        _coerce({"phrase": "maybe"})
+
+
+def test_required_int_parameter_from_query_string(url):
+    status, body = request(f"{url}/get_patients_over_age?age=65")
+    assert status == 200
+    assert isinstance(body["result"], list)
+
+
+def test_bad_argument_is_a_client_error(url):
+    assert request(f"{url}/get_patients_over_age?age=old")[0] == 400
+
+
+def test_unknown_sort_column_is_rejected(url):
+    status, body = request(f"{url}/find_patients?term=a&sort=LastName;DROP TABLE Patients".replace(" ", "%20"))
+    assert status == 400
+    assert "Cannot sort" in body["error"]
+
+
+def test_writes_are_not_served_by_default(url):
+    status, _ = request(f"{url}/delete_patient", {"patient_id": "00000001"})
+    assert status == 404
+    assert "delete_patient" not in request(url)[1]["result"]
+
+
+def test_writes_served_when_allowed(conn):
+    server = serve(allow_writes=True)
+    url = f"http://127.0.0.1:{server.server_address[1]}/api"
+    try:
+        assert request(f"{url}/delete_patient?patient_id=NOSUCHID")[0] == 405
+        assert request(f"{url}/delete_medication", {"medication_id": "NOSUCHID"})[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()
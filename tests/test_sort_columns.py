@@ -0,0 +1,56 @@
+import pytest
+
+from database.basic_queries import get_patients_page, find_patients, find_visits
+from database.create_tables import TABLE_COLUMNS, indexed_columns
+from database.crud_operations import fetch_page, check_sort_column
+
+
+def test_table_columns_match_schema(conn):
+    for table, columns in TABLE_COLUMNS.items():
+        cur = conn.cursor()
+        cur.execute(f"PRAGMA table_info({table})")
+        assert tuple(row[1] for row in cur.fetchall()) == columns
+        cur.close()
+
+
+@pytest.mark.parametrize("sort", [
+    "LastName; DROP TABLE Patients",
+    "(SELECT 1)",
+    "lastname",
+    "Reason",
+    "",
+])
+def test_unknown_sort_is_rejected(sort):
+    with pytest.raises(ValueError):
+        check_sort_column("Patients", sort)
+
+
+def test_unknown_table_has_no_sort_columns():
+    with pytest.raises(ValueError):
+        check_sort_column("NoSuchTable", "PatientID")
+
+
+def test_fetch_page_rejects_sort_before_querying(conn):
+    with pytest.raises(ValueError):
+        fetch_page(conn, "Patients", ("PatientID",), sort="1; DELETE FROM Patients")
+    with pytest.raises(ValueError):
+        get_patients_page(conn, sort="DOB DESC, (SELECT 1)")
+
+
+def test_search_rejects_unknown_sort(conn):
+    with pytest.raises(ValueError):
+        find_patients(conn, "Smi", sort="Notes")
+    with pytest.raises(ValueError):
+        find_visits(conn, "2020", sort="VisitDate; --")
+
+
+def test_known_sort_columns_are_accepted(conn):
+    rows, _ = get_patients_page(conn, page_size=5, sort="LastName")
+    assert [row[2] for row in rows] == sorted(row[2] for row in rows)
+    assert find_patients(conn, "a", sort="DOB", descending=True) is not None
+
+
+def test_only_single_column_indexes_are_fast():
+    assert indexed_columns("Patients") == {"FirstName", "PrimaryHCPID", "DOB"}
+    assert "LastName" not in indexed_columns("HealthCareProfessionals")
+    assert "HCPID" not in indexed_columns("Visits")
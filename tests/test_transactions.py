@@ -0,0 +1,96 @@
+import pytest
+
+from database.crud_operations import execute_query, fetch_data
+from database.transactions import after_commit, in_transaction, transaction, transaction_depth
+
+INSERT = "INSERT INTO Medications (MedicationID, MedicationName, Dosage, Manufacturer) VALUES (%s, %s, '1mg', 'Acme')"
+
+
+def medication_ids(conn):
+    return {row[0] for row in fetch_data(conn, "SELECT MedicationID FROM Medications WHERE MedicationID LIKE 'TX%'")}
+
+
+@pytest.fixture
+def tx_conn(conn):
+    yield conn
+    conn.rollback()
+    execute_query(conn, "DELETE FROM Medications WHERE MedicationID LIKE 'TX%'", ())
+
+
+def test_depth_follows_nesting(tx_conn):
+    assert not in_transaction(tx_conn)
+    with transaction(tx_conn):
+        assert transaction_depth(tx_conn) == 1
+        with transaction(tx_conn):
+            assert transaction_depth(tx_conn) == 2
+        assert transaction_depth(tx_conn) == 1
+    assert transaction_depth(tx_conn) == 0
+
+
+def test_depth_is_restored_after_an_error(tx_conn):
+    with pytest.raises(ZeroDivisionError):
+        with transaction(tx_conn):
+            with transaction(tx_conn):
+                1 / 0
+    assert transaction_depth(tx_conn) == 0
+
+
+def test_outer_block_commits(tx_conn):
+    with transaction(tx_conn):
+        execute_query(tx_conn, INSERT, ("TX1", "One"))
+        with transaction(tx_conn):
+            execute_query(tx_conn, INSERT, ("TX2", "Two"))
+    tx_conn.rollback()  # Nothing left to undo
+    assert medication_ids(tx_conn) == {"TX1", "TX2"}
+
+
+def test_error_rolls_back_the_whole_block(tx_conn):
+    with pytest.raises(ZeroDivisionError):
+        with transaction(tx_conn):
+            execute_query(tx_conn, INSERT, ("TX1", "One"))
+            with transaction(tx_conn):
+                execute_query(tx_conn, INSERT, ("TX2", "Two"))
+            1 / 0
+    assert medication_ids(tx_conn) == set()
+
+
+def test_inner_rollback_keeps_outer_work(tx_conn):
+    with transaction(tx_conn):
+        execute_query(tx_conn, INSERT, ("TX1", "One"))
+        with pytest.raises(ZeroDivisionError):
+            with transaction(tx_conn):
+                execute_query(tx_conn, INSERT, ("TX2", "Two"))
+                1 / 0
+        execute_query(tx_conn, INSERT, ("TX3", "Three"))
+    assert medication_ids(tx_conn) == {"TX1", "TX3"}
+
+
+def test_statement_errors_are_raised_inside_a_block(tx_conn):
+    assert execute_query(tx_conn, INSERT, ("TX1", "One")) == 1
+    assert execute_query(tx_conn, INSERT, ("TX1", "Again")) is None  # Swallowed outside a block
+    with pytest.raises(Exception):
+        with transaction(tx_conn):
+            execute_query(tx_conn, INSERT, ("TX2", "Two"))
+            execute_query(tx_conn, INSERT, ("TX1", "Again"))
+    assert medication_ids(tx_conn) == {"TX1"}
+
+
+def test_after_commit_waits_for_the_outer_block(tx_conn):
+    calls = []
+    after_commit(tx_conn, calls.append, "now")
+    with transaction(tx_conn):
+        after_commit(tx_conn, calls.append, "outer")
+        with pytest.raises(ZeroDivisionError):
+            with transaction(tx_conn):
+                after_commit(tx_conn, calls.append, "rolled back")
+                1 / 0
+        with transaction(tx_conn):
+            after_commit(tx_conn, calls.append, "inner")
+        assert calls == ["now"]
+    assert calls == ["now", "outer", "inner"]
+
+    with pytest.raises(ZeroDivisionError):
+        with transaction(tx_conn):
+            after_commit(tx_conn, calls.append, "never")
+            1 / 0
+    assert calls == ["now", "outer", "inner"]
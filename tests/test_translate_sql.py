@@ -0,0 +1,70 @@
+import pytest
+
+from database import db_connection
+from database.crud_operations import fetch_data
+from database.db_connection import translate_sql
+
+
+@pytest.fixture
+def aggregate_order_by(request, monkeypatch):
+    """Translate as if SQLite did (or did not) support ORDER BY inside aggregates."""
+    monkeypatch.setattr(db_connection, "_AGGREGATE_ORDER_BY", request.param)
+    translate_sql.cache_clear()
+    yield request.param
+    translate_sql.cache_clear()
+
+
+def test_placeholders():
+    assert translate_sql("SELECT * FROM Patients WHERE PatientID = %s AND LastName = %s") == \
+        "SELECT * FROM Patients WHERE PatientID = ? AND LastName = ?"
+
+
+def test_null_safe_equality():
+    assert translate_sql("SELECT * FROM Patients WHERE Address <=> %s") == \
+        "SELECT * FROM Patients WHERE Address  IS  ?"
+
+
+def test_set_statement_prefix_is_dropped():
+    query = "SET STATEMENT max_statement_time=5 FOR SELECT * FROM Patients"
+    assert translate_sql(query) == "SELECT * FROM Patients"
+    assert translate_sql("set statement max_statement_time=5\nfor\nSELECT 1") == "SELECT 1"
+
+
+def test_timestampdiff_unit_is_quoted():
+    assert translate_sql("SELECT TIMESTAMPDIFF(YEAR, DOB, CURDATE()) FROM Patients") == \
+        "SELECT TIMESTAMPDIFF('YEAR', DOB, CURDATE()) FROM Patients"
+    assert translate_sql("SELECT timestampdiff( day , a, b)") == "SELECT TIMESTAMPDIFF('day', a, b)"
+
+
+def test_string_literals_are_left_alone():
+    query = "SELECT '%s <=> TIMESTAMPDIFF(YEAR, a, b)', 'it''s %s' FROM Patients WHERE Address = %s"
+    assert translate_sql(query) == \
+        "SELECT '%s <=> TIMESTAMPDIFF(YEAR, a, b)', 'it''s %s' FROM Patients WHERE Address = ?"
+
+
+@pytest.mark.parametrize("aggregate_order_by", [True], indirect=True)
+def test_group_concat_with_order_and_separator(aggregate_order_by):
+    query = "SELECT GROUP_CONCAT(DISTINCT Name ORDER BY Name DESC SEPARATOR ', ') FROM T"
+    assert translate_sql(query) == "SELECT group_concat(DISTINCT Name, ', ' ORDER BY Name DESC) FROM T"
+
+
+@pytest.mark.parametrize("aggregate_order_by", [False], indirect=True)
+def test_group_concat_order_dropped_on_old_sqlite(aggregate_order_by):
+    query = "SELECT GROUP_CONCAT(Name ORDER BY Name SEPARATOR '; ') FROM T"
+    assert translate_sql(query) == "SELECT group_concat(Name, '; ') FROM T"
+
+
+def test_group_concat_nested_and_quoted():
+    query = "SELECT GROUP_CONCAT(CONCAT(a, ')', b) SEPARATOR ')'), GROUP_CONCAT(c) FROM T"
+    assert translate_sql(query) == "SELECT group_concat(CONCAT(a, ')', b), ')'), group_concat(c) FROM T"
+
+
+def test_translated_statements_run_on_sqlite(conn):
+    rows = fetch_data(
+        conn,
+        "SET STATEMENT max_statement_time=5 FOR "
+        "SELECT TIMESTAMPDIFF(YEAR, DOB, CURDATE()) >= 0, GROUP_CONCAT(PatientID ORDER BY PatientID SEPARATOR '|') "
+        "FROM Patients WHERE PatientID <=> %s",
+        (fetch_data(conn, "SELECT MIN(PatientID) FROM Patients")[0][0],),
+    )
+    assert len(rows) == 1 and rows[0][0] == 1 and "|" not in rows[0][1]
@@ -0,0 +1,71 @@
+import pytest
+
+from database.basic_queries import (
+    add_medication_to_db,
+    add_patient_medication_to_db,
+    delete_medication,
+    delete_patient,
+    delete_patient_medication,
+    get_medication,
+    get_patient,
+    get_patient_medication,
+    update_medication,
+    update_patient_medication,
+)
+from database.crud_operations import fetch_data
+from database.transactions import transaction
+
+MEDICATION = {"MedicationID": "MTEST002", "MedicationName": "Writeol", "Dosage": "1mg", "Manufacturer": "Acme"}
+
+
+def test_failed_delete_raises_and_keeps_the_row(conn):
+    patient_id = fetch_data(conn, "SELECT PatientID FROM Visits LIMIT 1")[0][0]
+    with pytest.raises(RuntimeError):
+        delete_patient(conn, patient_id)  # Still referenced by Visits
+    assert get_patient(conn, patient_id) is not None
+
+
+def test_deleting_a_missing_row_raises(conn):
+    with pytest.raises(LookupError):
+        delete_medication(conn, "NOSUCHID")
+
+
+def test_duplicate_insert_raises(conn):
+    add_medication_to_db(conn, MEDICATION)
+    try:
+        with pytest.raises(Exception):
+            add_medication_to_db(conn, MEDICATION)
+    finally:
+        delete_medication(conn, MEDICATION["MedicationID"])
+    assert get_medication(conn, MEDICATION["MedicationID"]) is None
+
+
+def test_writes_join_an_enclosing_transaction(conn):
+    with pytest.raises(RuntimeError):
+        with transaction(conn):
+            add_medication_to_db(conn, MEDICATION)
+            update_medication(conn, MEDICATION["MedicationID"], dict(MEDICATION, Dosage="2mg"))
+            raise RuntimeError
+    assert get_medication(conn, MEDICATION["MedicationID"]) is None
+
+
+def test_patient_medication_round_trip(conn):
+    """The fields the Patient Medications forms submit are all the statements need."""
+    patient_id = fetch_data(conn, "SELECT MIN(PatientID) FROM Patients")[0][0]
+    add_medication_to_db(conn, MEDICATION)
+    try:
+        data = {
+            "PatientID": patient_id, "MedicationID": MEDICATION["MedicationID"],
+            "StartDate": "2024-01-01", "EndDate": "2024-06-30", "Dosage": "1mg",
+        }
+        add_patient_medication_to_db(conn, data)
+        assert get_patient_medication(conn, patient_id, MEDICATION["MedicationID"])[2:] == \
+            ("2024-01-01", "2024-06-30", "1mg")
+
+        edit = {"StartDate": "2024-02-01", "EndDate": "2024-07-31", "Dosage": "2mg"}
+        update_patient_medication(conn, patient_id, MEDICATION["MedicationID"], edit)
+        assert get_patient_medication(conn, patient_id, MEDICATION["MedicationID"])[2:] == \
+            ("2024-02-01", "2024-07-31", "2mg")
+    finally:
+        delete_patient_medication(conn, patient_id, MEDICATION["MedicationID"])
+        delete_medication(conn, MEDICATION["MedicationID"])
@@ -0,0 +1,37 @@
+from datetime import date
+
+
+def years_before(years, today=None):
+    """
+    Return the date `years` years before today.
+    :param years: Number of whole years to go back
+    :param today: Reference date (defaults to date.today())
+    :return: datetime.date; Feb 29 falls back to Feb 28 in non-leap years
+    """
+    today = today or date.today()
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        return today.replace(year=today.year - years, day=28)
+
+
+# Escape character used with LIKE ... ESCAPE; '!' behaves the same in MariaDB and SQLite
+LIKE_ESCAPE = "!"
+
+
+def escape_like(text, escape=LIKE_ESCAPE):
+    """Escape LIKE wildcards in user input so they match literally."""
+    return (
+        text.replace(escape, escape * 2)
+        .replace("%", escape + "%")
+        .replace("_", escape + "_")
+    )
+
+
+def looks_like_date(text):
+    """True if text is an ISO date such as 2023-11-15."""
+    try:
+        date.fromisoformat(text)
+        return True
+    except ValueError:
+        return False